@@ -0,0 +1,151 @@
+
+from retrieval.IndexFile import IndexFile
+from retrieval.InvertedIndex import InvertedIndex
+from retrieval.TfidfMatrix import TfidfMatrix
+
+import os
+import sys
+import json
+import time
+import pickle
+import tempfile
+
+class IndexFileBenchmark:
+
+    def __init__(self, index_path, repeat=3):
+        """
+        The constructor for IndexFileBenchmark class.
+        The benchmark compares saving and loading the same index as a pickle file and as an index file.
+
+        Parameters
+        ----------
+        index_path : string
+            The file path of a saved index (pickle file or index file).
+        repeat : int, optional
+            The number of runs of each measurement, the best run is kept. The default is 3.
+
+        Returns
+        -------
+        None.
+
+        """
+        index_file = IndexFile._load(index_path)
+        self.__inverted_index = InvertedIndex._from_mapping(index_file.inverted_index)
+
+        # A pickle file stores the index as dictionaries, as older versions did.
+        self.__posting_lists = {term: self.__inverted_index[term] for term in self.__inverted_index}
+        self.__corpus = index_file.corpus
+        self.__folder_path = index_file.folder_path
+        self.__preprocessor_option = index_file.preprocessor_option
+        self.__tfidf_matrix = TfidfMatrix(self.__inverted_index, self.__corpus.doc_ids)
+        self.__repeat = repeat
+
+    def _run(self):
+        """
+        The method to run the benchmark.
+
+        Returns
+        -------
+        result : dictionary
+            The best save and load time (in seconds) and the file size (in bytes) of each formats.
+
+        """
+        result = {}
+        result['documents'] = len(self.__corpus)
+        result['terms'] = len(self.__inverted_index)
+        with tempfile.TemporaryDirectory() as directory:
+            pickle_path = os.path.join(directory, 'benchmark.pickle')
+            index_path = os.path.join(directory, 'benchmark.index')
+            result['pickle'] = {'save': self.__measure(lambda: self.__save_pickle(pickle_path)),
+                                'load': self.__measure(lambda: self.__load_pickle(pickle_path)),
+                                'size': os.path.getsize(pickle_path)}
+            result['index'] = {'save': self.__measure(lambda: self.__save_index(index_path)),
+                               'load': self.__measure(lambda: IndexFile._load(index_path)),
+                               'size': os.path.getsize(index_path)}
+        return result
+
+    def __measure(self, function):
+        """
+        The method to measure the best wall time of a function.
+
+        Parameters
+        ----------
+        function : function
+            The function to measure.
+
+        Returns
+        -------
+        float
+            The best wall time (in seconds).
+
+        """
+        best = None
+        for i in range(0, self.__repeat):
+            start_time = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - start_time
+            best = elapsed if best is None else min(best, elapsed)
+        return round(best, 6)
+
+    def __save_pickle(self, path):
+        """
+        The method to save the index as a pickle file, the way older versions did.
+
+        Parameters
+        ----------
+        path : string
+            The file path.
+
+        Returns
+        -------
+        None.
+
+        """
+        metadata = {}
+        metadata['folder_path'] = self.__folder_path
+        metadata['corpus'] = list(self.__corpus)
+        metadata['preprocessor_option'] = self.__preprocessor_option
+        data = {}
+        data['index'] = self.__posting_lists
+        data['metadata'] = metadata
+        with open(path, 'wb') as handle:
+            pickle.dump(data, handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def __load_pickle(self, path):
+        """
+        The method to load an index saved as a pickle file, and rebuild its tf-idf matrix.
+
+        Parameters
+        ----------
+        path : string
+            The file path.
+
+        Returns
+        -------
+        None.
+
+        """
+        with open(path, 'rb') as handle:
+            data = pickle.load(handle)
+        TfidfMatrix(InvertedIndex._from_mapping(data['index']), [doc.doc_id for doc in data['metadata']['corpus']])
+
+    def __save_index(self, path):
+        """
+        The method to save the index as an index file, along with its tf-idf matrix.
+
+        Parameters
+        ----------
+        path : string
+            The file path.
+
+        Returns
+        -------
+        None.
+
+        """
+        IndexFile(self.__inverted_index, self.__corpus, self.__folder_path, self.__preprocessor_option, self.__tfidf_matrix)._save(path)
+
+if __name__ == '__main__':
+    # Usage: python -m benchmark.IndexFileBenchmark <saved index path>
+    benchmark = IndexFileBenchmark(sys.argv[1])
+    print(json.dumps(benchmark._run(), indent=4))
\ No newline at end of file
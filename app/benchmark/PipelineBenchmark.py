@@ -0,0 +1,243 @@
+
+from benchmark.SyntheticCorpus import SyntheticCorpus
+from retrieval.CorpusReader import CorpusReader
+from retrieval.Indexer import Indexer
+from retrieval.TfidfMatrix import TfidfMatrix
+from retrieval.VocabularyPruner import VocabularyPruner
+from clustering.Clusterer import Clusterer
+from clustering.DistanceMatrix import DistanceMatrix
+from clustering.DimensionReducer import DimensionReducer
+
+from scipy.cluster.hierarchy import linkage, cophenet
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+import os
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+import numpy as np
+import scipy
+
+class PipelineBenchmark:
+
+    def __init__(self, sizes, method='average', cut_off=0.9, parallel=False, pruner=None, reducer=None, **corpus_parameters):
+        """
+        The constructor for PipelineBenchmark class.
+        The benchmark generates a synthetic corpus of each size, and measures each stages of the pipeline separately.
+
+        Parameters
+        ----------
+        sizes : list
+            The number of documents of each corpus.
+        method : string, optional
+            The method used for calculating distances between two clusters. The default is average.
+        cut_off : float, optional
+            The cut-off height used for extracting clusters. The default is 0.9.
+        parallel : boolean, optional
+            The parallel indexing status. Peak memory of worker processes is not measured. The default is False.
+        pruner : VocabularyPruner, optional
+            The pruner of the vocabulary, applied before vectorization. The default is None (all terms are kept).
+        reducer : DimensionReducer, optional
+            The reducer of the tf-idf rows, applied before the distance matrix is built. The default is None (distances over all terms).
+        **corpus_parameters
+            The other parameters of SyntheticCorpus.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__sizes = sizes
+        self.__method = method
+        self.__cut_off = cut_off
+        self.__parallel = parallel
+        self.__pruner = pruner
+        self.__reducer = reducer
+        self.__corpus_parameters = corpus_parameters
+
+    def _run(self):
+        """
+        The method to run the benchmark.
+        Each stages is timed in a first run, and its peak memory is measured with tracemalloc in a second run,
+        since tracing memory allocations slows the code down.
+
+        Returns
+        -------
+        result : dictionary
+            The environment, the parameters and, for each corpus, the wall time (in seconds) and the peak memory (in bytes) of each stages,
+            and the CPCC of the hierarchy.
+
+        """
+        result = {}
+        result['commit'] = self.__get_commit()
+        result['python'] = platform.python_version()
+        result['numpy'] = np.__version__
+        result['scipy'] = scipy.__version__
+        result['parameters'] = {'method': self.__method, 'cut_off': self.__cut_off, 'parallel': self.__parallel,
+                                'pruning': self.__pruner.option if self.__pruner is not None else None,
+                                'reduction': self.__reducer.option if self.__reducer is not None else None}
+        result['runs'] = []
+        for size in self.__sizes:
+            corpus_generator = SyntheticCorpus(size, **self.__corpus_parameters)
+            with tempfile.TemporaryDirectory() as directory:
+                corpus_generator._generate(directory)
+                times = self.__run_stages(directory, False)
+                peaks = self.__run_stages(directory, True)
+            run = {'corpus': corpus_generator.parameters, 'terms': times.pop('terms'), 'kept_terms': times.pop('kept_terms'), 'cpcc': times.pop('cpcc'), 'stages': {}}
+            peaks.pop('terms')
+            peaks.pop('kept_terms')
+            peaks.pop('cpcc')
+            for stage, seconds in times.items():
+                run['stages'][stage] = {'seconds': seconds, 'peak_bytes': peaks[stage]}
+            result['runs'].append(run)
+        return result
+
+    def __run_stages(self, folder_path, trace_memory):
+        """
+        The method to run each stages of the pipeline once, measuring either their wall time or their peak memory.
+
+        Parameters
+        ----------
+        folder_path : string
+            The folder path of corpus.
+        trace_memory : boolean
+            True to measure the peak memory, False to measure the wall time.
+
+        Returns
+        -------
+        measures : dictionary
+            The measure of each stages, None for a stage which is not run, the number of terms before and after pruning, and the CPCC.
+
+        """
+        measures = {}
+
+        def _measure(stage, function):
+            if trace_memory:
+                tracemalloc.start()
+                value = function()
+                measures[stage] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            else:
+                start_time = time.perf_counter()
+                value = function()
+                measures[stage] = round(time.perf_counter() - start_time, 6)
+            return value
+
+        # Read all documents, then index them.
+        def _read():
+            corpus = CorpusReader(folder_path)._list_documents()
+            for doc in corpus:
+                CorpusReader._load(doc)
+            return corpus
+
+        def _index():
+            indexer = Indexer()
+            if self.__parallel:
+                indexer.index_parallel(corpus, True, True, True, True)
+            else:
+                for doc in corpus:
+                    indexer.index(doc, True, True, True, True)
+            return indexer.inverted_index
+
+        corpus = _measure('reading', _read)
+        inverted_index = _measure('indexing', _index)
+        measures['terms'] = len(inverted_index)
+
+        # Prune the vocabulary, then build the tf-idf matrix, and bind each documents to it.
+        terms = None
+        if self.__pruner is not None:
+            terms = _measure('pruning', lambda: self.__pruner._prune(inverted_index, len(corpus)))
+        else:
+            measures['pruning'] = None
+        measures['kept_terms'] = len(terms) if terms is not None else len(inverted_index)
+
+        def _vectorize():
+            tfidf_matrix = TfidfMatrix(inverted_index, corpus.doc_ids, terms=terms)
+            corpus._build_vectors(tfidf_matrix)
+            return tfidf_matrix
+
+        tfidf_matrix = _measure('vectorization', _vectorize)
+
+        # The reduction, the distance matrix and the linkage over all documents are only measured on their own if the clusterer builds them.
+        # The CPCC is calculated against the distances over all terms, so a reduced hierarchy can be compared with a hierarchy which is not.
+        clusterer = Clusterer(corpus, tfidf_matrix, reducer=self.__reducer)
+        measures['reduction'] = None
+        measures['cpcc'] = None
+        if not clusterer.scalable:
+            matrix = tfidf_matrix.matrix
+            if self.__reducer is not None:
+                matrix = _measure('reduction', lambda: self.__reducer._reduce(tfidf_matrix.matrix))
+            distance_matrix = _measure('distance_matrix', lambda: DistanceMatrix()._build(matrix))
+            linkage_matrix = _measure('linkage', lambda: linkage(distance_matrix, method=self.__method))
+            if self.__reducer is not None:
+                distance_matrix = DistanceMatrix()._build(tfidf_matrix.matrix)
+            measures['cpcc'] = round(float(cophenet(linkage_matrix, distance_matrix)[0]), 3)
+            del matrix, distance_matrix
+        else:
+            measures['distance_matrix'] = None
+            measures['linkage'] = None
+
+        # Cluster through the clusterer, then cut the hierarchy, name the clusters and render the dendrogram.
+        def _render():
+            figure = clusterer.plot_dendrogram(self.__cut_off)
+            FigureCanvasAgg(figure).draw()
+
+        _measure('clustering', lambda: clusterer.cluster(self.__method))
+        if clusterer.scalable:
+            measures['cpcc'] = clusterer.calc_cophenetic_coeff()
+        _measure('cutting', lambda: clusterer.assign_clusters(self.__cut_off))
+        _measure('auto_naming', lambda: clusterer.extract_clusters(True, self.__cut_off))
+        _measure('rendering', _render)
+        return measures
+
+    def __get_commit(self):
+        """
+        The method to get the current git commit, so results can be compared across commits.
+
+        Returns
+        -------
+        string
+            The commit hash, or None if it is not available.
+
+        """
+        try:
+            output = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+            return output.stdout.decode('ascii').strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+if __name__ == '__main__':
+    # Usage: python -m benchmark.PipelineBenchmark --sizes 500 1000 2000 --output benchmark.json
+    parser = argparse.ArgumentParser(description='Measure each stages of the pipeline on synthetic corpora.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 1000, 2000], help='the number of documents of each corpus')
+    parser.add_argument('--method', choices=['single', 'complete', 'average'], default='average')
+    parser.add_argument('--cut', type=float, default=0.9, help='the cut-off height')
+    parser.add_argument('--parallel', action='store_true', help='index documents in parallel')
+    parser.add_argument('--length', type=int, default=200, help='the mean number of words of each documents')
+    parser.add_argument('--vocabulary', type=int, default=20000, help='the number of distinct words')
+    parser.add_argument('--topics', type=int, default=10, help='the number of topics')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--min-df', type=VocabularyPruner._parse_frequency, help='keep terms in at least this number (or proportion) of documents')
+    parser.add_argument('--max-df', type=VocabularyPruner._parse_frequency, help='keep terms in at most this number (or proportion) of documents')
+    parser.add_argument('--max-features', type=int, help='keep only this number of the most frequent terms')
+    parser.add_argument('--reduce', choices=DimensionReducer.METHOD_LIST, help='reduce the tf-idf rows before calculating distances')
+    parser.add_argument('--components', type=int, default=100, help='the number of dimensions after reduction')
+    parser.add_argument('--output', help='write the results as a JSON file (default: print them)')
+    args = parser.parse_args()
+    pruner = None
+    if args.min_df is not None or args.max_df is not None or args.max_features is not None:
+        pruner = VocabularyPruner(1 if args.min_df is None else args.min_df, 1.0 if args.max_df is None else args.max_df, args.max_features)
+    reducer = DimensionReducer(args.reduce, args.components) if args.reduce is not None else None
+    benchmark = PipelineBenchmark(args.sizes, args.method, args.cut, args.parallel, pruner, reducer, document_length=args.length,
+                                  vocabulary_size=args.vocabulary, n_topics=args.topics, seed=args.seed)
+    result = json.dumps(benchmark._run(), indent=4)
+    if args.output is not None:
+        with open(args.output, 'w') as handle:
+            handle.write(result)
+    else:
+        print(result)
\ No newline at end of file
@@ -0,0 +1,147 @@
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+
+class StartupBenchmark:
+
+    # Modules which should not be imported before the window is shown.
+    HEAVY_MODULE_LIST = ['numpy', 'scipy', 'matplotlib', 'nltk']
+
+    def __init__(self, repeat=5, budget=1.0):
+        """
+        The constructor for StartupBenchmark class.
+        The benchmark starts the application in new interpreters, and measures the time until its window is shown.
+
+        Parameters
+        ----------
+        repeat : int, optional
+            The number of runs, the best run is kept. The default is 5.
+        budget : float, optional
+            The startup time allowed (in seconds), from the first import to the window shown. The default is 1.0.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__repeat = repeat
+        self.__budget = budget
+
+    def _run(self):
+        """
+        The method to run the benchmark.
+        Each run is a new interpreter, so modules imported by a run are not cached for the next run.
+
+        Returns
+        -------
+        result : dictionary
+            The environment, the best time (in seconds) of each steps of startup, the heavy modules imported before the window is shown,
+            and whether startup is within the budget. The window is None if there is no display.
+
+        """
+        runs = [self.__run_probe() for i in range(0, self.__repeat)]
+        result = {}
+        result['commit'] = self.__get_commit()
+        result['python'] = platform.python_version()
+        result['budget'] = self.__budget
+        for step in ['process', 'import', 'window', 'warm_up']:
+            values = [run[step] for run in runs if run[step] is not None]
+            result[step] = round(min(values), 6) if values != [] else None
+        result['heavy_modules'] = runs[0]['heavy_modules']
+        result['startup'] = round(result['import'] + (result['window'] or 0), 6)
+        result['within_budget'] = result['startup'] <= self.__budget
+        return result
+
+    def __run_probe(self):
+        """
+        The method to start the application once in a new interpreter.
+
+        Returns
+        -------
+        run : dictionary
+            The time (in seconds) of the whole process and of each steps of startup, and the heavy modules imported before the window is shown.
+
+        """
+        app_folder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        start_time = time.perf_counter()
+        output = subprocess.run([sys.executable, '-m', 'benchmark.StartupBenchmark', '--probe'], cwd=app_folder,
+                                stdout=subprocess.PIPE, check=True)
+        run = json.loads(output.stdout.decode('utf-8').splitlines()[-1])
+        run['process'] = time.perf_counter() - start_time
+        return run
+
+    @staticmethod
+    def _probe():
+        """
+        The method to measure the startup of the application in the current interpreter.
+        The gui is imported, its window is shown without starting the main loop, then modules loaded on first use are warmed up.
+
+        Returns
+        -------
+        run : dictionary
+            The time (in seconds) of each steps of startup, and the heavy modules imported before the window is shown.
+
+        """
+        run = {}
+        start_time = time.perf_counter()
+        from gui.gui import gui
+        import tkinter as tk
+        run['import'] = time.perf_counter() - start_time
+
+        # Show the window, unless there is no display.
+        run['window'] = None
+        start_time = time.perf_counter()
+        try:
+            application = gui()
+            application.window.update()
+            run['window'] = time.perf_counter() - start_time
+            application.window.destroy()
+        except tk.TclError:
+            pass
+        run['heavy_modules'] = [module for module in StartupBenchmark.HEAVY_MODULE_LIST if module in sys.modules]
+
+        start_time = time.perf_counter()
+        gui._warm_up()
+        run['warm_up'] = time.perf_counter() - start_time
+        return run
+
+    def __get_commit(self):
+        """
+        The method to get the current git commit, so results can be compared across commits.
+
+        Returns
+        -------
+        string
+            The commit hash, or None if it is not available.
+
+        """
+        try:
+            output = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+            return output.stdout.decode('ascii').strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+if __name__ == '__main__':
+    # Usage: python -m benchmark.StartupBenchmark --repeat 5 --budget 1.0 --output startup.json
+    parser = argparse.ArgumentParser(description='Measure the startup time of the application.')
+    parser.add_argument('--repeat', type=int, default=5, help='the number of runs, the best run is kept')
+    parser.add_argument('--budget', type=float, default=1.0, help='the startup time allowed (in seconds)')
+    parser.add_argument('--output', help='write the results as a JSON file (default: print them)')
+    parser.add_argument('--probe', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.probe:
+        print(json.dumps(StartupBenchmark._probe()))
+    else:
+        benchmark = StartupBenchmark(args.repeat, args.budget)
+        result = json.dumps(benchmark._run(), indent=4)
+        if args.output is not None:
+            with open(args.output, 'w') as handle:
+                handle.write(result)
+        else:
+            print(result)
\ No newline at end of file
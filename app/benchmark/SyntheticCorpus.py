@@ -0,0 +1,113 @@
+
+import os
+import numpy as np
+
+class SyntheticCorpus:
+
+    def __init__(self, n_documents, document_length=200, vocabulary_size=20000, zipf_exponent=1.1, n_topics=10, topic_ratio=0.3, seed=0):
+        """
+        The constructor for SyntheticCorpus class.
+        Words are drawn from a Zipf distribution over the vocabulary, and part of them from the Zipf distribution of a topic,
+        which ranks the vocabulary in another order, so documents of the same topic can be clustered together.
+
+        Parameters
+        ----------
+        n_documents : int
+            The number of documents.
+        document_length : int, optional
+            The mean number of words of each documents. The default is 200.
+        vocabulary_size : int, optional
+            The number of distinct words. The default is 20000.
+        zipf_exponent : float, optional
+            The exponent of the Zipf distribution. The default is 1.1.
+        n_topics : int, optional
+            The number of topics. The default is 10.
+        topic_ratio : float, optional
+            The ratio of words drawn from the topic of each documents. The default is 0.3.
+        seed : int, optional
+            The seed of the random generator, so the same corpus is generated each time. The default is 0.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__n_documents = n_documents
+        self.__document_length = document_length
+        self.__vocabulary_size = vocabulary_size
+        self.__zipf_exponent = zipf_exponent
+        self.__n_topics = n_topics
+        self.__topic_ratio = topic_ratio
+        self.__seed = seed
+
+    @property
+    def parameters(self):
+        """
+        The method to get the parameters of the corpus.
+
+        Returns
+        -------
+        dictionary
+            The parameters.
+
+        """
+        return {'documents': self.__n_documents, 'document_length': self.__document_length, 'vocabulary_size': self.__vocabulary_size,
+                'zipf_exponent': self.__zipf_exponent, 'topics': self.__n_topics, 'topic_ratio': self.__topic_ratio, 'seed': self.__seed}
+
+    def _generate(self, folder_path):
+        """
+        The method to write the documents as .txt files in a folder.
+
+        Parameters
+        ----------
+        folder_path : string
+            The folder path, which is created if it does not exist.
+
+        Returns
+        -------
+        topics : list
+            The topic of each documents, in the order of their file names.
+
+        """
+        random_state = np.random.RandomState(self.__seed)
+        vocabulary = [self.__get_word(rank) for rank in range(0, self.__vocabulary_size)]
+        probabilities = 1 / np.arange(1, self.__vocabulary_size + 1) ** self.__zipf_exponent
+        probabilities /= probabilities.sum()
+        topic_orders = [random_state.permutation(self.__vocabulary_size) for i in range(0, self.__n_topics)]
+
+        os.makedirs(folder_path, exist_ok=True)
+        topics = random_state.randint(0, self.__n_topics, size=self.__n_documents)
+        lengths = np.maximum(1, random_state.poisson(self.__document_length, size=self.__n_documents))
+        width = len(str(self.__n_documents))
+        for i in range(0, self.__n_documents):
+            # Draw the words of the topic, then the common words.
+            n_topic_words = random_state.binomial(lengths[i], self.__topic_ratio)
+            ranks = random_state.choice(self.__vocabulary_size, size=lengths[i], p=probabilities)
+            ranks[:n_topic_words] = topic_orders[topics[i]][ranks[:n_topic_words]]
+            random_state.shuffle(ranks)
+            with open(os.path.join(folder_path, 'doc_' + str(i).zfill(width) + '.txt'), 'w', encoding='utf-8') as handle:
+                handle.write(' '.join(vocabulary[rank] for rank in ranks))
+        return topics.tolist()
+
+    def __get_word(self, rank):
+        """
+        The method to get the word of a rank, made of alternating consonants and vowels so it looks like a word.
+
+        Parameters
+        ----------
+        rank : int
+            The rank of the word.
+
+        Returns
+        -------
+        string
+            The word.
+
+        """
+        consonants, vowels = 'bcdfghjklmnprstvwz', 'aeiou'
+        word = ''
+        rank += 1
+        while rank > 0:
+            rank, syllable = divmod(rank, len(consonants) * len(vowels))
+            word += consonants[syllable // len(vowels)] + vowels[syllable % len(vowels)]
+        return word
\ No newline at end of file
@@ -0,0 +1,176 @@
+
+from pipeline.Pipeline import Pipeline
+from pipeline.Organizer import Organizer
+from pipeline.StageTimer import StageTimer
+from retrieval.VocabularyPruner import VocabularyPruner
+from clustering.DimensionReducer import DimensionReducer
+from clustering.DuplicateDetector import DuplicateDetector
+
+import sys
+import argparse
+
+def _frequency(value):
+    """
+    The function to parse a document frequency, written as a number of documents or as a proportion of the corpus.
+
+    Parameters
+    ----------
+    value : string
+        The argument.
+
+    Raises
+    ------
+    ArgumentTypeError
+        If the argument is not a number.
+
+    Returns
+    -------
+    int or float
+        The number of documents if the argument is an integer, else the proportion.
+
+    """
+    try:
+        return VocabularyPruner._parse_frequency(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError('invalid frequency: ' + repr(value))
+
+def main(argv=None):
+    """
+    The function to index, cluster and organize documents from the command line, without any gui.
+
+    Parameters
+    ----------
+    argv : list, optional
+        The command-line arguments. The default is None (the arguments of the program).
+
+    Returns
+    -------
+    int
+        The exit status.
+
+    """
+    parser = argparse.ArgumentParser(description='Index, cluster and organize documents without the gui.')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--folder', help='index all .txt files in a folder')
+    source.add_argument('--load', metavar='INDEX', help='load a saved index')
+    parser.add_argument('--update', action='store_true', help='update the loaded index with the changed files of its folder')
+    parser.add_argument('--checksum', action='store_true', help='with --update, hash every file instead of the files whose size or modification time changed')
+    parser.add_argument('--save', metavar='INDEX', help='save the index')
+    parser.add_argument('--method', choices=['single', 'complete', 'average'], help='cluster with a method')
+    parser.add_argument('--cut', type=float, default=0, help='the cut-off height (default: 0, a single cluster)')
+    parser.add_argument('--output', help='write the clusters as a JSON or CSV file')
+    parser.add_argument('--format', choices=['json', 'csv'], help='the output format (default: based on the file extension)')
+    parser.add_argument('--organize', action='store_true', help='organize the documents into a folder for each clusters')
+    parser.add_argument('--strategy', choices=Organizer.STRATEGY_LIST, default='copy', help='copy, hard link, symbolic link or move the organized documents (default: copy)')
+    parser.add_argument('--dry-run', action='store_true', help='list the documents which would be organized, without writing anything')
+    parser.add_argument('--timings', metavar='PATH', help='write the time spent in each stages as a JSON file')
+    parser.add_argument('--no-autorenaming', dest='autorenaming', action='store_false', help='do not name clusters after their terms')
+    parser.add_argument('--serial', dest='parallel', action='store_false', help='index documents in a single process')
+    parser.add_argument('--keep-stopwords', dest='stopwords_removal', action='store_false', help='do not remove stop words')
+    parser.add_argument('--no-stemming', dest='stemming', action='store_false', help='do not stem words')
+    parser.add_argument('--no-case-folding', dest='case_folding', action='store_false', help='do not fold words to lower case')
+    parser.add_argument('--no-normalization', dest='normalization', action='store_false', help='do not remove non-alphabetic characters')
+    parser.add_argument('--min-df', type=_frequency, help='keep terms in at least this number (or proportion, e.g. 0.01) of documents')
+    parser.add_argument('--max-df', type=_frequency, help='keep terms in at most this number (or proportion, e.g. 0.5) of documents')
+    parser.add_argument('--max-features', type=int, help='keep only this number of the most frequent terms')
+    parser.add_argument('--reduce', choices=DimensionReducer.METHOD_LIST, help='reduce the tf-idf rows with a truncated SVD or a random projection before calculating distances')
+    parser.add_argument('--components', type=int, help='the number of dimensions after reduction (default: 100)')
+    parser.add_argument('--deduplicate', type=float, nargs='?', const=0.9, metavar='THRESHOLD',
+                        help='cluster near-duplicate documents, whose terms have at least this Jaccard similarity (default: 0.9), as one document')
+    args = parser.parse_args(argv)
+    if (args.output is not None or args.organize) and args.method is None:
+        parser.error('--output and --organize require --method')
+    if args.dry_run and not args.organize:
+        parser.error('--dry-run requires --organize')
+    if args.update and args.load is None:
+        parser.error('--update requires --load')
+    if args.checksum and not args.update:
+        parser.error('--checksum requires --update')
+    if args.components is not None and args.reduce is None:
+        parser.error('--components requires --reduce')
+
+    # Prune the vocabulary if any pruning option is given. A loaded index keeps its own pruning option otherwise.
+    pruner = None
+    if args.min_df is not None or args.max_df is not None or args.max_features is not None:
+        try:
+            pruner = VocabularyPruner(1 if args.min_df is None else args.min_df, 1.0 if args.max_df is None else args.max_df, args.max_features)
+        except ValueError as error:
+            parser.error(str(error))
+
+    # Reduce the tf-idf rows if a reduction method is given. A loaded index keeps its own reduction option otherwise.
+    reducer = None
+    if args.reduce is not None:
+        try:
+            reducer = DimensionReducer(args.reduce, 100 if args.components is None else args.components)
+        except ValueError as error:
+            parser.error(str(error))
+
+    # Collapse near-duplicate documents if a threshold is given. A loaded index keeps its own detection option otherwise.
+    detector = None
+    if args.deduplicate is not None:
+        try:
+            detector = DuplicateDetector(args.deduplicate)
+        except ValueError as error:
+            parser.error(str(error))
+
+    # The steps of preprocessing are only timed separately when the timings are written, as they are then done in their own passes.
+    timer = StageTimer(detailed=True) if args.timings is not None else None
+    pipeline = Pipeline((args.stopwords_removal, args.stemming, args.case_folding, args.normalization), args.parallel, timer=timer, pruner=pruner, reducer=reducer, detector=detector)
+    try:
+        # Build or load the index.
+        if args.folder is not None:
+            pipeline.index(args.folder)
+            print('Indexed ' + str(len(pipeline.corpus)) + ' documents.')
+        else:
+            pipeline.load(args.load)
+            print('Loaded an index of ' + str(len(pipeline.corpus)) + ' documents.')
+            if pruner is not None:
+                pipeline.prune(pruner)
+            if args.update:
+                added, modified, deleted = pipeline.update(checksum=args.checksum)
+                print('Updated the index: ' + str(len(added)) + ' added, ' + str(len(modified)) + ' modified and ' + str(len(deleted)) + ' deleted documents.')
+            if reducer is not None:
+                pipeline.reduce(reducer)
+            if detector is not None:
+                pipeline.deduplicate(detector)
+        summary = pipeline.pruner.summary if pipeline.pruner is not None else None
+        if summary is not None:
+            print('Pruned the vocabulary from ' + str(summary['terms']) + ' to ' + str(summary['kept_terms']) + ' terms (' + str(summary['weights']) + ' to '
+                  + str(summary['kept_weights']) + ' weights, about ' + str(summary['matrix_bytes']) + ' to ' + str(summary['kept_matrix_bytes']) + ' bytes of tf-idf matrix).')
+        if args.save is not None:
+            pipeline.save(args.save)
+            print('Saved the index to ' + args.save + '.')
+
+        # Cluster the documents, and write or organize the clusters.
+        if args.method is not None:
+            clusterer = pipeline.cluster(args.method, args.cut)
+            reduction = ''
+            if clusterer.reducer is not None:
+                reduction = ' over ' + str(clusterer.reducer.n_components) + ' dimensions (' + clusterer.reducer.method + ')'
+            print('Clustered with ' + args.method + ' method' + reduction + ' into ' + str(len(set(clusterer.assign_clusters().values()))) + ' clusters.')
+            summary = clusterer.detector.summary if clusterer.detector is not None else None
+            if summary is not None:
+                print('Collapsed ' + str(summary['collapsed']) + ' near-duplicate documents, clustering ' + str(summary['groups']) + ' of ' + str(summary['documents']) + ' documents.')
+            if args.output is not None:
+                pipeline.export_clusters(args.output, args.format, args.autorenaming)
+                print('Wrote the clusters to ' + args.output + '.')
+            if args.organize:
+                organizer = pipeline.organize(args.autorenaming, args.strategy, args.dry_run)
+                summary = organizer.summary
+                if args.dry_run:
+                    for source, destination, size in organizer.manifest:
+                        print(source + ' -> ' + destination)
+                print(('Would organize ' if args.dry_run else 'Organized ') + str(summary['files']) + ' documents (' + str(summary['bytes']) + ' bytes, '
+                      + str(summary['bytes_copied']) + ' bytes copied) into ' + str(summary['folders']) + ' folders in ' + summary['folder']
+                      + ' with ' + summary['strategy'] + ' strategy, in ' + str(summary['seconds']) + ' seconds.')
+        if args.timings is not None:
+            pipeline.timer._save(args.timings)
+            print('Wrote the timings to ' + args.timings + '.')
+    except (ValueError, EnvironmentError) as error:
+        print('Error: ' + str(error), file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    # Usage: python cli.py --folder <folder path> --method average --cut 0.9 --output clusters.json
+    sys.exit(main())
\ No newline at end of file
@@ -1,18 +1,44 @@
 
 from clustering.Dendrogram import Dendrogram
+from clustering.DistanceMatrix import DistanceMatrix
+from clustering.MiniBatchKMeans import MiniBatchKMeans
+from clustering.RandomProjection import RandomProjection
+from pipeline.StageTimer import StageTimer
 
-from scipy.cluster.hierarchy import linkage, cophenet
+from scipy.cluster.hierarchy import linkage, cophenet, fcluster
+from scipy.sparse import csr_matrix, diags, issparse
+import numpy as np
+import threading
 
 class Clusterer:
     
-    def __init__(self, corpus):
+    # In scalable mode, documents are first partitioned into micro-clusters, and the hierarchy is built over them.
+    # It is used by default once the corpus has more documents than SCALABLE_THRESHOLD.
+    SCALABLE_THRESHOLD = 5000
+    MICRO_CLUSTERS = 2000
+    PROJECTION_COMPONENTS = 256
+    
+    def __init__(self, corpus, tfidf_matrix, scalable=None, timer=None, reducer=None, detector=None, inverted_index=None):
         """
         The constructor for Clusterer class.
 
         Parameters
         ----------
-        corpus : list
-            The list of documents to be clustered.
+        corpus : CorpusStore
+            The store of documents to be clustered.
+        tfidf_matrix : TfidfMatrix
+            The tf-idf matrix of the corpus.
+        scalable : boolean, optional
+            The scalable mode status. The default is None (used if the corpus has more than SCALABLE_THRESHOLD documents).
+        timer : StageTimer, optional
+            The timer measuring the deduplication, reduction, distance_matrix, linkage, auto_naming and rendering stages. The default is None (a new timer).
+        reducer : DimensionReducer, optional
+            The reducer of the tf-idf rows, applied before the distance matrix is built. The default is None (distances over all terms).
+        detector : DuplicateDetector, optional
+            The detector of near-duplicate documents, each group of which is clustered as its first document. The default is None (no collapsing).
+        inverted_index : InvertedIndex, optional
+            The inverted index, whose postings give the set of terms of each documents to the detector.
+            The default is None (the set of terms weighted in the tf-idf matrix).
 
         Returns
         -------
@@ -20,22 +46,125 @@ class Clusterer:
 
         """
         self.__corpus = corpus
-        self.__distance_matrix = []
+        self.__tfidf_matrix = tfidf_matrix
+        self.__scalable = len(corpus) > self.SCALABLE_THRESHOLD if scalable is None else scalable
+        self.__timer = timer if timer is not None else StageTimer()
+        self.__reducer = reducer
+        self.__detector = detector
+        self.__inverted_index = inverted_index
+        
+        # Index the documents' title by row of the tf-idf matrix.
+        titles_by_id = dict(zip(corpus.doc_ids, corpus.titles))
+        self.__titles = [titles_by_id[doc_id] for doc_id in tfidf_matrix.doc_ids]
+        self.__leaf_list = None
+        self.__row_leaves = None
+        self.__distance_matrix = None
         self.__linkage = None
+        self.__linkage_list = {}
         self.__dendrogram = None
+        self.__cut_off = 0
+        
+        # The lock guards the distance matrix, and each method has its own lock for its linkage matrix.
+        self.__lock = threading.Lock()
+        self.__method_locks = {}
+    
+    @property
+    def scalable(self):
+        """
+        The method to get the scalable mode status.
+
+        Returns
+        -------
+        boolean
+            True if the hierarchy is built over micro-clusters instead of documents.
+
+        """
+        return self.__scalable
+    
+    @property
+    def reducer(self):
+        """
+        The method to get the reducer of the tf-idf rows.
+
+        Returns
+        -------
+        DimensionReducer
+            The reducer, or None if distances are calculated over all terms.
+
+        """
+        return self.__reducer
+    
+    @property
+    def detector(self):
+        """
+        The method to get the detector of near-duplicate documents.
+
+        Returns
+        -------
+        DuplicateDetector
+            The detector, or None if near-duplicates are not collapsed.
+
+        """
+        return self.__detector
+    
+    @property
+    def timer(self):
+        """
+        The method to get the timer measuring the stages of clustering.
+
+        Returns
+        -------
+        StageTimer
+            The timer.
+
+        """
+        return self.__timer
+    
+    @property
+    def cut_off(self):
+        """
+        The method to get the cut-off height.
+
+        Returns
+        -------
+        float
+            The cut-off height.
+
+        """
+        return self.__cut_off
+    
+    @cut_off.setter
+    def cut_off(self, cut_off):
+        """
+        The method to set the cut-off height.
+
+        Parameters
+        ----------
+        cut_off : float
+            The new cut-off height.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__cut_off = cut_off
         
-    def plot_dendrogram(self, cut_off=0, figsize=(10, 5), orientation='right'):
+    def plot_dendrogram(self, cut_off=None, figsize=(10, 5), orientation='right', leaf_budget=None):
         """
         The method to get dendrogram figure.
+        Plotting is optional, clusters are extracted from the linkage matrix without any figure.
         
         Parameters
         ----------
         cut_off : float, optional
-            The cut-off height. The default is 0.
+            The cut-off height, which is kept for extracting clusters. The default is None (the current cut-off height).
         figsize : tuple
             The size of the dendrogram figure. The default is (10, 5).
         orientation : string
             The dendrogram figure orientation. The default is right.
+        leaf_budget : int, optional
+            The maximum number of leaves shown, the others are collapsed. The default is None (Dendrogram.LEAF_BUDGET).
 
         Returns
         -------
@@ -43,7 +172,67 @@ class Clusterer:
             A figure of a dendrogram visualizing the result of clustering process.
 
         """
-        return self.__dendrogram._plot_dendrogram(self.__linkage, cut_off, [doc.title for doc in self.__corpus], figsize, orientation) if self.__dendrogram is not None else None
+        if cut_off is not None:
+            self.__cut_off = cut_off
+        if self.__dendrogram is None:
+            return None
+        with self.__timer._measure('rendering'):
+            leaf_titles = self.__get_leaf_titles()
+            return self.__dendrogram._plot_dendrogram(self.__linkage, self.__cut_off, list(leaf_titles.keys()), figsize, orientation,
+                                                      leaf_budget, [len(titles) for titles in leaf_titles.values()])
+    
+    def connect_dendrogram(self, canvas):
+        """
+        The method to connect the dendrogram figure to the canvas it is drawn on, so it can be cut without plotting it again.
+        
+        Parameters
+        ----------
+        canvas : FigureCanvas
+            The canvas, which has not been drawn yet.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__dendrogram._connect(canvas)
+    
+    def cut_dendrogram(self, cut_off):
+        """
+        The method to cut the plotted dendrogram at another cut-off height.
+        Links are recolored and the cut line is moved on the current figure, which is much faster than plotting it again.
+        
+        Parameters
+        ----------
+        cut_off : float
+            The cut-off height, which is kept for extracting clusters.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__cut_off = cut_off
+        self.__dendrogram._cut(cut_off)
+    
+    def expand_dendrogram(self, xdata, ydata):
+        """
+        The method to expand the collapsed leaf of the plotted dendrogram closest to a point.
+        
+        Parameters
+        ----------
+        xdata : float
+            The x coordinate of the point.
+        ydata : float
+            The y coordinate of the point.
+
+        Returns
+        -------
+        boolean
+            True if a collapsed leaf was expanded.
+
+        """
+        return self.__dendrogram._expand(xdata, ydata)
     
     def cluster(self, method):
         """
@@ -61,44 +250,202 @@ class Clusterer:
         None.
 
         """
-        # Set a 1-D condensed distance matrix.
-        if self.__distance_matrix == []:
-            self.__build_distance_matrix()
-            
         # Set the linkage matrix as a result of the agglomerative hierarchical clustering process.
-        if self.__linkage is None:
-            self.__linkage = linkage(self.__distance_matrix,
-                             method=method)
-        self.__dendrogram = Dendrogram()    
+        # Linkage matrices are cached for each method, so switching methods does not recompute them.
+        self.__linkage = self.__get_linkage(method)
+        self.__dendrogram = Dendrogram()
     
-    def __build_distance_matrix(self):
+    def precompute(self, method_list):
+        """
+        The method to compute the linkage matrices of several methods in the background.
+        The distance matrix is computed once and shared between all methods.
+
+        Parameters
+        ----------
+        method_list : list
+            The list of methods.
+
+        Returns
+        -------
+        thread : Thread
+            The background thread.
+
+        """
+        def _precompute():
+            for method in method_list:
+                self.__get_linkage(method)
+        
+        thread = threading.Thread(target=_precompute, name='precomputing_thread', daemon=True)
+        thread.start()
+        return thread
+    
+    def __get_linkage(self, method):
+        """
+        The method to get the linkage matrix of a method, computing it (and the distance matrix) if it is not cached yet.
+
+        Parameters
+        ----------
+        method : string
+            The method used for calculating distances between two clusters.
+
+        Returns
+        -------
+        array
+            The linkage matrix.
+
+        """
+        # Set a 1-D condensed distance matrix, over the reduced tf-idf rows if there is a reducer.
+        # With a detector, only the first row of each group of near-duplicates is kept, and the group is expanded back as a leaf.
+        with self.__lock:
+            if self.__distance_matrix is None:
+                matrix = self.__tfidf_matrix.matrix
+                groups = None
+                if self.__detector is not None:
+                    with self.__timer._measure('deduplication'):
+                        if self.__inverted_index is not None:
+                            groups = self.__detector._detect_terms(self.__inverted_index, self.__tfidf_matrix.doc_ids)
+                        else:
+                            groups = self.__detector._detect(matrix)
+                        matrix = matrix[np.unique(groups, return_index=True)[1]]
+                if self.__reducer is not None:
+                    with self.__timer._measure('reduction'):
+                        matrix = self.__reducer._reduce(matrix)
+                with self.__timer._measure('distance_matrix'):
+                    self.__build_distance_matrix(matrix)
+                if groups is not None:
+                    self.__set_leaves(groups if self.__row_leaves is None else self.__row_leaves[groups])
+            method_lock = self.__method_locks.setdefault(method, threading.Lock())
+        
+        with method_lock:
+            if method not in self.__linkage_list:
+                with self.__timer._measure('linkage'):
+                    self.__linkage_list[method] = linkage(self.__distance_matrix,
+                                                          method=method)
+        return self.__linkage_list[method]
+    
+    def __build_distance_matrix(self, matrix):
         """
         The method to build a 1-D condensed distance matrix.
         Each elements of the matrix is cosine distance between two documents in corpus.
+        In scalable mode, each elements is cosine distance between the centroids of two micro-clusters instead.
+
+        Parameters
+        ----------
+        matrix : csr_matrix or ndarray
+            The tf-idf rows, or their reduction, written as documents x dimensions.
 
         Returns
         -------
         None.
 
         """
-        for i in range(0, len(self.__corpus)):
-            doc_i = self.__corpus[i]
-            for j in range(i + 1, len(self.__corpus)):
-                doc_j = self.__corpus[j]
-                distance = doc_i.calc_distance(doc_j)
-                self.__distance_matrix.append(distance)
+        if self.__scalable:
+            self.__distance_matrix = DistanceMatrix()._build(self.__build_micro_clusters(matrix))
+        else:
+            self.__distance_matrix = DistanceMatrix()._build(matrix)
     
-    def extract_clusters(self, dictionary=None, autorenaming_option=True):
+    def __build_micro_clusters(self, matrix):
+        """
+        The method to partition the documents into micro-clusters with mini-batch k-means.
+        K-means runs on a random projection of the tf-idf rows, which is much cheaper than the whole vocabulary.
+        Centroids are then calculated from the tf-idf rows (or their reduction), so micro-clusters are compared in the space of the distance matrix.
+
+        Parameters
+        ----------
+        matrix : csr_matrix or ndarray
+            The tf-idf rows, or their reduction, written as documents x dimensions.
+
+        Returns
+        -------
+        csr_matrix or ndarray
+            The centroids of the micro-clusters, written as micro-clusters x dimensions.
+
+        """
+        projected = RandomProjection(self.PROJECTION_COMPONENTS)._fit_transform(matrix)
+        labels = MiniBatchKMeans(self.MICRO_CLUSTERS)._fit_predict(projected)
+        
+        # Group the rows of each micro-clusters, and average their normalized tf-idf rows.
+        n_leaves = labels.max() + 1 if len(labels) > 0 else 0
+        self.__set_leaves(labels)
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel()) if issparse(matrix) else np.linalg.norm(matrix, axis=1)
+        norms[norms == 0] = 1
+        membership = csr_matrix((np.ones(len(labels)), (labels, np.arange(len(labels)))), shape=(n_leaves, len(labels)))
+        return diags(1 / np.bincount(labels, minlength=n_leaves)) @ membership @ diags(1 / norms) @ matrix
+    
+    def __set_leaves(self, row_leaves):
+        """
+        The method to set the leaf of each rows, and the rows of each leaves.
+
+        Parameters
+        ----------
+        row_leaves : ndarray
+            The leaf of each rows of the tf-idf matrix, numbered from 0 as the leaves of the linkage matrix.
+
+        Returns
+        -------
+        None.
+
+        """
+        n_leaves = row_leaves.max() + 1 if len(row_leaves) > 0 else 0
+        order = np.argsort(row_leaves, kind='stable')
+        bounds = np.searchsorted(row_leaves[order], np.arange(n_leaves + 1))
+        self.__leaf_list = [order[bounds[i]:bounds[i + 1]] for i in range(0, n_leaves)]
+        self.__row_leaves = row_leaves
+    
+    def __get_leaf_titles(self):
+        """
+        The method to get the label of each leaves of the dendrogram, along with its documents' title.
+        In scalable mode or with a detector, a leaf is a micro-cluster or a group of near-duplicates, labelled after its first document and the number of the others.
+
+        Returns
+        -------
+        dictionary
+            The documents' title of each leaves, in the order of the linkage matrix.
+            Written as {label1: [doc1, doc2], label2: [doc3], etc.}.
+
+        """
+        if self.__leaf_list is None:
+            return {title: [title] for title in self.__titles}
+        
+        leaf_titles = {}
+        for rows in self.__leaf_list:
+            titles = [self.__titles[row] for row in rows]
+            label = titles[0] if len(titles) == 1 else titles[0] + ' (+' + str(len(titles) - 1) + ')'
+            leaf_titles[label] = titles
+        return leaf_titles
+    
+    def assign_clusters(self, cut_off=None):
+        """
+        The method to assign each documents to a cluster, by cutting the hierarchy at a cut-off height.
+        Clusters are computed from the linkage matrix only, so it is cheap enough to be called for many cut-off heights.
+        
+        Parameters
+        ----------
+        cut_off : float, optional
+            The cut-off height. The default is None (the current cut-off height).
+            Documents are in the same cluster if they are merged at or below it, and in a single cluster if it is 0 or less.
+
+        Returns
+        -------
+        dictionary
+            The cluster id of each documents' id.
+            Cluster ids are numbered from 0, in the order of the first document of each clusters in corpus.
+
+        """
+        labels = self.__get_labels(self.__cut_off if cut_off is None else cut_off)
+        return dict(zip(self.__tfidf_matrix.doc_ids, labels.tolist()))
+    
+    def extract_clusters(self, autorenaming_option=True, cut_off=None):
         """
         The method to get a list of objects of each clusters obtained.
         Each cluster is named automatically based on most frequent terms (if autorenaming is True).
         
         Parameters
         ----------
-        dictionary : list, optional
-            The list of sorted terms. The default is None.
         autorenaming : boolean
             The autorenaming status. The default is True.
+        cut_off : float, optional
+            The cut-off height. The default is None (the current cut-off height).
 
         Returns
         -------
@@ -107,63 +454,111 @@ class Clusterer:
             Written as {cluster1: [doc1, doc2], cluster2: [doc3], etc.}.
 
         """
-        cluster_list = self.__dendrogram._extract_clusters_by_color()
-        return cluster_list if autorenaming_option is False else self.__autorename_clusters(cluster_list, dictionary, 5)
+        labels = self.__get_labels(self.__cut_off if cut_off is None else cut_off)
+        if autorenaming_option is True:
+            with self.__timer._measure('auto_naming'):
+                names = self.__name_clusters(labels, 5)
+        else:
+            names = ['Cluster ' + str(label + 1) for label in range(0, labels.max() + 1)]
+        cluster_list = {}
+        for title, label in zip(self.__titles, labels.tolist()):
+            cluster_list.setdefault(names[label], []).append(title)
+        return cluster_list
     
-    def __autorename_clusters(self, cluster_list, dictionary, n=1):
+    def __get_labels(self, cut_off):
         """
-        The method to rename all clusters in cluster list based on most frequent terms.
+        The method to get the cluster id of each rows of the tf-idf matrix.
 
         Parameters
         ----------
-        cluster_list : dictionary
-            The cluster result list which clusters are not named.
-        dictionary : list
-            The list of sorted terms.
-        n : init
+        cut_off : float
+            The cut-off height.
+
+        Returns
+        -------
+        labels : ndarray
+            The cluster id of each rows.
+
+        """
+        n_leaves = len(self.__linkage) + 1
+        if cut_off <= 0:
+            leaf_labels = np.zeros(n_leaves, dtype=np.int64)
+        else:
+            leaf_labels = fcluster(self.__linkage, cut_off, criterion='distance')
+        
+        # Expand each leaves into its rows, since a leaf is a micro-cluster in scalable mode or a group of near-duplicates with a detector.
+        labels = np.asarray(leaf_labels)[self.__row_leaves] if self.__row_leaves is not None else np.asarray(leaf_labels)
+        
+        # Renumber clusters in the order of their first row, so ids do not depend on fcluster's numbering.
+        unique_labels, first_rows, labels = np.unique(labels, return_index=True, return_inverse=True)
+        rank = np.empty(len(unique_labels), dtype=np.int64)
+        rank[np.argsort(first_rows)] = np.arange(len(unique_labels))
+        return rank[labels.ravel()]
+    
+    def __name_clusters(self, labels, n=1):
+        """
+        The method to name all clusters based on most frequent terms.
+        Terms are the ones with a non-zero weight in every document of the cluster, ranked by the product of their weights.
+        All clusters are named at once with sparse matrix operations over the rows of each clusters.
+
+        Parameters
+        ----------
+        labels : ndarray
+            The cluster id of each rows of the tf-idf matrix.
+        n : int
             The n-most common terms.
 
         Returns
         -------
-        dictionary
-            The list of objects of each now-renamed clusters.
-
-        """
-        renamed_cluster_list = {}
-        for cluster, docs in cluster_list.items():
-            list_of_vectors = []
-            for doc_title in docs:
-                for doc in self.__corpus:
-                    if doc.title == doc_title:
-                        list_of_vectors.append(doc.vector)
-            
-            def multiply_vector(vector):
-                res = 1
-                for dim in vector:
-                    res *= dim
-                return res
-            
-            # Calculate intersection between vectors.
-            intersect = [multiply_vector(vector) for vector in zip(*list_of_vectors)]
-            
-            # Find common words between all documents.
-            common_words = {}
-            for i in range(0, len(intersect)):
-                if intersect[i] != 0:
-                    common_words[intersect[i]] = dictionary[i]
-            
-            # Sort common words.
-            if (len(common_words) > 0):
-                sorted_commond_words = sorted(common_words.items(), reverse=True)[:n]
-                renamed_cluster_list[' '.join([str(elem[1]) for elem in sorted_commond_words])] = cluster_list[cluster]
-            else:
-                renamed_cluster_list[cluster] = cluster_list[cluster]
-        return renamed_cluster_list
+        names : list
+            The name of each clusters, or 'Cluster <id>' if its documents have no term in common.
+
+        """
+        matrix = self.__tfidf_matrix.matrix.tocsr()
+        dictionary = self.__tfidf_matrix.terms
+        n_clusters = labels.max() + 1
+        sizes = np.bincount(labels, minlength=n_clusters)
+        membership = csr_matrix((np.ones(len(labels)), (labels, np.arange(len(labels)))), shape=(n_clusters, len(labels)))
+        
+        # Sum the log-weights (shifted to stay positive, so no sum is dropped as zero) and count the documents of each terms.
+        # Within a cluster, ranking shared terms by the shifted sum is the same as ranking them by the product of weights.
+        # A weight which is not positive (e.g. an explicit zero) is left out, as a term the document does not contain.
+        positive = matrix.data > 0
+        log_weights = np.log(matrix.data, out=np.zeros(len(matrix.data)), where=positive)
+        shift = 1 - log_weights[positive].min() if positive.any() else 0
+        scores = membership @ csr_matrix((np.where(positive, log_weights + shift, 0), matrix.indices, matrix.indptr), shape=matrix.shape)
+        counts = membership @ csr_matrix((positive.astype(np.float64), matrix.indices, matrix.indptr), shape=matrix.shape)
+        scores.sort_indices()
+        counts.sort_indices()
+        
+        # Keep the terms shared by every document of their cluster.
+        rows = np.repeat(np.arange(n_clusters), np.diff(counts.indptr))
+        shared = counts.data == sizes[rows]
+        rows, cols, weights = rows[shared], counts.indices[shared], scores.data[shared]
+        
+        # Sort terms by cluster, then by decreasing score, ties broken by term order, and keep the n first of each clusters.
+        order = np.lexsort((cols, -weights, rows))
+        rows, cols = rows[order], cols[order]
+        ranks = np.arange(len(rows)) - np.searchsorted(rows, rows)
+        rows, cols = rows[ranks < n], cols[ranks < n]
+        
+        # Name each clusters, keeping names unique.
+        names = ['Cluster ' + str(label + 1) for label in range(0, n_clusters)]
+        used = set(names)
+        bounds = np.searchsorted(rows, np.arange(n_clusters + 1))
+        for label in range(0, n_clusters):
+            if bounds[label] < bounds[label + 1]:
+                name = ' '.join(dictionary[col] for col in cols[bounds[label]:bounds[label + 1]])
+                names[label] = name if name not in used else name + ' (' + str(label + 1) + ')'
+                used.add(names[label])
+        return names
     
     def calc_cophenetic_coeff(self):
         """
         The method to calculate a cophenetic coefficient correlation (CPCC) for the result obtained.
         The CPCC value can be used for an internal evaluation of the clusters.
+        In scalable mode, it is calculated between micro-clusters. With a reducer, it is calculated against the distances between reduced rows.
+        With a detector, it is calculated between the first documents of each groups of near-duplicates.
 
         Returns
         -------
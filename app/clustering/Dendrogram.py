@@ -1,15 +1,54 @@
-
-from scipy.cluster.hierarchy import dendrogram
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+from scipy.cluster.hierarchy import leaves_list, fcluster
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba_array
+from matplotlib.figure import Figure
+import numpy as np
+import heapq
 
 class Dendrogram:
-        
-    def _plot_dendrogram(self, linkage, cut_off, labels, figsize=(10, 5), orientation='right'):
+
+    # Links merged at or below the cut-off height take the color of their cluster, and the others ABOVE_COLOR.
+    COLOR_LIST = ['C1', 'C2', 'C3', 'C4', 'C5', 'C6', 'C7', 'C8', 'C9']
+    ABOVE_COLOR = 'C0'
+
+    # At most LEAF_BUDGET leaves are shown at first, and each collapsed leaf expanded shows up to EXPANSION_SIZE more.
+    LEAF_BUDGET = 200
+    EXPANSION_SIZE = 20
+
+    def __init__(self):
+        """
+        The constructor for Dendrogram class.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__figure = None
+        self.__linkage = None
+        self.__labels = None
+        self.__order = None
+        self.__size_sums = None
+        self.__expanded = None
+        self.__leaves = None
+        self.__links = None
+        self.__first_leaves = None
+        self.__segments = None
+        self.__cut_off = 0
+        self.__link_collection = None
+        self.__changed_collection = None
+        self.__cut_line = None
+        self.__orientation = None
+        self.__canvas = None
+        self.__background = None
+        self.__background_dpi = None
+
+    def _plot_dendrogram(self, linkage, cut_off, labels, figsize=(10, 5), orientation='right', leaf_budget=None, leaf_sizes=None):
         """
         The method to plot dendrogram diagram.
-        
+        Links are drawn as a single collection, so the dendrogram can be cut again without plotting a new figure.
+        Only the highest links are shown, the subtrees below them are collapsed into leaves labelled with their size.
+
         Parameters
         ----------
         linkage : array
@@ -22,6 +61,10 @@ class Dendrogram:
             The size of the dendrogram figure. The default is [10, 5].
         orientation : string
             The figure orientation. The default is right.
+        leaf_budget : int, optional
+            The maximum number of leaves shown. The default is None (LEAF_BUDGET).
+        leaf_sizes : list, optional
+            The number of documents of each leaves. The default is None (one document each).
 
         Returns
         -------
@@ -29,39 +72,286 @@ class Dendrogram:
             The figure of the dendrogram.
 
         """
-        fig = plt.figure(figsize=figsize, dpi=100 if orientation == 'top' else None)
-        self.__dend = dendrogram(linkage,
-                    orientation=orientation,
-                    color_threshold=cut_off,
-                    labels=labels)
-        
-        # Cut the dendrogram at cut-off height.
-        # Check whether the figure is shown horizontally or vertically.
-        if cut_off != 0:
-            if orientation == 'right':
-                plt.axvline(x=cut_off, linestyle='dashed')
-            else:
-                plt.axhline(y=cut_off, linestyle='dashed')
+        fig = Figure(figsize=figsize, dpi=100 if orientation == 'top' else None)
+        ax = fig.add_subplot(1, 1, 1)
+        self.__figure = fig
+        self.__linkage = linkage
+        self.__labels = labels
+        self.__orientation = orientation
+        self.__cut_off = cut_off
+
+        # Count the documents under each leaves of the hierarchy, in the order of the leaves.
+        n = len(linkage) + 1
+        self.__order = leaves_list(linkage)
+        sizes = np.ones(n, dtype=np.int64) if leaf_sizes is None else np.asarray(leaf_sizes, dtype=np.int64)
+        self.__size_sums = np.concatenate([[0], np.cumsum(sizes[self.__order])])
+
+        # Expand the highest links first, until the leaf budget is reached.
+        self.__expanded = set()
+        self.__expand_subtree(2 * n - 2, (self.LEAF_BUDGET if leaf_budget is None else leaf_budget) - 1)
+
+        self.__link_collection = LineCollection([], colors=self.ABOVE_COLOR)
+        ax.add_collection(self.__link_collection)
+
+        # Recolored links are drawn over the others when the dendrogram is cut by blitting.
+        self.__changed_collection = LineCollection([], animated=True)
+        ax.add_collection(self.__changed_collection)
+
+        # The cut line is always plotted, and hidden while the dendrogram is not cut.
+        if orientation == 'right':
+            self.__cut_line = ax.axvline(x=cut_off, linestyle='dashed')
+        else:
+            self.__cut_line = ax.axhline(y=cut_off, linestyle='dashed')
+        self.__layout()
         return fig
-    
-    def _extract_clusters_by_color(self):
+
+    def _connect(self, canvas):
+        """
+        The method to connect the dendrogram to the canvas the figure is drawn on, so it can be cut by blitting.
+        The cut line becomes animated, and is drawn after the rest of the figure is saved as background.
+        It must be called before the canvas is drawn for the first time.
+
+        Parameters
+        ----------
+        canvas : FigureCanvas
+            The canvas.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__canvas = canvas
+        self.__background = None
+        self.__cut_line.set_animated(True)
+        canvas.mpl_connect('draw_event', self.__on_draw)
+
+    def _cut(self, cut_off):
+        """
+        The method to cut the dendrogram at another cut-off height.
+        Only links whose color changes are drawn again, over the saved background, and the figure is updated by blitting.
+
+        Parameters
+        ----------
+        cut_off : float
+            The cut-off height.
+
+        Returns
+        -------
+        None.
+
+        """
+        changed = self.__update_artists(cut_off)
+        canvas = self.__canvas
+        if canvas is None:
+            return
+
+        # Draw the whole figure again if there is no background yet, or if it was saved at another resolution.
+        if self.__background is None or self.__background_dpi != self.__figure.dpi:
+            canvas.draw()
+            return
+        renderer = canvas.get_renderer()
+        canvas.restore_region(self.__background)
+
+        # Draw the recolored links over the background, which then becomes the new background.
+        if changed.any():
+            self.__changed_collection.set_segments(self.__segments[changed])
+            self.__changed_collection.set_color(self.__link_collection.get_colors()[changed])
+            self.__changed_collection.draw(renderer)
+            self.__background = canvas.copy_from_bbox(self.__figure.bbox)
+        self.__cut_line.draw(renderer)
+        canvas.blit(self.__figure.bbox)
+
+    def _expand(self, xdata, ydata):
+        """
+        The method to expand the collapsed leaf closest to a point, showing up to EXPANSION_SIZE more leaves under it.
+
+        Parameters
+        ----------
+        xdata : float
+            The x coordinate of the point.
+        ydata : float
+            The y coordinate of the point.
+
+        Returns
+        -------
+        boolean
+            True if a collapsed leaf was expanded.
+
+        """
+        # Leaves are placed 10 units apart along the axis of the leaves.
+        position = ydata if self.__orientation == 'right' else xdata
+        i = int(position // 10)
+        if i < 0 or i >= len(self.__leaves) or self.__leaves[i] <= len(self.__linkage):
+            return False
+        self.__expand_subtree(self.__leaves[i], self.EXPANSION_SIZE)
+        self.__layout()
+        if self.__canvas is not None:
+            self.__canvas.draw()
+        return True
+
+    def __expand_subtree(self, node, n_expansions):
+        """
+        The method to expand the highest links of a subtree, each expansion showing one more leaf.
+
+        Parameters
+        ----------
+        node : int
+            The root node of the subtree.
+        n_expansions : int
+            The maximum number of links expanded.
+
+        Returns
+        -------
+        None.
+
+        """
+        n = len(self.__linkage) + 1
+        heap = [(-self.__linkage[node - n, 2], node)] if node >= n else []
+        while len(heap) > 0 and n_expansions > 0:
+            height, node = heapq.heappop(heap)
+            self.__expanded.add(node)
+            n_expansions -= 1
+            for child in self.__linkage[node - n, :2].astype(np.int64):
+                if child >= n:
+                    heapq.heappush(heap, (-self.__linkage[child - n, 2], child))
+
+    def __layout(self):
+        """
+        The method to place the shown leaves and links, and update the figure with them.
+        Only shown nodes are visited, so the time taken depends on the leaf budget rather than the corpus size.
+
+        Returns
+        -------
+        None.
+
+        """
+        n = len(self.__linkage) + 1
+        counts = self.__linkage[:, 3].astype(np.int64)
+
+        # Visit the shown nodes from the root, left child first, to get the leaves in order.
+        # The leaves under a node are the ones from its start in the order of the leaves.
+        leaves, starts, links = [], {}, []
+        stack = [(2 * n - 2, 0)]
+        while len(stack) > 0:
+            node, start = stack.pop()
+            starts[node] = start
+            if node in self.__expanded:
+                links.append(node)
+                left, right = self.__linkage[node - n, :2].astype(np.int64)
+                stack.append((right, start + (counts[left - n] if left >= n else 1)))
+                stack.append((left, start))
+            else:
+                leaves.append(node)
+        self.__leaves = leaves
+
+        # Place each leaves 10 units apart, and each links midway between its children.
+        # Links are numbered bottom-up, so children are placed before their parents.
+        positions, heights = {}, {}
+        for i, node in enumerate(leaves):
+            positions[node] = 5 + 10 * i
+            heights[node] = 0
+        links.sort()
+        for node in links:
+            left, right = self.__linkage[node - n, :2].astype(np.int64)
+            positions[node] = (positions[left] + positions[right]) / 2
+            heights[node] = self.__linkage[node - n, 2]
+        self.__links = np.array(links, dtype=np.int64) - n
+        self.__first_leaves = self.__order[np.array([starts[node] for node in links], dtype=np.int64)]
+
+        # Each link is drawn as a line from its left child up to its height and down to its right child.
+        left, right = self.__linkage[self.__links, 0].astype(np.int64), self.__linkage[self.__links, 1].astype(np.int64)
+        x = np.array([[positions[l], positions[l], positions[r], positions[r]] for l, r in zip(left, right)]).reshape(-1, 4)
+        y = np.array([[heights[l], heights[node], heights[node], heights[r]] for node, l, r in zip(links, left, right)]).reshape(-1, 4)
+        self.__segments = np.stack([y, x], axis=2) if self.__orientation == 'right' else np.stack([x, y], axis=2)
+        self.__link_collection.set_segments(self.__segments)
+        self.__update_artists(self.__cut_off)
+
+        # Label collapsed leaves with the number of documents under them.
+        leaf_labels = []
+        for node in leaves:
+            if node < n:
+                leaf_labels.append(self.__labels[node])
+            else:
+                start = starts[node]
+                leaf_labels.append('(' + str(self.__size_sums[start + counts[node - n]] - self.__size_sums[start]) + ')')
+
+        # Set the axes the way scipy plots a dendrogram.
+        ax = self.__link_collection.axes
+        n_leaves = len(leaves)
+        leaf_positions = 5 + 10 * np.arange(n_leaves)
+        max_height = max(self.__linkage[:, 2].max(), 1e-6) * 1.05
+        font_size = 12 if n_leaves <= 20 else 10 if n_leaves <= 30 else 8 if n_leaves <= 50 else 6 if n_leaves <= 85 else 5
+        if self.__orientation == 'right':
+            ax.set_xlim(max_height, 0)
+            ax.set_ylim(0, 10 * n_leaves)
+            ax.set_yticks(leaf_positions)
+            ax.set_yticklabels(leaf_labels, fontsize=font_size)
+            ax.yaxis.set_ticks_position('right')
+        else:
+            ax.set_xlim(0, 10 * n_leaves)
+            ax.set_ylim(0, max_height)
+            ax.set_xticks(leaf_positions)
+            ax.set_xticklabels(leaf_labels, fontsize=font_size, rotation=0 if n_leaves <= 20 else 45 if n_leaves <= 40 else 90)
+            ax.xaxis.set_ticks_position('bottom')
+
+    def __update_artists(self, cut_off):
+        """
+        The method to update the link colors and the cut line for a cut-off height.
+        The color of a cluster depends on its topmost link, so it does not change when other clusters are cut.
+
+        Parameters
+        ----------
+        cut_off : float
+            The cut-off height.
+
+        Returns
+        -------
+        changed : ndarray
+            The mask of links whose color changed.
+
+        """
+        self.__cut_off = cut_off
+        n_links = len(self.__links)
+        color_list = to_rgba_array(self.COLOR_LIST)
+        colors = np.tile(to_rgba_array(self.ABOVE_COLOR), (n_links, 1))
+        below = self.__linkage[self.__links, 2] <= cut_off
+        if cut_off > 0 and below.any():
+            # The topmost link of a cluster is the one with the highest number, since links are numbered bottom-up.
+            # It is always shown if any other link of the cluster is, since links are expanded from the root.
+            leaf_labels = fcluster(self.__linkage, cut_off, criterion='distance')
+            link_labels = leaf_labels[self.__first_leaves[below]]
+            top_links = np.zeros(leaf_labels.max() + 1, dtype=np.int64)
+            np.maximum.at(top_links, link_labels, self.__links[below])
+            colors[below] = color_list[top_links[link_labels] % len(color_list)]
+
+        # Recolor the links only if a color changed.
+        current = self.__link_collection.get_colors()
+        changed = np.ones(n_links, dtype=bool) if len(current) != n_links else np.any(current != colors, axis=1)
+        if changed.any():
+            self.__link_collection.set_color(colors)
+        if self.__orientation == 'right':
+            self.__cut_line.set_xdata([cut_off, cut_off])
+        else:
+            self.__cut_line.set_ydata([cut_off, cut_off])
+        self.__cut_line.set_visible(cut_off > 0)
+        return changed
+
+    def __on_draw(self, event):
         """
-        The method to extract a list of objects of each clusters in the dendrogram based on colors.
-        Shout out to http://www.nxn.se/valent/extract-cluster-elements-by-color-in-python.
-        
+        The method to save the background and draw the cut line, each time the figure is drawn.
+
+        Parameters
+        ----------
+        event : DrawEvent
+            The draw event.
+
         Returns
         -------
-        cluster_list : dictionary
-            The list of objects of each clusters.
-            Written as {cluster1: [doc1, doc2], cluster2: [doc3], etc.}.
-
-        """
-        cluster_list = {}
-        for c, pi in zip(self.__dend['color_list'], self.__dend['icoord']):
-            for leg in pi[1:3]:
-                i = (leg - 5) / 10
-                if abs(i - int(i)) <= 0:
-                    if c not in cluster_list:
-                        cluster_list[c] = []
-                    cluster_list[c].append(self.__dend['ivl'][int(i)])
-        return cluster_list
\ No newline at end of file
+        None.
+
+        """
+        if event.canvas is self.__canvas:
+            self.__background = self.__canvas.copy_from_bbox(self.__figure.bbox)
+            self.__background_dpi = self.__figure.dpi
+        self.__cut_line.draw(event.renderer)
\ No newline at end of file
@@ -0,0 +1,130 @@
+from clustering.RandomProjection import RandomProjection
+
+from scipy.sparse.linalg import svds
+
+import numpy as np
+
+class DimensionReducer:
+
+    # The reduction is either a truncated singular value decomposition (latent semantic analysis) or a sparse random projection.
+    METHOD_LIST = ['svd', 'random_projection']
+
+    def __init__(self, method='svd', n_components=100, random_state=0):
+        """
+        The constructor for DimensionReducer class.
+        The reducer projects the tf-idf rows into a few dimensions before the distance matrix is built,
+        so each cosine distance is calculated over n_components dimensions instead of the whole vocabulary.
+
+        Parameters
+        ----------
+        method : string, optional
+            The method of reduction, svd or random_projection. The default is svd.
+        n_components : int, optional
+            The number of dimensions after reduction. The default is 100.
+        random_state : int, optional
+            The seed of the random generator, so a corpus is always reduced the same way. The default is 0.
+
+        Raises
+        ------
+        ValueError
+            If the method is unknown, or n_components is less than 1.
+
+        Returns
+        -------
+        None.
+
+        """
+        if method not in self.METHOD_LIST:
+            raise ValueError('method must be one of ' + ', '.join(self.METHOD_LIST) + '.')
+        if isinstance(n_components, bool) or not isinstance(n_components, int) or n_components < 1:
+            raise ValueError('n_components must be a positive number of dimensions.')
+        self.__method = method
+        self.__n_components = n_components
+        self.__random_state = random_state
+
+    @property
+    def method(self):
+        """
+        The method to get the method of reduction.
+
+        Returns
+        -------
+        string
+            The method of reduction, svd or random_projection.
+
+        """
+        return self.__method
+
+    @property
+    def n_components(self):
+        """
+        The method to get the number of dimensions after reduction.
+
+        Returns
+        -------
+        int
+            The number of dimensions.
+
+        """
+        return self.__n_components
+
+    @property
+    def option(self):
+        """
+        The method to get the reduction option, to be saved along with an index.
+
+        Returns
+        -------
+        dictionary
+            The method of reduction and the number of dimensions.
+
+        """
+        return {'method': self.__method, 'n_components': self.__n_components}
+
+    def _reduce(self, matrix):
+        """
+        The method to reduce the dimensions of a matrix.
+        A matrix which does not have more than n_components documents or features is kept in its own dimensions,
+        since its cosine distances cannot be calculated over fewer dimensions anyway.
+
+        Parameters
+        ----------
+        matrix : csr_matrix
+            The matrix, written as documents x features.
+
+        Returns
+        -------
+        csr_matrix or ndarray
+            The reduced matrix, written as documents x dimensions.
+
+        """
+        if self.__method == 'random_projection':
+            return RandomProjection(self.__n_components, self.__random_state)._fit_transform(matrix)
+        if self.__n_components >= min(matrix.shape):
+            return matrix
+
+        # Each document is written in the basis of the largest singular vectors, scaled by their singular values.
+        # The starting vector of the solver is seeded, so the decomposition is the same on every run.
+        v0 = np.random.RandomState(self.__random_state).uniform(-1, 1, min(matrix.shape))
+        u, s, vt = svds(matrix.astype(np.float64), k=self.__n_components, v0=v0)
+        return u * s
+
+    @staticmethod
+    def _from_option(option):
+        """
+        The method to build a reducer from a saved reduction option.
+
+        Parameters
+        ----------
+        option : dictionary
+            The reduction option, or None.
+
+        Returns
+        -------
+        DimensionReducer
+            The reducer, or None if there is no reduction option.
+
+        """
+        if option is None:
+            return None
+        return DimensionReducer(option['method'], option['n_components'])
\ No newline at end of file
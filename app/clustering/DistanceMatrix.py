@@ -0,0 +1,87 @@
+
+from scipy.sparse import issparse, diags
+
+import numpy as np
+
+class DistanceMatrix:
+
+    def __init__(self, block_bytes=32 * 1024 * 1024):
+        """
+        The constructor for DistanceMatrix class.
+
+        Parameters
+        ----------
+        block_bytes : int, optional
+            The memory budget (in bytes) of a dense block of similarities. The default is 32 MiB.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__block_bytes = block_bytes
+
+    def _build(self, matrix):
+        """
+        The method to build a 1-D condensed cosine distance matrix.
+        Rows are L2-normalized once, then similarities are computed block by block with matrix products
+        and written into a preallocated array, in the order expected by linkage and cophenet.
+
+        Parameters
+        ----------
+        matrix : csr_matrix or ndarray
+            The matrix of documents, written as documents x features.
+
+        Returns
+        -------
+        distance_matrix : ndarray
+            The condensed distance matrix, of size n * (n - 1) / 2.
+
+        """
+        normalized = self.__normalize(matrix)
+        n = normalized.shape[0]
+        distance_matrix = np.empty(n * (n - 1) // 2, dtype=np.float64)
+
+        # Calculate the number of rows per block, so that a dense block of similarities fits in the memory budget.
+        block_size = max(1, self.__block_bytes // (8 * max(n, 1)))
+        offset = 0
+        for start in range(0, n, block_size):
+            stop = min(start + block_size, n)
+
+            # Only similarities with documents from the current block onwards are needed (upper triangle).
+            similarity = normalized[start:stop] @ normalized[start:].T
+            similarity = similarity.toarray() if issparse(similarity) else np.asarray(similarity)
+            for i in range(start, stop):
+                row = similarity[i - start, i - start + 1:]
+                np.subtract(1, row, out=distance_matrix[offset:offset + len(row)])
+                offset += len(row)
+
+        # Remove rounding errors, since a cosine distance is always in range of 0 and 2.
+        np.clip(distance_matrix, 0, 2, out=distance_matrix)
+        return distance_matrix
+
+    def __normalize(self, matrix):
+        """
+        The method to L2-normalize each rows of a matrix.
+        A row without any weight is kept as it is, so its distance to every other row is 1.
+
+        Parameters
+        ----------
+        matrix : csr_matrix or ndarray
+            The matrix of documents.
+
+        Returns
+        -------
+        csr_matrix or ndarray
+            The normalized matrix.
+
+        """
+        if issparse(matrix):
+            matrix = matrix.tocsr().astype(np.float64)
+            norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+            norms[norms == 0] = 1
+            return diags(1 / norms) @ matrix
+        matrix = np.asarray(matrix, dtype=np.float64)
+        norms = np.linalg.norm(matrix, axis=1)
+        norms[norms == 0] = 1
+        return matrix / norms[:, np.newaxis]
\ No newline at end of file
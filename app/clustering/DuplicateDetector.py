@@ -0,0 +1,290 @@
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+import numpy as np
+
+class DuplicateDetector:
+
+    # MinHash values are computed modulo a Mersenne prime, with hash functions (a * term + b) mod PRIME.
+    # The terms of a block of documents are hashed at once, within BLOCK_BYTES of memory.
+    PRIME = 2 ** 31 - 1
+    BLOCK_BYTES = 4 * 1024 * 1024
+
+    def __init__(self, threshold=0.9, n_permutations=128, random_state=0):
+        """
+        The constructor for DuplicateDetector class.
+        The detector finds near-duplicate documents, whose sets of terms have a Jaccard similarity of at least threshold.
+        Candidate pairs are found by locality-sensitive hashing of MinHash signatures, then their exact similarity is checked.
+
+        Parameters
+        ----------
+        threshold : float, optional
+            The minimum Jaccard similarity between the terms of two near-duplicate documents. The default is 0.9.
+        n_permutations : int, optional
+            The number of hash functions of a MinHash signature. The default is 128.
+        random_state : int, optional
+            The seed of the random generator, so a corpus is always collapsed the same way. The default is 0.
+
+        Raises
+        ------
+        ValueError
+            If the threshold is not in range of 0 (excluded) and 1, or n_permutations is less than 1.
+
+        Returns
+        -------
+        None.
+
+        """
+        if isinstance(threshold, bool) or not isinstance(threshold, (int, float)) or not 0 < threshold <= 1:
+            raise ValueError('threshold must be a similarity between 0 (excluded) and 1.')
+        if isinstance(n_permutations, bool) or not isinstance(n_permutations, int) or n_permutations < 1:
+            raise ValueError('n_permutations must be a positive number of hash functions.')
+        self.__threshold = threshold
+        self.__n_permutations = n_permutations
+        self.__random_state = random_state
+        self.__n_bands, self.__band_size = self.__get_bands(threshold, n_permutations)
+        self.__summary = None
+
+    @property
+    def threshold(self):
+        """
+        The method to get the minimum similarity between two near-duplicate documents.
+
+        Returns
+        -------
+        float
+            The threshold.
+
+        """
+        return self.__threshold
+
+    @property
+    def option(self):
+        """
+        The method to get the detection option, to be saved along with an index.
+
+        Returns
+        -------
+        dictionary
+            The threshold and the number of hash functions.
+
+        """
+        return {'threshold': self.__threshold, 'n_permutations': self.__n_permutations}
+
+    @property
+    def summary(self):
+        """
+        The method to get the result of the last detection.
+
+        Returns
+        -------
+        dictionary
+            The number of documents, of groups (each document without near-duplicates being a group) and of collapsed documents.
+            None if no detection was run yet.
+
+        """
+        return self.__summary
+
+    def _detect_terms(self, inverted_index, doc_ids):
+        """
+        The method to group the near-duplicate documents, based on the set of their terms in the inverted index.
+        The sets include the terms pruned from the tf-idf matrix and the terms contained in every document, which have no weights.
+
+        Parameters
+        ----------
+        inverted_index : InvertedIndex
+            The inverted index.
+        doc_ids : list
+            The list of documents' id, in the order of the groups returned (e.g. the rows of the tf-idf matrix).
+
+        Returns
+        -------
+        groups : ndarray
+            The group id of each documents. Groups are numbered from 0, in the order of their first document.
+
+        """
+        # Map the document numbers of the index to the positions of the documents, a document without a position being mapped to -1.
+        positions = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+        doc_rows = np.array([positions.get(doc_id, -1) for doc_id in inverted_index.doc_ids], dtype=np.int64)
+
+        # Build the documents x terms matrix of the postings, whose non-zero columns are the set of terms of each documents.
+        terms = inverted_index.sorted_terms
+        docs, freqs, lengths = inverted_index._join_postings(terms)
+        rows = doc_rows[docs]
+        cols = np.repeat(np.arange(len(terms), dtype=np.int64), lengths)
+        kept = rows >= 0
+        matrix = csr_matrix((np.ones(int(kept.sum()), dtype=np.int8), (rows[kept], cols[kept])), shape=(len(doc_ids), len(terms)))
+        return self._detect(matrix)
+
+    def _detect(self, matrix):
+        """
+        The method to group the near-duplicate rows of a matrix, based on the set of their non-zero columns.
+        A row without any non-zero column has no near-duplicates.
+
+        Parameters
+        ----------
+        matrix : csr_matrix
+            The matrix, written as documents x terms.
+
+        Returns
+        -------
+        groups : ndarray
+            The group id of each rows. Groups are numbered from 0, in the order of their first row.
+
+        """
+        matrix = csr_matrix(matrix)
+        n = matrix.shape[0]
+        rows = np.flatnonzero(np.diff(matrix.indptr) > 0)
+        first, second = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        if len(rows) > 1:
+            candidates = self.__get_candidates(self.__get_signatures(matrix, rows))
+            first, second = self.__check_candidates(matrix, rows[candidates[0]], rows[candidates[1]])
+
+        # Near-duplicate pairs are linked, and each connected set of rows is a group.
+        graph = csr_matrix((np.ones(len(first)), (first, second)), shape=(n, n))
+        n_groups, labels = connected_components(graph, directed=False)
+
+        # Renumber groups in the order of their first row, so the first row of a group is its representative.
+        unique_labels, first_rows, labels = np.unique(labels, return_index=True, return_inverse=True)
+        rank = np.empty(len(unique_labels), dtype=np.int64)
+        rank[np.argsort(first_rows)] = np.arange(len(unique_labels))
+        groups = rank[labels.ravel()]
+        self.__summary = {'documents': n, 'groups': n_groups, 'collapsed': n - n_groups}
+        return groups
+
+    def __get_signatures(self, matrix, rows):
+        """
+        The method to get the MinHash signature of the set of non-zero columns of each rows.
+        Rows are hashed block by block, so the hashes of a block fit in BLOCK_BYTES, and no table of the hashes of every columns is built.
+
+        Parameters
+        ----------
+        matrix : csr_matrix
+            The matrix.
+        rows : ndarray
+            The rows, which all have non-zero columns.
+
+        Returns
+        -------
+        signatures : ndarray
+            The signature of each rows, written as rows x hash functions.
+
+        """
+        random_state = np.random.RandomState(self.__random_state)
+        a = random_state.randint(1, self.PRIME, size=self.__n_permutations).astype(np.int64)[:, np.newaxis]
+        b = random_state.randint(0, self.PRIME, size=self.__n_permutations).astype(np.int64)[:, np.newaxis]
+
+        starts, stops = matrix.indptr[rows], matrix.indptr[rows + 1]
+        block_size = max(1, self.BLOCK_BYTES // (8 * self.__n_permutations))
+        signatures = np.empty((len(rows), self.__n_permutations), dtype=np.int32)
+        i = 0
+        while i < len(rows):
+            # Take the rows whose columns fit in a block, and at least one row, and hash their columns.
+            # A hash is below PRIME, so the minimum of each rows fits in 32 bits.
+            j = max(i + 1, int(np.searchsorted(stops, starts[i] + block_size, side='right')))
+            block = a * matrix.indices[starts[i]:stops[j - 1]].astype(np.int64)
+            block += b
+            block %= self.PRIME
+            signatures[i:j] = np.minimum.reduceat(block, starts[i:j] - starts[i], axis=1).T
+            i = j
+        return signatures
+
+    def __get_candidates(self, signatures):
+        """
+        The method to get the candidate pairs of near-duplicate rows.
+        Signatures are split into bands, and rows with the same values in a band are candidates.
+        Each row is paired with the first row of its bucket, which is enough to link all rows of the bucket.
+
+        Parameters
+        ----------
+        signatures : ndarray
+            The signature of each rows.
+
+        Returns
+        -------
+        tuple
+            The first and the second row (as positions in signatures) of each candidate pairs.
+
+        """
+        first_list, second_list = [], []
+        for band in range(0, self.__n_bands):
+            keys = signatures[:, band * self.__band_size:(band + 1) * self.__band_size]
+            buckets = np.unique(keys, axis=0, return_inverse=True)[1].ravel()
+            order = np.argsort(buckets, kind='stable')
+            sorted_buckets = buckets[order]
+            leaders = order[np.searchsorted(sorted_buckets, sorted_buckets)]
+            paired = leaders != order
+            first_list.append(leaders[paired])
+            second_list.append(order[paired])
+        pairs = np.unique(np.stack([np.concatenate(first_list), np.concatenate(second_list)]), axis=1)
+        return pairs[0], pairs[1]
+
+    def __check_candidates(self, matrix, first, second):
+        """
+        The method to keep the candidate pairs whose exact Jaccard similarity reaches the threshold.
+
+        Parameters
+        ----------
+        matrix : csr_matrix
+            The matrix.
+        first : ndarray
+            The first row of each candidate pairs.
+        second : ndarray
+            The second row of each candidate pairs.
+
+        Returns
+        -------
+        tuple
+            The first and the second row of each near-duplicate pairs.
+
+        """
+        binary = csr_matrix((np.ones(len(matrix.indices)), matrix.indices, matrix.indptr), shape=matrix.shape)
+        sizes = np.diff(binary.indptr)
+        intersections = np.asarray(binary[first].multiply(binary[second]).sum(axis=1)).ravel()
+        similarities = intersections / (sizes[first] + sizes[second] - intersections)
+        kept = similarities >= self.__threshold
+        return first[kept], second[kept]
+
+    @staticmethod
+    def __get_bands(threshold, n_permutations):
+        """
+        The method to split the signatures into bands.
+        Two rows of similarity s are candidates with a probability of 1 - (1 - s ** size) ** bands, which rises around (1 / bands) ** (1 / size).
+        The split whose rise is the closest below the threshold is chosen, so that near-duplicates are rarely missed.
+
+        Parameters
+        ----------
+        threshold : float
+            The threshold.
+        n_permutations : int
+            The number of hash functions.
+
+        Returns
+        -------
+        tuple
+            The number of bands and the number of hash functions in each bands.
+
+        """
+        splits = [(n_permutations // size, size) for size in range(1, n_permutations + 1) if n_permutations % size == 0]
+        below = [split for split in splits if (1 / split[0]) ** (1 / split[1]) <= threshold]
+        return max(below, key=lambda split: (1 / split[0]) ** (1 / split[1])) if below != [] else splits[0]
+
+    @staticmethod
+    def _from_option(option):
+        """
+        The method to build a detector from a saved detection option.
+
+        Parameters
+        ----------
+        option : dictionary
+            The detection option, or None.
+
+        Returns
+        -------
+        DuplicateDetector
+            The detector, or None if there is no detection option.
+
+        """
+        if option is None:
+            return None
+        return DuplicateDetector(option['threshold'], option['n_permutations'])
\ No newline at end of file
@@ -0,0 +1,136 @@
+
+from scipy.sparse import csr_matrix, issparse
+
+import math
+import numpy as np
+
+class MiniBatchKMeans:
+
+    def __init__(self, n_clusters, batch_size=1024, n_iter=None, random_state=0):
+        """
+        The constructor for MiniBatchKMeans class.
+        It is a spherical k-means (on L2-normalized rows, by cosine similarity) trained on random mini-batches (Sculley, 2010).
+
+        Parameters
+        ----------
+        n_clusters : int
+            The maximum number of clusters.
+        batch_size : int, optional
+            The number of rows of each mini-batch. The default is 1024.
+        n_iter : int, optional
+            The number of mini-batches. The default is None (about three passes over the rows).
+        random_state : int, optional
+            The seed of the random generator. The default is 0.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__n_clusters = n_clusters
+        self.__batch_size = batch_size
+        self.__n_iter = n_iter
+        self.__random_state = random_state
+        self.__centroids = None
+
+    @property
+    def centroids(self):
+        """
+        The method to get the centroids of the clusters.
+
+        Returns
+        -------
+        ndarray
+            The normalized centroids, written as clusters x features.
+
+        """
+        return self.__centroids
+
+    def _fit_predict(self, matrix):
+        """
+        The method to partition the rows of a matrix into clusters.
+        Clusters left without any row are removed, so every cluster has at least one row.
+
+        Parameters
+        ----------
+        matrix : csr_matrix or ndarray
+            The matrix, written as documents x features.
+
+        Returns
+        -------
+        labels : ndarray
+            The cluster of each rows, in range of 0 and the number of clusters.
+
+        """
+        random_state = np.random.RandomState(self.__random_state)
+        n = matrix.shape[0]
+        n_clusters = min(self.__n_clusters, n)
+        batch_size = min(self.__batch_size, n)
+        n_iter = self.__n_iter if self.__n_iter is not None else max(20, math.ceil(3 * n / batch_size))
+
+        # Initialize the centroids with randomly chosen rows.
+        centroids = self.__normalize(self.__get_rows(matrix, random_state.choice(n, n_clusters, replace=False)))
+        counts = np.zeros(n_clusters)
+        for i in range(0, n_iter):
+            batch = self.__normalize(self.__get_rows(matrix, random_state.choice(n, batch_size, replace=False)))
+            labels = np.argmax(batch @ centroids.T, axis=1)
+
+            # Move each centroid towards the mean of its rows in the batch.
+            # The learning rate of a centroid decreases with the number of rows it has seen.
+            batch_counts = np.bincount(labels, minlength=n_clusters)
+            membership = csr_matrix((np.ones(batch_size), (labels, np.arange(batch_size))), shape=(n_clusters, batch_size))
+            sums = membership @ batch
+            updated = batch_counts > 0
+            counts[updated] += batch_counts[updated]
+            rate = (batch_counts[updated] / counts[updated])[:, np.newaxis]
+            centroids[updated] = (1 - rate) * centroids[updated] + rate * (sums[updated] / batch_counts[updated][:, np.newaxis])
+            centroids = self.__normalize(centroids)
+
+        # Assign every row to its closest centroid, block by block.
+        labels = np.empty(n, dtype=np.int64)
+        for start in range(0, n, 4096):
+            block = self.__normalize(self.__get_rows(matrix, np.arange(start, min(start + 4096, n))))
+            labels[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+
+        # Remove clusters without any row, and renumber the others.
+        used, labels = np.unique(labels, return_inverse=True)
+        self.__centroids = centroids[used]
+        return labels.ravel()
+
+    def __get_rows(self, matrix, rows):
+        """
+        The method to get some rows of a matrix as a dense array.
+
+        Parameters
+        ----------
+        matrix : csr_matrix or ndarray
+            The matrix.
+        rows : ndarray
+            The row numbers.
+
+        Returns
+        -------
+        ndarray
+            The rows.
+
+        """
+        return matrix[rows].toarray() if issparse(matrix) else np.array(matrix[rows], dtype=np.float64)
+
+    def __normalize(self, array):
+        """
+        The method to L2-normalize each rows of an array. Rows without any weight are kept as they are.
+
+        Parameters
+        ----------
+        array : ndarray
+            The array.
+
+        Returns
+        -------
+        ndarray
+            The normalized array.
+
+        """
+        norms = np.linalg.norm(array, axis=1)
+        norms[norms == 0] = 1
+        return array / norms[:, np.newaxis]
\ No newline at end of file
@@ -0,0 +1,69 @@
+
+from scipy.sparse import random as sparse_random, issparse
+
+import math
+import numpy as np
+
+class RandomProjection:
+
+    def __init__(self, n_components=256, random_state=0):
+        """
+        The constructor for RandomProjection class.
+        The projection is a very sparse random matrix (Li et al., 2006), which approximately preserves distances.
+
+        Parameters
+        ----------
+        n_components : int, optional
+            The number of dimensions after projection. The default is 256.
+        random_state : int, optional
+            The seed of the random generator. The default is 0.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__n_components = n_components
+        self.__random_state = random_state
+
+    @property
+    def n_components(self):
+        """
+        The method to get the number of dimensions after projection.
+
+        Returns
+        -------
+        int
+            The number of dimensions.
+
+        """
+        return self.__n_components
+
+    def _fit_transform(self, matrix):
+        """
+        The method to project a matrix into fewer dimensions.
+        A matrix with no more columns than the number of dimensions is returned as a dense array, without projection.
+
+        Parameters
+        ----------
+        matrix : csr_matrix or ndarray
+            The matrix, written as documents x features.
+
+        Returns
+        -------
+        ndarray
+            The projected matrix, written as documents x dimensions.
+
+        """
+        n_features = matrix.shape[1]
+        if n_features <= self.__n_components:
+            return matrix.toarray() if issparse(matrix) else np.asarray(matrix)
+
+        # Each entry of the projection is +1 or -1 with a probability of 1 / sqrt(features), or else 0.
+        random_state = np.random.RandomState(self.__random_state)
+        density = 1 / math.sqrt(n_features)
+        projection = sparse_random(n_features, self.__n_components, density=density, format='csr', random_state=random_state,
+                                   data_rvs=lambda size: random_state.choice([-1.0, 1.0], size=size))
+        projection = projection * math.sqrt(1 / (density * self.__n_components))
+        projected = matrix @ projection
+        return projected.toarray() if issparse(projected) else np.asarray(projected)
\ No newline at end of file
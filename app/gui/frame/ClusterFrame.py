@@ -1,7 +1,4 @@
 
-from clustering.Clusterer import Clusterer
-from gui.frame.NavigationToolbar import NavigationToolbar
-from gui.window.FigureWindow import FigureWindow
 from gui.window.WarningPopup import WarningPopup
 from gui.ToolTip import ToolTip
 
@@ -9,7 +6,6 @@ import threading
 from datetime import datetime
 import tkinter as tk
 from tkinter import ttk
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 class ClusterFrame:
     
@@ -102,7 +98,7 @@ class ClusterFrame:
         # It is true when it is ready to do clustering.
         if self.__gui.cluster_status is True:
             # Start clustering.
-            clustering_thread = threading.Thread(target=self.__do_clustering, args=(0,True), name='clustering_thread')
+            clustering_thread = threading.Thread(target=self.__do_clustering, name='clustering_thread')
             clustering_thread.start()
             
             # Draw figure on canvas.
@@ -112,17 +108,10 @@ class ClusterFrame:
                                  'There are no documents to be clustered.')
             popup._start()
     
-    def __do_clustering(self, cut_off=0, restart=True):
+    def __do_clustering(self):
         """
         The method to do clustering process.
 
-        Parameters
-        ----------
-        cut_off : float, optional
-            The height of a cut-off point. The default is 0.
-        restart : boolean, optional
-            The status indicating whether clustering process uses different method. The default is True.
-
         Returns
         -------
         None.
@@ -133,12 +122,11 @@ class ClusterFrame:
         
         # Start progress bar, with value equals to 0.
         self.__gui._set_progress_value(0)
-        self.__clusterer = Clusterer(self.__gui.corpus) if restart is True else self.__clusterer
         self.__gui._set_progress_value(5)
         
-        # Start the clustering process.
-        if restart is True:
-            self.__clusterer.cluster(self.__method_list[self.__method_combobox.current()])
+        # Start the clustering process through the pipeline.
+        # The clusterer is kept for the corpus, so its distance matrix and linkage matrices are reused.
+        self.__clusterer = self.__gui.pipeline.cluster(self.__method_list[self.__method_combobox.current()])
         self.__gui._set_progress_value(90)
         
         # Finish the timer.
@@ -151,7 +139,7 @@ class ClusterFrame:
         if self.__drawn_on_figure_window():
             figsize = (20, 10)
             orientation = 'top'
-        self.__figure = self.__clusterer.plot_dendrogram(cut_off, figsize, orientation)
+        self.__figure = self.__clusterer.plot_dendrogram(0, figsize, orientation)
         self.__gui._set_progress_value(100)
         
         # Set progress label text.
@@ -166,6 +154,11 @@ class ClusterFrame:
         None.
 
         """
+        # Load the Tk backend of Matplotlib on first use, if it was not warmed up yet.
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from gui.frame.NavigationToolbar import NavigationToolbar
+        from gui.window.FigureWindow import FigureWindow
+        
         # Reset the canvas if it has been drawn.
         self.__reset_canvas()
         
@@ -180,20 +173,22 @@ class ClusterFrame:
                         cut_off = event.xdata
                     else:
                         cut_off = event.ydata
-                    self.__reset_canvas()
-                    
-                    # Start clustering.
-                    clustering_thread = threading.Thread(target=self.__do_clustering, args=(cut_off,False), name='clustering_thread')
-                    clustering_thread.start()
                     
-                    # Draw figure on canvas.
-                    self.__draw_on_canvas()
+                    # Cut the dendrogram drawn, instead of plotting it again.
+                    start_time = datetime.now()
+                    self.__clusterer.cut_dendrogram(cut_off)
+                    self.__gui._set_progress_label((datetime.now() - start_time).total_seconds())
+                elif event.inaxes is not None and (event.canvas.toolbar is None or not event.canvas.toolbar.mode):
+                    # Expand the collapsed leaf clicked, unless the toolbar is zooming or panning.
+                    self.__clusterer.expand_dendrogram(event.xdata, event.ydata)
             
             # Check whether the figure is drawn on figure window or not.
             if not self.__drawn_on_figure_window():
                 # Draw figure on canvas.
                 self.__figure_canvas = FigureCanvasTkAgg(self.__figure, master=self.__gui.window)
-                self.__figure_canvas.draw()
+                self.__clusterer.connect_dendrogram(self.__figure_canvas)
+                with self.__gui.stage_timer._measure('rendering'):
+                    self.__figure_canvas.draw()
                 self.__figure_canvas.callbacks.connect('button_press_event', _canvas_on_click)
                 
                 # Add canvas toolbar.
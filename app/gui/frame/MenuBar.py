@@ -1,12 +1,13 @@
 
-from retrieval.Document import Document
 from gui.window.AboutWindow import AboutWindow
+from gui.window.TimingWindow import TimingWindow
+from gui.window.PruningWindow import PruningWindow
 from gui.window.WarningPopup import WarningPopup
 
 import os
 import threading
-import pickle
 import webbrowser
+from datetime import datetime
 import tkinter as tk
 from tkinter import filedialog
 
@@ -41,6 +42,8 @@ class MenuBar:
         file_menu.add_separator()
         file_menu.add_command(label='Update index', command=self.__update_index)
         file_menu.add_separator()
+        file_menu.add_command(label='Stage timings', command=self.__show_timings)
+        file_menu.add_separator()
         file_menu.add_command(label='Exit', command=self.__gui.window.destroy)
         
         # Initialize the option menu in menu bar.
@@ -53,8 +56,41 @@ class MenuBar:
         option_menu.add_checkbutton(label='Case folding', onvalue=1, offvalue=0, variable=self.__gui.preprocessor_option[2])
         option_menu.add_checkbutton(label='Normalization', onvalue=1, offvalue=0, variable=self.__gui.preprocessor_option[3])
         option_menu.add_separator()
+        self.__gui.parallel_option.set(True)
+        option_menu.add_checkbutton(label='Parallel indexing', onvalue=1, offvalue=0, variable=self.__gui.parallel_option)
+        self.__gui.precompute_option.set(True)
+        option_menu.add_checkbutton(label='Precompute linkages', onvalue=1, offvalue=0, variable=self.__gui.precompute_option)
+        option_menu.add_command(label='Vocabulary pruning', command=self.__show_pruning)
+        self.__gui.reduction_option.set('none')
+        self.__gui.components_option.set(100)
+        reduction_menu = tk.Menu(option_menu, tearoff=False)
+        option_menu.add_cascade(label='Dimension reduction', menu=reduction_menu)
+        reduction_menu.add_radiobutton(label='None', value='none', variable=self.__gui.reduction_option, command=self.__gui._set_reducer)
+        reduction_menu.add_radiobutton(label='Truncated SVD', value='svd', variable=self.__gui.reduction_option, command=self.__gui._set_reducer)
+        reduction_menu.add_radiobutton(label='Random projection', value='random_projection', variable=self.__gui.reduction_option, command=self.__gui._set_reducer)
+        reduction_menu.add_separator()
+        for components in [50, 100, 200, 500]:
+            reduction_menu.add_radiobutton(label=str(components) + ' dimensions', value=components, variable=self.__gui.components_option, command=self.__gui._set_reducer)
+        self.__gui.deduplication_option.set(0)
+        deduplication_menu = tk.Menu(option_menu, tearoff=False)
+        option_menu.add_cascade(label='Near-duplicates', menu=deduplication_menu)
+        deduplication_menu.add_radiobutton(label='Keep all', value=0, variable=self.__gui.deduplication_option, command=self.__gui._set_detector)
+        for threshold in [0.95, 0.9, 0.8]:
+            deduplication_menu.add_radiobutton(label='Collapse above ' + str(round(threshold * 100)) + '% similarity', value=threshold,
+                                               variable=self.__gui.deduplication_option, command=self.__gui._set_detector)
+        option_menu.add_separator()
         self.__gui.autorenaming_option.set(True)
         option_menu.add_checkbutton(label='Auto-renamed clusters', onvalue=1, offvalue=0, variable=self.__gui.autorenaming_option)
+        option_menu.add_separator()
+        self.__gui.organize_option.set('copy')
+        organize_menu = tk.Menu(option_menu, tearoff=False)
+        option_menu.add_cascade(label='Organize by', menu=organize_menu)
+        organize_menu.add_radiobutton(label='Copying', value='copy', variable=self.__gui.organize_option)
+        organize_menu.add_radiobutton(label='Hard links', value='hardlink', variable=self.__gui.organize_option)
+        organize_menu.add_radiobutton(label='Symbolic links', value='symlink', variable=self.__gui.organize_option)
+        organize_menu.add_radiobutton(label='Moving', value='move', variable=self.__gui.organize_option)
+        self.__gui.dry_run_option.set(False)
+        option_menu.add_checkbutton(label='Organize dry run', onvalue=1, offvalue=0, variable=self.__gui.dry_run_option)
         
         # Initialize the help menu in menu bar.
         help_menu = tk.Menu(menu, tearoff=False)
@@ -76,7 +112,7 @@ class MenuBar:
         
     def __save_index(self):
         """
-        The method to save an inverted index as a pickle file.
+        The method to save an inverted index as an index file, along with the cache of stemmed tokens.
 
         Returns
         -------
@@ -85,27 +121,18 @@ class MenuBar:
         """
         # Check whether an index is built or not.
         if self.__gui.inverted_index is not None:
-            index_path = filedialog.asksaveasfilename(defaultextension='.pickle', filetypes=(('pickle file', '*.pickle'),))
+            index_path = filedialog.asksaveasfilename(defaultextension='.index', filetypes=(('index file', '*.index'),))
             
-            # Store metadata.
-            metadata = {}
-            metadata['folder_path'] = self.__gui.folder_path
-            metadata['corpus'] = self.__gui.corpus
+            # Nothing is saved if the dialog is cancelled.
+            if index_path == '':
+                return
             
-            # Store preprocessor options.
-            preprocessor_option = []
-            preprocessor_option.append(self.__gui.preprocessor_option[0].get())
-            preprocessor_option.append(self.__gui.preprocessor_option[1].get())
-            preprocessor_option.append(self.__gui.preprocessor_option[2].get())
-            preprocessor_option.append(self.__gui.preprocessor_option[3].get())
-            metadata['preprocessor_option'] = preprocessor_option
-            
-            # Store index and metadata.
-            data = {}
-            data['index'] = self.__gui.inverted_index
-            data['metadata'] = metadata
-            with open(index_path, 'wb') as handle:
-                pickle.dump(data, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            # Store index, metadata, tf-idf matrix, pruning option, reduction option and deduplication option, and the cache of stemmed tokens next to the index.
+            try:
+                self.__gui.pipeline.save(index_path)
+            except EnvironmentError as error:
+                popup = WarningPopup(self.__gui, 'Saving an index', str(error))
+                popup._start()
         else:
             popup = WarningPopup(self.__gui, 'Saving an index',
                                  'There is no index to be saved!')
@@ -113,42 +140,30 @@ class MenuBar:
             
     def __load_index(self):
         """
-        The method to load a saved inverted index.
+        The method to load a saved inverted index, along with its options and the cache of stemmed tokens saved next to it.
+        Index files saved as pickle files by older versions can be loaded as well.
 
         Returns
         -------
         None.
 
         """
-        index_path = filedialog.askopenfilename(filetypes=(('pickle file', '*.pickle'),))
+        index_path = filedialog.askopenfilename(filetypes=(('index file', '*.index'), ('pickle file', '*.pickle')))
         try:
-            with open(index_path, 'rb') as handle:
-                data = pickle.load(handle)
-
-                # Check whether the file loaded is the correct index file.
-                if isinstance(data, dict) and 'index' in data and 'metadata' in data and 'folder_path' in data['metadata'] and 'corpus' in data['metadata'] and 'preprocessor_option' in data['metadata']:
-                    # Load the inverted index.
-                    self.__gui.inverted_index = data['index']
-                    
-                    # Load the metadata.
-                    metadata = data['metadata']
-                    self.__gui.folder_path = metadata['folder_path']
-                    self.__gui.corpus = metadata['corpus']
-                    self.__gui.preprocessor_option = metadata['preprocessor_option']
-                    
-                    # Set the cluster status to True, indicating clustering process is ready to do.
-                    self.__gui.cluster_status = True
-                    popup = WarningPopup(self.__gui, 'Loading an index',
-                                     'An index is successfully loaded!')
-                    popup._start()
-                else:
-                    popup = WarningPopup(self.__gui, 'Loading an index',
-                                     'File loaded does not match!')
-                    popup._start()
+            # The tf-idf matrix is rebuilt from the inverted index if it was not saved.
+            self.__gui.pipeline.load(index_path)
+            message = 'An index is successfully loaded!'
+        except ValueError as error:
+            # The file is not an index file, or no term is left after pruning.
+            message = str(error)
         except EnvironmentError:
-            popup = WarningPopup(self.__gui, 'Loading an index',
-                                 'There is no index to be loaded!')
-            popup._start()
+            message = 'There is no index to be loaded!'
+        
+        # Show the folder path and the options loaded, and set the cluster status.
+        if self.__gui.inverted_index is not None:
+            self.__gui._refresh()
+        popup = WarningPopup(self.__gui, 'Loading an index', message)
+        popup._start()
     
     def __update_index(self):
         """
@@ -161,37 +176,11 @@ class MenuBar:
         """
         # Check whether an index is built or not.
         if self.__gui.inverted_index is not None:
-            folder_path = self.__gui.folder_path
-            try:
-                # Retrieve all .txt files in folder.
-                curr_doc_titles = []
-                for root, directories, files in os.walk(folder_path):
-                    for file in files:
-                        if '.txt' in file:
-                            curr_doc_titles.append(file.replace('.txt', ''))
-                
-                # Compare between current document list and saved document list.
-                difference = list(set(curr_doc_titles) - set([doc.title for doc in self.__gui.corpus]))
-                
-                # Check if there is a difference between two document lists.
-                if len(difference) == 0:
-                    popup = WarningPopup(self.__gui, 'Updating an index',
-                                         'The index is currently up to date!')
-                    popup._start()
-                else:
-                    extended_corpus = []
-                    for i in range(len(self.__gui.corpus), len(self.__gui.corpus) + len(difference)):
-                        doc_id = 'doc_' + str(i)
-                        doc_title = difference[i - len(self.__gui.corpus)]
-                        doc_content = open(folder_path + '\\' + difference[i - len(self.__gui.corpus)] + '.txt', 'r', encoding='utf-8').read().replace('\n', '')
-                        doc_i = Document(doc_id, doc_title, doc_content)
-                        extended_corpus.append(doc_i)
-                    
-                    # Update the corpus and inverted index.
-                    self.__gui.corpus = self.__gui.corpus + extended_corpus
-                    updating_thread = threading.Thread(target=self.__gui._update_inverted_index, args=(extended_corpus,), name='updating_thread')
-                    updating_thread.start()
-            except EnvironmentError:
+            if os.path.isdir(self.__gui.folder_path):
+                # Compare and update the documents off the gui thread, so the window does not freeze while files are checked.
+                updating_thread = threading.Thread(target=self.__update_corpus, name='updating_thread')
+                updating_thread.start()
+            else:
                 popup = WarningPopup(self.__gui, 'Updating an index',
                                      'The file path of the saved index does not exist!')
                 popup._start()
@@ -200,6 +189,68 @@ class MenuBar:
                                  'There is no index to be updated!')
             popup._start()
     
+    def __update_corpus(self):
+        """
+        The method to compare the documents in the folder with the indexed corpus, and update the inverted index and the tf-idf matrix through the pipeline.
+
+        Returns
+        -------
+        None.
+
+        """
+        def _show_popup(message):
+            # The popup is shown by the gui thread.
+            self.__gui.window.after(0, lambda: WarningPopup(self.__gui, 'Updating an index', message)._start())
+        
+        # Start the timer.
+        start_time = datetime.now()
+        self.__gui._set_progress_value(0)
+        
+        # Compare all .txt files in folder with the saved document list and its manifest, reporting the progress of each checked files from 0 to 5.
+        # Postings of deleted and modified documents are retracted, and the added and modified documents are indexed, reporting their progress from 5 to 95.
+        try:
+            added, modified, deleted = self.__gui._update_index(lambda indexed, corpus_size: self.__gui._set_progress_value(5 + 90 * indexed / corpus_size),
+                                                                lambda checked, total: self.__gui._set_progress_value(5 * checked / total))
+        except ValueError as error:
+            # No term is left after pruning.
+            _show_popup(str(error))
+        else:
+            if len(added) == 0 and len(modified) == 0 and len(deleted) == 0:
+                _show_popup('The index is currently up to date!')
+            else:
+                _show_popup('The index is updated: ' + str(len(added)) + ' added, ' + str(len(modified)) + ' modified and ' + str(len(deleted)) + ' deleted documents.')
+        
+        # Set the cluster status, indicating whether it is ready for clustering.
+        self.__gui._refresh()
+        self.__gui._set_progress_value(100)
+        
+        # Set progress label text.
+        self.__gui._set_progress_label((datetime.now() - start_time).total_seconds())
+    
+    def __show_timings(self):
+        """
+        The method to show the time spent in each stages of indexing and clustering.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__timing_window = TimingWindow(self.__gui)
+        self.__timing_window._start()
+    
+    def __show_pruning(self):
+        """
+        The method to show the pruning option of the vocabulary, and the effect of the last pruning.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__pruning_window = PruningWindow(self.__gui)
+        self.__pruning_window._start()
+    
     def __documentation(self):
         """
         The method to show documentation on GitHub.
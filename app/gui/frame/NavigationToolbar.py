@@ -2,8 +2,6 @@
 from gui.window.WarningPopup import WarningPopup
 from gui.ToolTip import ToolTip
 
-import os
-import shutil
 import tkinter as tk
 from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
 
@@ -69,36 +67,36 @@ class NavigationToolbar(NavigationToolbar2Tk):
     def __organize_documents(self):
         """
         The method to organize documents into folders based on documents' clusters.
-        Currently this feature is only compatible with Windows file system.
+        Documents are copied, linked or moved based on the organize option, and a summary is shown once they are organized.
 
         Returns
         -------
         None.
 
         """
-        # Get cluster list.
-        cluster_list = self.__clusterer.extract_clusters(sorted(list(self.__gui.inverted_index.keys()), key=str.lower), self.__gui.autorenaming_option.get())
-        
-        # Create a new folder organized.
-        folder = 'organized'
-        organized_folder = os.path.join(self.__gui.folder_path, folder)
-        if not os.path.exists(organized_folder):
-            os.mkdir(organized_folder)
-            
-            # For each label, put all documents together in the same folder.
-            for cluster, doc in cluster_list.items():
-                # Create a new folder for current cluster.
-                ci_folder = os.path.join(organized_folder, cluster)
-                os.mkdir(ci_folder)
-                for item in doc:
-                    # Copy and move the document into the cluster folder.
-                    source = os.path.join(self.__gui.folder_path, item + '.txt')
-                    shutil.copyfile(source, ci_folder + '/' + item + '.txt')
-        else:
+        # Create a new organized folder through the pipeline, with a folder for each clusters.
+        dry_run = self.__gui.dry_run_option.get()
+        try:
+            organizer = self.__gui.pipeline.organize(self.__gui.autorenaming_option.get(), self.__gui.organize_option.get(), dry_run,
+                                                     lambda organized, total: self.__gui._set_progress_value(100 * organized / total))
+        except FileExistsError:
             # If the organized folder exists, a warning popup will show up.
             popup = WarningPopup(self.__gui, 'Organizing files',
                                   'Folder exists.')
             popup._start()
+            return
+        except (ValueError, OSError) as error:
+            # The documents are not clustered again since another option was set, or a document cannot be put into its cluster folder.
+            popup = WarningPopup(self.__gui, 'Organizing files', str(error))
+            popup._start()
+            return
+        
+        # Show the summary of organizing through a popup window.
+        summary = organizer.summary
+        popup = WarningPopup(self.__gui, 'Organizing files',
+                             ('Would organize ' if dry_run else 'Organized ') + str(summary['files']) + ' documents (' + str(summary['bytes']) + ' bytes, '
+                             + str(summary['bytes_copied']) + ' bytes copied) into ' + str(summary['folders']) + ' folders, in ' + str(summary['seconds']) + ' seconds.')
+        popup._start()
     
     def __evaluate_result(self):
         """
@@ -1,10 +1,7 @@
 
-from retrieval.Document import Document
-from retrieval.Indexer import Indexer
 from gui.window.WarningPopup import WarningPopup
 from gui.ToolTip import ToolTip
 
-import os
 import threading
 from datetime import datetime
 import tkinter as tk
@@ -84,106 +81,44 @@ class SearchFrame:
 
         """
         folder_path = filedialog.askdirectory()
-        
-        # Retrieve all .txt files in folder.
-        doc_titles = []
-        for root, directories, files in os.walk(folder_path):
-            for file in files:
-                if '.txt' in file:
-                    doc_titles.append(os.path.join(root, file))
-        
-        # Check whether the number of document files in folder is more than one.
-        # If there is just one file, the indexing process will not be done.
-        if len(doc_titles) > 1:
-            # Set the folder path.
-            self.__gui.folder_path = folder_path
-            corpus = []
-            
-            # Currently it is only compatible with Windows file system.
-            escaped_folder_path = str(folder_path) + '\\'
-            
-            # Retrieve information of each documents.
-            for i in range(0, len(doc_titles)):
-                doc_id = 'doc_' + str(i)
-                doc_title = os.path.splitext(doc_titles[i])[0].replace(escaped_folder_path, '')
-                doc_content = open(doc_titles[i], 'r', encoding='utf-8').read().replace('\n', '')
-                doc_i = Document(doc_id, doc_title, doc_content)
-                corpus.append(doc_i)
-            self.__gui.corpus = corpus
-            
-            # Build the inverted index.
-            indexing_thread = threading.Thread(target=self.__build_inverted_index, name='indexing_thread')
+        if folder_path:
+            # List and index the documents off the gui thread, so the window does not freeze while files are checked.
+            indexing_thread = threading.Thread(target=self.__read_folder, args=(folder_path,), name='indexing_thread')
             indexing_thread.start()
-        else:
-            popup = WarningPopup(self.__gui, 'Indexing process',
-                                 'There must be at least two documents to be indexed and clustered.')
-            popup._start()
     
-    def _update_inverted_index(self, inverted_index, extended_corpus):
+    def __read_folder(self, folder_path):
         """
-        The method to update the inverted index.
+        The method to list the documents in a folder, and build their inverted index and tf-idf matrix through the pipeline.
 
         Parameters
         ----------
-        extended_corpus : list
-            The list of newly added documents.
+        folder_path : string
+            The folder path.
 
         Returns
         -------
         None.
 
-        """
-        self.__build_inverted_index(inverted_index, extended_corpus)
-    
-    def __build_inverted_index(self, inverted_index=None, extended_corpus=None):
-        """
-        The method to build an inverted index.
-        
-        Parameters
-        ----------
-        inverted_index : dictionary, optional
-            The current inverted index (for updating). The default is None.
-        extended_corpus : list, optional
-            The list of new documents (for updating). The default is None.
-
-        Returns
-        -------
-        dictionary
-            The inverted index.
-
         """
         # Start the timer.
         start_time = datetime.now()
-        
-        # Start progress bar, with value equals to 0.
         self.__gui._set_progress_value(0)
         
-        stopwords_removal_option = self.__gui.preprocessor_option[0].get()
-        stemming_option = self.__gui.preprocessor_option[1].get()
-        case_folding_option = self.__gui.preprocessor_option[2].get()
-        normalization_option = self.__gui.preprocessor_option[3].get()
-        self.__gui._set_progress_value(5)
-        
-        indexer = Indexer(inverted_index)
-        for doc in (self.__gui.corpus if extended_corpus is None else extended_corpus):
-            indexer.index(doc, stopwords_removal_option, stemming_option, case_folding_option, normalization_option)
-        inverted_index = indexer.inverted_index
-        self.__gui.inverted_index = inverted_index
-        
-        # Set progress bar value to 50.
-        self.__gui._set_progress_value(50)
-        
-        # Set progress value for each documents for vectorizing process.
-        index = sorted(list(inverted_index.keys()), key=str.lower)
-        for doc in self.__gui.corpus:
-            corpus_size = len(self.__gui.corpus)
-            doc.build_vector(inverted_index, index, corpus_size)
-        
-        # Set progress bar value to 95.
-        self.__gui._set_progress_value(95)
+        # Index all documents, reporting the progress of each listed files from 0 to 5 and each indexed documents from 5 to 95.
+        # The content of each documents is read lazily while indexing.
+        try:
+            self.__gui._index_folder(folder_path, lambda indexed, corpus_size: self.__gui._set_progress_value(5 + 90 * indexed / corpus_size),
+                                     lambda listed, total: self.__gui._set_progress_value(5 * listed / total))
+        except ValueError as error:
+            # There are less than two documents, or no term is left after pruning. The popup is shown by the gui thread.
+            message = str(error)
+            self.__gui.window.after(0, lambda: WarningPopup(self.__gui, 'Indexing process', message)._start())
+            if self.__gui.inverted_index is None:
+                self.__gui._set_progress_value(0)
+                return
         
-        # Set the status to true, indicating that it is ready for clustering, and set progress bar value to 100, indicating the process has finished.
-        self.__gui.cluster_status = True
+        # Show the folder path, and set the cluster status, indicating whether it is ready for clustering.
+        self.__gui._refresh()
         self.__gui._set_progress_value(100)
         
         # Set progress label text.
@@ -3,11 +3,21 @@ from gui.frame.MenuBar import MenuBar
 from gui.frame.SearchFrame import SearchFrame
 from gui.frame.ClusterFrame import ClusterFrame
 from gui.frame.ProgressFrame import ProgressFrame
+from retrieval.StemCache import StemCache
+from retrieval.CorpusStore import CorpusStore
+from pipeline.StageTimer import StageTimer
 
+import threading
+import importlib
 import tkinter as tk
 
 class gui:
     
+    # Modules which take long to import (NumPy, SciPy, Matplotlib and NLTK) are loaded on first use, so the window is shown first.
+    # They are then warmed up in the background, WARM_UP_DELAY milliseconds after the window is shown.
+    WARM_UP_LIST = ['pipeline.Pipeline', 'retrieval.IndexFile', 'matplotlib.backends.backend_tkagg', 'gui.window.FigureWindow']
+    WARM_UP_DELAY = 100
+    
     def __init__(self):
         """
         The constructor for gui class.
@@ -21,9 +31,11 @@ class gui:
         self.__cluster_status = False
         self.__canvas_status = False
         self.__cut_status = False
-        self.__folder_path = ''
-        self.__corpus = []
-        self.__inverted_index = None
+        self.__pipeline = None
+        self.__stem_cache = StemCache()
+        self.__stage_timer = StageTimer()
+        self.__pruner = None
+        self.__method_list = ['single', 'complete', 'average']
         
         # Initialize the application's gui.
         self.__window = tk.Tk()
@@ -39,11 +51,18 @@ class gui:
                                     tk.BooleanVar(),
                                     tk.BooleanVar()]
         self.__autorenaming_option = tk.BooleanVar()
+        self.__parallel_option = tk.BooleanVar()
+        self.__precompute_option = tk.BooleanVar()
+        self.__organize_option = tk.StringVar()
+        self.__dry_run_option = tk.BooleanVar()
+        self.__reduction_option = tk.StringVar()
+        self.__components_option = tk.IntVar()
+        self.__deduplication_option = tk.DoubleVar()
         
         # Initialize the menu bar and frames.
         self.__menu_bar = MenuBar(self)
         self.__search_frame = SearchFrame(self)
-        self.__cluster_frame = ClusterFrame(self, ['single', 'complete', 'average'])
+        self.__cluster_frame = ClusterFrame(self, self.__method_list)
         self.__progress_frame = ProgressFrame(self)
     
     @property
@@ -152,6 +171,24 @@ class gui:
         """
         self.__cut_status = cut_status
     
+    @property
+    def pipeline(self):
+        """
+        The method to get the pipeline, which indexes, updates, loads, saves, prunes, clusters and organizes the documents.
+        It is created on first use with the current options, so the modules it needs are not loaded before the window is shown.
+
+        Returns
+        -------
+        Pipeline
+            The pipeline.
+
+        """
+        if self.__pipeline is None:
+            from pipeline.Pipeline import Pipeline
+            self.__pipeline = Pipeline([option.get() for option in self.__preprocessor_option], self.__parallel_option.get(), self.__stem_cache, self.__stage_timer,
+                                       self.__pruner, self.reducer, self.detector)
+        return self.__pipeline
+    
     @property
     def folder_path(self):
         """
@@ -163,86 +200,172 @@ class gui:
             The folder path.
 
         """
-        return self.__folder_path
+        return self.__pipeline.folder_path if self.__pipeline is not None else ''
     
-    @folder_path.setter
-    def folder_path(self, folder_path):
+    @property
+    def corpus(self):
         """
-        The method to set the folder path of corpus.
-        This automatically set the folder entry to current folder path.
+        The method to get corpus.
 
-        Parameters
-        ----------
-        folder_path : string
-            The folder path.
+        Returns
+        -------
+        CorpusStore
+            The store of documents.
+
+        """
+        return self.__pipeline.corpus if self.__pipeline is not None else CorpusStore()
+    
+    @property
+    def inverted_index(self):
+        """
+        The method to get the inverted index.
 
         Returns
         -------
-        None.
+        InvertedIndex
+            The inverted index, or None if no index is built or loaded.
 
         """
-        self.__search_frame._set_folder_entry(folder_path)
-        self.__folder_path = folder_path
+        return self.__pipeline.inverted_index if self.__pipeline is not None else None
     
     @property
-    def corpus(self):
+    def tfidf_matrix(self):
         """
-        The method to get corpus.
+        The method to get the tf-idf matrix.
 
         Returns
         -------
-        list
-            The list of documents.
+        TfidfMatrix
+            The tf-idf matrix of the corpus, or None if no index is built or loaded.
+
+        """
+        return self.__pipeline.tfidf_matrix if self.__pipeline is not None else None
+    
+    @property
+    def clusterer(self):
+        """
+        The method to get the clusterer of the corpus.
+        There is one clusterer for each corpus, which keeps its distance matrix and linkage matrices.
+
+        Returns
+        -------
+        Clusterer
+            The clusterer, or None if there is no tf-idf matrix.
 
         """
-        return self.__corpus
+        return self.__pipeline.clusterer if self.__pipeline is not None else None
     
-    @corpus.setter
-    def corpus(self, corpus):
+    @property
+    def reducer(self):
+        """
+        The method to get the reducer of the tf-idf rows, built from the reduction option and the components option.
+
+        Returns
+        -------
+        DimensionReducer
+            The reducer, or None if distances are calculated over all terms.
+
         """
-        The method to set corpus.
+        if self.__reduction_option.get() == 'none':
+            return None
+        from clustering.DimensionReducer import DimensionReducer
+        return DimensionReducer(self.__reduction_option.get(), self.__components_option.get())
+    
+    @reducer.setter
+    def reducer(self, reducer):
+        """
+        The method to set the reduction option and the components option from a reducer.
 
         Parameters
         ----------
-        corpus : list
-            The list of documents.
+        reducer : DimensionReducer
+            The reducer, or None if distances are calculated over all terms.
 
         Returns
         -------
         None.
 
         """
-        self.__corpus = corpus
+        if reducer is None:
+            self.__reduction_option.set('none')
+        else:
+            self.__reduction_option.set(reducer.method)
+            self.__components_option.set(reducer.n_components)
     
     @property
-    def inverted_index(self):
+    def detector(self):
         """
-        The method to get the inverted index.
+        The method to get the detector of near-duplicate documents, built from the deduplication option.
 
         Returns
         -------
-        dictionary
-            The inverted index.
+        DuplicateDetector
+            The detector, or None if near-duplicates are not collapsed.
 
         """
-        return self.__inverted_index
+        if self.__deduplication_option.get() == 0:
+            return None
+        from clustering.DuplicateDetector import DuplicateDetector
+        return DuplicateDetector(self.__deduplication_option.get())
     
-    @inverted_index.setter
-    def inverted_index(self, inverted_index):
+    @detector.setter
+    def detector(self, detector):
         """
-        The method to set the inverted index.
+        The method to set the deduplication option from a detector.
 
         Parameters
         ----------
-        inverted_index : dictionary
-            The inverted index.
+        detector : DuplicateDetector
+            The detector, or None if near-duplicates are not collapsed.
 
         Returns
         -------
         None.
 
         """
-        self.__inverted_index = inverted_index
+        self.__deduplication_option.set(detector.threshold if detector is not None else 0)
+    
+    @property
+    def stem_cache(self):
+        """
+        The method to get the cache of stemmed tokens.
+        The cache is kept when the application is restarted, so a re-index starts warm.
+
+        Returns
+        -------
+        StemCache
+            The cache of stemmed tokens.
+
+        """
+        return self.__pipeline.stem_cache if self.__pipeline is not None else self.__stem_cache
+    
+    @property
+    def stage_timer(self):
+        """
+        The method to get the timer measuring the time spent in each stages.
+        It is reset when documents are indexed, updated or loaded.
+
+        Returns
+        -------
+        StageTimer
+            The timer.
+
+        """
+        return self.__stage_timer
+    
+    @property
+    def pruner(self):
+        """
+        The method to get the pruner of the vocabulary.
+        It is kept when the application is restarted, as the other options are.
+
+        Returns
+        -------
+        VocabularyPruner
+            The pruner, or None if all terms are kept.
+
+        """
+        return self.__pipeline.pruner if self.__pipeline is not None else self.__pruner
     
     @property
     def preprocessor_option(self):
@@ -288,18 +411,140 @@ class gui:
 
         """
         return self.__autorenaming_option
+    
+    @property
+    def parallel_option(self):
+        """
+        The method to get the parallel indexing option.
+
+        Returns
+        -------
+        BooleanVar
+            The parallel indexing option.
+
+        """
+        return self.__parallel_option
+    
+    @property
+    def precompute_option(self):
+        """
+        The method to get the precompute option.
+        If it is true, linkage matrices of all methods are computed in the background once indexing finishes.
+
+        Returns
+        -------
+        BooleanVar
+            The precompute option.
+
+        """
+        return self.__precompute_option
+    
+    @property
+    def organize_option(self):
+        """
+        The method to get the organize option.
+        It is the way documents are put into the folder of their cluster: copy, hardlink, symlink or move.
+
+        Returns
+        -------
+        StringVar
+            The organize option.
+
+        """
+        return self.__organize_option
+    
+    @property
+    def dry_run_option(self):
+        """
+        The method to get the dry run option.
+        If it is true, organizing documents only shows what would be done, without writing anything.
+
+        Returns
+        -------
+        BooleanVar
+            The dry run option.
+
+        """
+        return self.__dry_run_option
+    
+    @property
+    def reduction_option(self):
+        """
+        The method to get the reduction option.
+        It is the way the tf-idf rows are reduced before distances are calculated: none, svd or random_projection.
+
+        Returns
+        -------
+        StringVar
+            The reduction option.
+
+        """
+        return self.__reduction_option
+    
+    @property
+    def components_option(self):
+        """
+        The method to get the components option.
+        It is the number of dimensions the tf-idf rows are reduced to.
+
+        Returns
+        -------
+        IntVar
+            The components option.
+
+        """
+        return self.__components_option
+    
+    @property
+    def deduplication_option(self):
+        """
+        The method to get the deduplication option.
+        It is the minimum similarity of near-duplicate documents, which are clustered as one document, or 0 if they are not collapsed.
+
+        Returns
+        -------
+        DoubleVar
+            The deduplication option.
+
+        """
+        return self.__deduplication_option
         
     def start(self):
         """
         The method to start application's gui.
+        Modules loaded on first use are warmed up by a background thread once the window is shown.
 
         Returns
         -------
         None.
 
         """
+        warming_thread = threading.Thread(target=self._warm_up, name='warming_thread', daemon=True)
+        self.__window.after(self.WARM_UP_DELAY, warming_thread.start)
         self.__window.mainloop()
     
+    @staticmethod
+    def _warm_up():
+        """
+        The method to import the modules loaded on first use, and load the NLTK data used by the preprocessor.
+        If the user needs a module before it is warmed up, the gui thread waits for it to be imported.
+
+        Returns
+        -------
+        None.
+
+        """
+        for module in gui.WARM_UP_LIST:
+            importlib.import_module(module)
+        
+        # Load the stop list and the tokenizer models, which NLTK loads on first use as well.
+        # Missing NLTK data is only reported when documents are indexed.
+        from retrieval.PreprocessingPipeline import PreprocessingPipeline
+        try:
+            PreprocessingPipeline(stemming_option=False)._process('Warm up.')
+        except LookupError:
+            pass
+    
     def _restart(self):
         """
         The method to restore application's conditions to original.
@@ -314,60 +559,149 @@ class gui:
         self.__cluster_frame._restart()
         self.__progress_frame._restart()
         
-        # Reinitialize all variables.
+        # Reinitialize all variables, keeping the cache of stemmed tokens and the pruner for the next pipeline.
         self.__cluster_status = False
         self.__canvas_status = False
-        self.__folder_path = ''
-        self.__corpus = []
-        self.__inverted_index = None
+        self.__stem_cache = self.stem_cache
+        self.__pruner = self.pruner
+        self.__pipeline = None
+        self.__stage_timer._reset()
         
         # Set progress bar value to 0.
         self._set_progress_value(0)
     
-    def _set_progress_value(self, value):
+    def _index_folder(self, folder_path, progress_callback=None, listing_callback=None):
         """
-        The method to set the progress bar value.
+        The method to index all documents in a folder through the pipeline, with the current preprocessor and parallel indexing options.
 
         Parameters
         ----------
-        value : int
-            The progress bar value.
+        folder_path : string
+            The folder path containing the documents.
+        progress_callback : function, optional
+            The function called with the number of indexed documents and the number of all documents. The default is None.
+        listing_callback : function, optional
+            The function called with the number of listed files and the number of all files. The default is None.
+
+        Raises
+        ------
+        ValueError
+            If there are less than two documents in the folder, or no term is left after pruning the vocabulary.
 
         Returns
         -------
         None.
 
         """
-        self.__progress_frame._update_progress_bar(value)
+        self.pipeline.preprocessor_option = [option.get() for option in self.__preprocessor_option]
+        self.pipeline.parallel_option = self.__parallel_option.get()
+        self.pipeline.index(folder_path, progress_callback, listing_callback)
     
-    def _set_progress_label(self, second):
+    def _update_index(self, progress_callback=None, listing_callback=None):
         """
-        The method to set the progress label text.
+        The method to update the index through the pipeline, with the current preprocessor and parallel indexing options.
 
         Parameters
         ----------
-        second : float
-            The time shown on progress label.
+        progress_callback : function, optional
+            The function called with the number of indexed documents and the number of documents to index. The default is None.
+        listing_callback : function, optional
+            The function called with the number of checked files and the number of all files. The default is None.
+
+        Raises
+        ------
+        ValueError
+            If there is no index to be updated, or no term is left after pruning the vocabulary.
+
+        Returns
+        -------
+        added : list
+            The list of new documents.
+        modified : list
+            The list of modified documents.
+        deleted : list
+            The list of deleted documents.
+
+        """
+        self.pipeline.preprocessor_option = [option.get() for option in self.__preprocessor_option]
+        self.pipeline.parallel_option = self.__parallel_option.get()
+        return self.pipeline.update(progress_callback, listing_callback)
+    
+    def _set_reducer(self):
+        """
+        The method to set the reducer built from the reduction option and the components option, so the next clustering builds its distance matrix again.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.__pipeline is not None:
+            self.__pipeline.reduce(self.reducer)
+            self._refresh()
+    
+    def _set_detector(self):
+        """
+        The method to set the detector built from the deduplication option, so the next clustering builds its distance matrix again.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.__pipeline is not None:
+            self.__pipeline.deduplicate(self.detector)
+            self._refresh()
+    
+    def _refresh(self):
+        """
+        The method to show the folder path and the options of the pipeline, and set the cluster status, once its documents are indexed, updated, loaded or pruned.
+        If the precompute option is on, linkage matrices of all methods are computed in the background.
+
+        Returns
+        -------
+        None.
+
+        """
+        pipeline = self.pipeline
+        self.__search_frame._set_folder_entry(pipeline.folder_path)
+        self.preprocessor_option = pipeline.preprocessor_option
+        self.reducer = pipeline.reducer
+        self.detector = pipeline.detector
+        
+        # There is no tf-idf matrix if no term is left after pruning, until the pruning option is changed.
+        self.__cluster_status = pipeline.clusterer is not None
+        if pipeline.clusterer is not None and self.__precompute_option.get() is True:
+            pipeline.clusterer.precompute(self.__method_list)
+    
+    def _set_progress_value(self, value):
+        """
+        The method to set the progress bar value.
+
+        Parameters
+        ----------
+        value : int
+            The progress bar value.
 
         Returns
         -------
         None.
 
         """
-        self.__progress_frame._update_progress_label(second)
+        self.__progress_frame._update_progress_bar(value)
     
-    def _update_inverted_index(self, extended_corpus):
+    def _set_progress_label(self, second):
         """
-        The method to update the inverted index.
+        The method to set the progress label text.
 
         Parameters
         ----------
-        extended_corpus : list
-            The new added documents list.
+        second : float
+            The time shown on progress label.
 
         Returns
         -------
         None.
 
         """
-        self.__search_frame._update_inverted_index(self.__inverted_index, extended_corpus)
\ No newline at end of file
+        self.__progress_frame._update_progress_label(second)
\ No newline at end of file
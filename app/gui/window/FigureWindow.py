@@ -35,7 +35,9 @@ class FigureWindow:
         
         # Draw figure on canvas.
         self.__figure_canvas = FigureCanvasTkAgg(figure, master=self.__window)
-        self.__figure_canvas.draw()
+        clusterer.connect_dendrogram(self.__figure_canvas)
+        with self.__gui.stage_timer._measure('rendering'):
+            self.__figure_canvas.draw()
         self.__figure_canvas.callbacks.connect('button_press_event', canvas_on_click)
         
         # Add canvas toolbar.
@@ -0,0 +1,132 @@
+from retrieval.VocabularyPruner import VocabularyPruner
+from gui.window.WarningPopup import WarningPopup
+
+import threading
+import tkinter as tk
+
+class PruningWindow:
+
+    def __init__(self, gui):
+        """
+        The constructor for PruningWindow class.
+        The window sets the pruning option of the vocabulary, and shows the effect of the last pruning on the tf-idf matrix.
+
+        Parameters
+        ----------
+        gui : gui
+            The main gui.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__gui = gui
+
+        # Initialize the pruning window.
+        self.__window = tk.Toplevel(master=self.__gui.window)
+        self.__window.title('Vocabulary pruning')
+        self.__window.geometry('460x210')
+        self.__window.resizable(width=False, height=False)
+
+        # Initialize the entries of the pruning option, filled with the current option.
+        option = self.__gui.pruner.option if self.__gui.pruner is not None else VocabularyPruner().option
+        self.__entries = {}
+        for row, (name, text) in enumerate([('min_df', 'Minimum document frequency'), ('max_df', 'Maximum document frequency'), ('max_features', 'Maximum number of terms')]):
+            tk.Label(master=self.__window, text=text).grid(row=row, column=0, sticky='w', padx=5, pady=2)
+            entry = tk.Entry(master=self.__window, width=12)
+            entry.insert(0, str(option[name]) if option[name] is not None else '')
+            entry.grid(row=row, column=1, sticky='w', padx=5, pady=2)
+            self.__entries[name] = entry
+
+        # Initialize the note label, the summary label and the apply button in the window.
+        self.__note_label = tk.Label(master=self.__window, text='A frequency is a number of documents, or a proportion of the corpus (e.g. 0.5).')
+        self.__note_label.configure(fg='#808080')
+        self.__note_label.grid(row=3, column=0, columnspan=2, sticky='w', padx=5, pady=2)
+        self.__summary_label = tk.Label(master=self.__window, justify='left')
+        self.__summary_label.grid(row=4, column=0, columnspan=2, sticky='w', padx=5, pady=2)
+        self.__apply_button = tk.Button(master=self.__window, text='Apply', command=self.__apply)
+        self.__apply_button.grid(row=5, column=1, sticky='e', padx=5, pady=2)
+        self.__refresh()
+
+    def _start(self):
+        """
+        The method to start the pruning window.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__window.mainloop()
+
+    def __apply(self):
+        """
+        The method to set the pruning option.
+        If documents are indexed, the tf-idf matrix is built again with the new option by the pipeline, off the gui thread.
+
+        Returns
+        -------
+        None.
+
+        """
+        try:
+            min_df = VocabularyPruner._parse_frequency(self.__entries['min_df'].get() or '1')
+            max_df = VocabularyPruner._parse_frequency(self.__entries['max_df'].get() or '1.0')
+            max_features = int(self.__entries['max_features'].get()) if self.__entries['max_features'].get() != '' else None
+            pruner = VocabularyPruner(min_df, max_df, max_features)
+        except ValueError as error:
+            popup = WarningPopup(self.__gui, 'Pruning the vocabulary', str(error))
+            popup._start()
+            return
+
+        pruning_thread = threading.Thread(target=self.__prune, args=(pruner,), name='pruning_thread')
+        pruning_thread.start()
+
+    def __prune(self, pruner):
+        """
+        The method to set the pruner, building the tf-idf matrix again with the terms it selects if documents are indexed.
+        If no term is left after pruning, the previous pruner and tf-idf matrix are kept.
+
+        Parameters
+        ----------
+        pruner : VocabularyPruner
+            The pruner of the vocabulary.
+
+        Returns
+        -------
+        None.
+
+        """
+        try:
+            self.__gui.pipeline.prune(pruner)
+        except ValueError as error:
+            # The popup is shown by the gui thread.
+            message = str(error) + ' The previous pruning option is kept.'
+            self.__gui.window.after(0, lambda: WarningPopup(self.__gui, 'Pruning the vocabulary', message)._start())
+        else:
+            if self.__gui.inverted_index is not None:
+                self.__gui._refresh()
+
+        # The summary is refreshed by the gui thread.
+        self.__gui.window.after(0, self.__refresh)
+
+    def __refresh(self):
+        """
+        The method to show the effect of the last pruning on the number of terms, the number of weights and the memory of the tf-idf matrix.
+
+        Returns
+        -------
+        None.
+
+        """
+        if not self.__window.winfo_exists():
+            return
+        summary = self.__gui.pruner.summary if self.__gui.pruner is not None else None
+        if summary is None:
+            self.__summary_label.configure(text='The vocabulary has not been pruned yet.')
+        else:
+            self.__summary_label.configure(text='Terms: ' + str(summary['terms']) + ' -> ' + str(summary['kept_terms']) + '\n'
+                                           + 'Non-zero weights: ' + str(summary['weights']) + ' -> ' + str(summary['kept_weights']) + '\n'
+                                           + 'Tf-idf matrix: about ' + str(round(summary['matrix_bytes'] / 1e6, 2)) + ' MB -> '
+                                           + str(round(summary['kept_matrix_bytes'] / 1e6, 2)) + ' MB')
\ No newline at end of file
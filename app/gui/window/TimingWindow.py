@@ -0,0 +1,93 @@
+import tkinter as tk
+from tkinter import ttk
+from tkinter import filedialog
+
+class TimingWindow:
+
+    def __init__(self, gui):
+        """
+        The constructor for TimingWindow class.
+        The window shows the wall time and the CPU time spent in each stages of indexing and clustering.
+
+        Parameters
+        ----------
+        gui : gui
+            The main gui.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__gui = gui
+
+        # Initialize the timing window.
+        self.__window = tk.Toplevel(master=self.__gui.window)
+        self.__window.title('Stage timings')
+        self.__window.geometry('500x330')
+        self.__window.resizable(width=False, height=False)
+
+        # Initialize the table of stages in the window.
+        columns = ('wall', 'cpu', 'calls', 'share')
+        self.__table = ttk.Treeview(master=self.__window, columns=columns, height=12)
+        self.__table.heading('#0', text='Stage')
+        self.__table.heading('wall', text='Wall time (s)')
+        self.__table.heading('cpu', text='CPU time (s)')
+        self.__table.heading('calls', text='Calls')
+        self.__table.heading('share', text='Share')
+        self.__table.column('#0', width=140)
+        for column in columns:
+            self.__table.column(column, width=85, anchor='e')
+        self.__table.pack(side='top', fill='x', padx=2, pady=2)
+
+        # Initialize the note label, the refresh button and the export button in the window.
+        self.__note_label = tk.Label(master=self.__window, text='Times of parallel indexing are summed over processes.')
+        self.__note_label.configure(fg='#808080')
+        self.__note_label.pack(side='top', pady=1)
+        self.__export_button = tk.Button(master=self.__window, text='Export JSON', command=self.__export)
+        self.__export_button.pack(side='right', padx=2, pady=2)
+        self.__refresh_button = tk.Button(master=self.__window, text='Refresh', command=self.__refresh)
+        self.__refresh_button.pack(side='right', padx=2, pady=2)
+        self.__refresh()
+
+    def _start(self):
+        """
+        The method to start the timing window.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__window.mainloop()
+
+    def __refresh(self):
+        """
+        The method to show the current time spent in each stages.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__table.delete(*self.__table.get_children())
+        stages = self.__gui.stage_timer.stages
+        total = sum(stage['wall'] for stage in stages.values())
+        for name, stage in stages.items():
+            share = str(round(100 * stage['wall'] / total, 1)) + ' %' if total > 0 else '-'
+            self.__table.insert('', 'end', text=name.replace('_', ' ').capitalize(),
+                                values=(round(stage['wall'], 3), round(stage['cpu'], 3), stage['calls'], share))
+        self.__table.insert('', 'end', text='Total', values=(round(total, 3), round(sum(stage['cpu'] for stage in stages.values()), 3), '', ''))
+
+    def __export(self):
+        """
+        The method to write the time spent in each stages as a JSON file.
+
+        Returns
+        -------
+        None.
+
+        """
+        path = filedialog.asksaveasfilename(parent=self.__window, defaultextension='.json', filetypes=(('JSON file', '*.json'),))
+        if path:
+            self.__gui.stage_timer._save(path)
\ No newline at end of file
@@ -0,0 +1,215 @@
+
+import os
+import time
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+class Organizer:
+
+    # A hard link or a symbolic link only adds an entry to the file system, and moving a file renames it (in the same file system),
+    # so only copying writes the content of the documents again.
+    STRATEGY_LIST = ['copy', 'hardlink', 'symlink', 'move']
+
+    def __init__(self, folder_path, strategy='copy', workers=None):
+        """
+        The constructor for Organizer class.
+
+        Parameters
+        ----------
+        folder_path : string
+            The folder path of corpus.
+        strategy : string, optional
+            The way documents are put into the folder of their cluster: copy, hardlink, symlink or move. The default is copy.
+            Moving documents changes the folder of corpus, so its index has to be updated afterwards.
+        workers : int, optional
+            The number of threads copying, linking or moving documents. The default is None (the default of ThreadPoolExecutor).
+
+        Raises
+        ------
+        ValueError
+            If the strategy is not supported.
+
+        Returns
+        -------
+        None.
+
+        """
+        if strategy not in self.STRATEGY_LIST:
+            raise ValueError('Strategy ' + str(strategy) + ' is not supported.')
+        self.__folder_path = folder_path
+        self.__strategy = strategy
+        self.__workers = workers
+        self.__manifest = []
+        self.__summary = None
+
+    @property
+    def folder_path(self):
+        """
+        The method to get the folder path of corpus.
+
+        Returns
+        -------
+        string
+            The folder path.
+
+        """
+        return self.__folder_path
+
+    @property
+    def strategy(self):
+        """
+        The method to get the way documents are put into the folder of their cluster.
+
+        Returns
+        -------
+        string
+            The strategy.
+
+        """
+        return self.__strategy
+
+    @property
+    def manifest(self):
+        """
+        The method to get the manifest of the last organizing, which is also built by a dry run.
+
+        Returns
+        -------
+        list
+            The source path, the destination path and the size (in bytes) of each documents.
+            Written as [(source1, destination1, size1), (source2, destination2, size2), etc.].
+
+        """
+        return self.__manifest
+
+    @property
+    def summary(self):
+        """
+        The method to get the summary of the last organizing.
+
+        Returns
+        -------
+        dictionary
+            The organized folder, the strategy, the dry run status, the number of folders and files,
+            the size of the files and the size of the data copied (in bytes), and the time spent (in seconds).
+            None if no documents were organized yet.
+
+        """
+        return self.__summary
+
+    def _organize(self, cluster_list, folder='organized', dry_run=False, progress_callback=None):
+        """
+        The method to organize documents into folders based on documents' clusters.
+        Each cluster has a folder inside the organized folder, containing its documents.
+        Folders are created first, then documents are copied, linked or moved by a pool of threads.
+
+        Parameters
+        ----------
+        cluster_list : dictionary
+            The list of documents' title of each clusters.
+        folder : string, optional
+            The name of the organized folder, created in the folder of corpus. The default is 'organized'.
+        dry_run : boolean, optional
+            The dry run status (if true, only the manifest and the summary are built, and nothing is written). The default is False.
+        progress_callback : function, optional
+            The function called with the number of organized documents and the number of all documents. The default is None.
+
+        Raises
+        ------
+        FileExistsError
+            If the organized folder exists.
+        OSError
+            If a document cannot be put into its cluster folder. Unless documents are moved, the organized folder is then removed.
+
+        Returns
+        -------
+        organized_folder : string
+            The organized folder path.
+
+        """
+        start_time = time.perf_counter()
+        organized_folder = os.path.join(self.__folder_path, folder)
+        if dry_run and os.path.exists(organized_folder):
+            raise FileExistsError('File exists: ' + repr(organized_folder))
+
+        # List the source and the destination of each documents, and the folders to be created.
+        # The cluster folder keeps the subfolders of each documents.
+        self.__manifest = []
+        folder_list = [organized_folder]
+        for cluster, doc in cluster_list.items():
+            ci_folder = os.path.join(organized_folder, cluster)
+            folder_list.append(ci_folder)
+            for item in doc:
+                source = os.path.join(self.__folder_path, item + '.txt')
+                destination = os.path.join(ci_folder, item + '.txt')
+                folder_list.append(os.path.dirname(destination))
+                self.__manifest.append((source, destination, os.path.getsize(source)))
+        folder_list = list(dict.fromkeys(folder_list))
+
+        copied = 0
+        if not dry_run:
+            # Create a new organized folder, failing if it exists, and a folder for each clusters.
+            os.mkdir(organized_folder)
+            for ci_folder in folder_list[1:]:
+                os.makedirs(ci_folder, exist_ok=True)
+
+            # Copy, link or move each documents into its cluster folder.
+            # A half-populated organized folder is removed if a document cannot be put, unless documents are moved (it then holds some of them).
+            organized = 0
+            try:
+                with ThreadPoolExecutor(self.__workers) as executor:
+                    for size in executor.map(self.__put, self.__manifest):
+                        copied += size
+                        organized += 1
+                        if progress_callback is not None:
+                            progress_callback(organized, len(self.__manifest))
+            except OSError:
+                if self.__strategy != 'move':
+                    shutil.rmtree(organized_folder, ignore_errors=True)
+                raise
+
+        self.__summary = {'folder': organized_folder, 'strategy': self.__strategy, 'dry_run': dry_run,
+                          'folders': len(folder_list), 'files': len(self.__manifest), 'bytes': sum(entry[2] for entry in self.__manifest),
+                          'bytes_copied': copied, 'seconds': round(time.perf_counter() - start_time, 6)}
+        return organized_folder
+
+    def __put(self, entry):
+        """
+        The method to put a document into its cluster folder.
+        A document is copied instead when the file system does not support hard links between its folders,
+        or symbolic links cannot be created (e.g. on Windows, without the privilege to create them).
+
+        Parameters
+        ----------
+        entry : tuple
+            The source path, the destination path and the size of the document.
+
+        Returns
+        -------
+        int
+            The size of the data copied (in bytes).
+
+        """
+        source, destination, size = entry
+        if self.__strategy == 'hardlink':
+            try:
+                os.link(source, destination)
+                return 0
+            except OSError:
+                pass
+        elif self.__strategy == 'symlink':
+            # The link is relative, so the folder of corpus can be moved along with its organized folder.
+            try:
+                os.symlink(os.path.relpath(source, os.path.dirname(destination)), destination)
+                return 0
+            except OSError:
+                pass
+        elif self.__strategy == 'move':
+            # A document moved to another file system is copied, then removed.
+            if os.stat(source).st_dev == os.stat(os.path.dirname(destination)).st_dev:
+                os.rename(source, destination)
+                return 0
+            shutil.move(source, destination)
+            return size
+        shutil.copyfile(source, destination)
+        return size
\ No newline at end of file
@@ -0,0 +1,717 @@
+
+from retrieval.CorpusReader import CorpusReader
+from retrieval.CorpusStore import CorpusStore
+from retrieval.Indexer import Indexer
+from retrieval.TfidfMatrix import TfidfMatrix
+from retrieval.StemCache import StemCache
+from retrieval.IndexFile import IndexFile
+from clustering.Clusterer import Clusterer
+from pipeline.Organizer import Organizer
+from pipeline.StageTimer import StageTimer
+
+import os
+import csv
+import json
+
+class Pipeline:
+
+    def __init__(self, preprocessor_option=(True, True, True, True), parallel_option=True, stem_cache=None, timer=None, pruner=None, reducer=None, detector=None):
+        """
+        The constructor for Pipeline class.
+        The pipeline indexes a folder of documents, clusters them and organizes them, without any gui.
+
+        Parameters
+        ----------
+        preprocessor_option : tuple, optional
+            The stop words removal, stemming, case folding and normalization options. The default is all True.
+        parallel_option : boolean, optional
+            The parallel indexing status. The default is True.
+        stem_cache : StemCache, optional
+            The cache of stemmed tokens. The default is None (an empty cache).
+        timer : StageTimer, optional
+            The timer measuring the time spent in each stages. The default is None (a new timer).
+        pruner : VocabularyPruner, optional
+            The pruner of the vocabulary, selecting the terms of the tf-idf matrix. The default is None (all terms are kept).
+        reducer : DimensionReducer, optional
+            The reducer of the tf-idf rows, applied before the distance matrix is built. The default is None (distances over all terms).
+        detector : DuplicateDetector, optional
+            The detector of near-duplicate documents, collapsed into their first document for clustering. The default is None (no collapsing).
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__preprocessor_option = list(preprocessor_option)
+        self.__parallel_option = parallel_option
+        self.__stem_cache = stem_cache if stem_cache is not None else StemCache()
+        self.__timer = timer if timer is not None else StageTimer()
+        self.__pruner = pruner
+        self.__reducer = reducer
+        self.__detector = detector
+        self.__folder_path = ''
+        self.__corpus = CorpusStore()
+        self.__inverted_index = None
+        self.__tfidf_matrix = None
+        self.__clusterer = None
+        self.__method = None
+
+    @property
+    def preprocessor_option(self):
+        """
+        The method to get the preprocessor option.
+
+        Returns
+        -------
+        list
+            The stop words removal, stemming, case folding and normalization options.
+
+        """
+        return self.__preprocessor_option
+
+    @preprocessor_option.setter
+    def preprocessor_option(self, preprocessor_option):
+        """
+        The method to set the preprocessor option, used when documents are indexed or updated next.
+
+        Parameters
+        ----------
+        preprocessor_option : list
+            The stop words removal, stemming, case folding and normalization options.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__preprocessor_option = list(preprocessor_option)
+
+    @property
+    def parallel_option(self):
+        """
+        The method to get the parallel indexing status.
+
+        Returns
+        -------
+        boolean
+            The parallel indexing status.
+
+        """
+        return self.__parallel_option
+
+    @parallel_option.setter
+    def parallel_option(self, parallel_option):
+        """
+        The method to set the parallel indexing status, used when documents are indexed or updated next.
+
+        Parameters
+        ----------
+        parallel_option : boolean
+            The parallel indexing status.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__parallel_option = parallel_option
+
+    @property
+    def stem_cache(self):
+        """
+        The method to get the cache of stemmed tokens.
+
+        Returns
+        -------
+        StemCache
+            The cache of stemmed tokens.
+
+        """
+        return self.__stem_cache
+
+    @property
+    def timer(self):
+        """
+        The method to get the timer measuring the time spent in each stages.
+        It is reset when documents are indexed or updated.
+
+        Returns
+        -------
+        StageTimer
+            The timer.
+
+        """
+        return self.__timer
+
+    @property
+    def pruner(self):
+        """
+        The method to get the pruner of the vocabulary.
+        Its summary shows the effect of the last pruning on the tf-idf matrix.
+
+        Returns
+        -------
+        VocabularyPruner
+            The pruner, or None if all terms are kept.
+
+        """
+        return self.__pruner
+
+    @property
+    def reducer(self):
+        """
+        The method to get the reducer of the tf-idf rows.
+
+        Returns
+        -------
+        DimensionReducer
+            The reducer, or None if distances are calculated over all terms.
+
+        """
+        return self.__reducer
+
+    @property
+    def detector(self):
+        """
+        The method to get the detector of near-duplicate documents.
+        Its summary shows the number of documents collapsed by the last clustering.
+
+        Returns
+        -------
+        DuplicateDetector
+            The detector, or None if near-duplicates are not collapsed.
+
+        """
+        return self.__detector
+
+    @property
+    def folder_path(self):
+        """
+        The method to get the folder path of corpus.
+
+        Returns
+        -------
+        string
+            The folder path.
+
+        """
+        return self.__folder_path
+
+    @property
+    def corpus(self):
+        """
+        The method to get the corpus.
+
+        Returns
+        -------
+        CorpusStore
+            The store of documents.
+
+        """
+        return self.__corpus
+
+    @property
+    def inverted_index(self):
+        """
+        The method to get the inverted index.
+
+        Returns
+        -------
+        InvertedIndex
+            The inverted index, or None if no index is built or loaded.
+
+        """
+        return self.__inverted_index
+
+    @property
+    def tfidf_matrix(self):
+        """
+        The method to get the tf-idf matrix.
+
+        Returns
+        -------
+        TfidfMatrix
+            The tf-idf matrix of the corpus, or None if no index is built or loaded.
+
+        """
+        return self.__tfidf_matrix
+
+    @property
+    def clusterer(self):
+        """
+        The method to get the clusterer of the corpus.
+
+        Returns
+        -------
+        Clusterer
+            The clusterer, or None if no index is built or loaded.
+
+        """
+        return self.__clusterer
+
+    def index(self, folder_path, progress_callback=None, listing_callback=None):
+        """
+        The method to index all .txt files in a folder.
+
+        Parameters
+        ----------
+        folder_path : string
+            The folder path containing the documents.
+        progress_callback : function, optional
+            The function called with the number of indexed documents and the number of all documents. The default is None.
+        listing_callback : function, optional
+            The function called with the number of listed files and the number of all files. The default is None.
+
+        Raises
+        ------
+        ValueError
+            If there are less than two documents in the folder, or no term is left after pruning the vocabulary.
+
+        Returns
+        -------
+        None.
+
+        """
+        corpus = CorpusReader(folder_path)._list_documents(progress_callback=listing_callback)
+        if len(corpus) < 2:
+            raise ValueError('There must be at least two documents to be indexed and clustered.')
+        self.__folder_path = folder_path
+        self.__corpus = corpus
+        self.__reset_tfidf_matrix()
+        self.__timer._reset()
+        self.__inverted_index = self._index_documents(corpus, progress_callback=progress_callback)
+        self.__set_tfidf_matrix()
+
+    def update(self, progress_callback=None, listing_callback=None, checksum=False):
+        """
+        The method to update the index with the added, modified and deleted files of its folder.
+
+        Parameters
+        ----------
+        progress_callback : function, optional
+            The function called with the number of indexed documents and the number of documents to index. The default is None.
+        listing_callback : function, optional
+            The function called with the number of checked files and the number of all files. The default is None.
+        checksum : boolean, optional
+            The checksum status (if true, every file is hashed, instead of the files whose size or modification time changed). The default is False.
+
+        Raises
+        ------
+        ValueError
+            If there is no index to be updated, or no term is left after pruning the vocabulary.
+
+        Returns
+        -------
+        added : list
+            The list of new documents.
+        modified : list
+            The list of modified documents.
+        deleted : list
+            The list of deleted documents.
+
+        """
+        if self.__inverted_index is None:
+            raise ValueError('There is no index to be updated.')
+        added, modified, deleted = CorpusReader(self.__folder_path)._diff(self.__corpus, listing_callback, checksum)
+        if len(added) > 0 or len(modified) > 0 or len(deleted) > 0:
+            self.__corpus, removed_doc_ids = self._merge_corpus(self.__corpus, added, modified, deleted)
+            self.__reset_tfidf_matrix()
+            self.__timer._reset()
+            self.__inverted_index = self._index_documents(modified + added, self.__inverted_index, removed_doc_ids, progress_callback)
+            self.__set_tfidf_matrix()
+        return added, modified, deleted
+
+    def save(self, index_path):
+        """
+        The method to save the index as an index file, and the cache of stemmed tokens next to it.
+
+        Parameters
+        ----------
+        index_path : string
+            The file path of the index.
+
+        Raises
+        ------
+        ValueError
+            If there is no index to be saved.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.__inverted_index is None:
+            raise ValueError('There is no index to be saved.')
+        IndexFile(self.__inverted_index, self.__corpus, self.__folder_path, self.__preprocessor_option, self.__tfidf_matrix, self.__pruner, self.__reducer, self.__detector)._save(index_path)
+        self.__stem_cache._save(self._get_stem_cache_path(index_path))
+
+    def load(self, index_path):
+        """
+        The method to load a saved index, along with its preprocessor option, its pruning, reduction and detection options and the cache of stemmed tokens saved next to it.
+
+        Parameters
+        ----------
+        index_path : string
+            The file path of the index.
+
+        Raises
+        ------
+        ValueError
+            If the file loaded is not an index file, or no term is left after pruning the vocabulary.
+
+        Returns
+        -------
+        None.
+
+        """
+        index_file = IndexFile._load(index_path)
+        self.__inverted_index = index_file.inverted_index
+        self.__folder_path = index_file.folder_path
+        self.__corpus = index_file.corpus
+        self.__reset_tfidf_matrix()
+        self.__preprocessor_option = list(index_file.preprocessor_option)
+        self.__pruner = index_file.pruner
+        self.__reducer = index_file.reducer
+        self.__detector = index_file.detector
+        stem_cache_path = self._get_stem_cache_path(index_path)
+        if os.path.exists(stem_cache_path):
+            self.__stem_cache = StemCache._load(stem_cache_path)
+        self.__timer._reset()
+        self.__set_tfidf_matrix(index_file.tfidf_matrix)
+
+    def prune(self, pruner=None):
+        """
+        The method to set the pruner of the vocabulary, rebuilding the tf-idf matrix if documents are indexed.
+        Otherwise, the pruner is used when documents are indexed.
+
+        Parameters
+        ----------
+        pruner : VocabularyPruner, optional
+            The pruner of the vocabulary. The default is None (all terms are kept).
+
+        Raises
+        ------
+        ValueError
+            If no term is left after pruning the vocabulary. The previous pruner and tf-idf matrix are kept.
+
+        Returns
+        -------
+        None.
+
+        """
+        previous_pruner = self.__pruner
+        self.__pruner = pruner
+        if self.__inverted_index is not None:
+            try:
+                self.__set_tfidf_matrix()
+            except ValueError:
+                self.__pruner = previous_pruner
+                raise
+
+    def reduce(self, reducer=None):
+        """
+        The method to set the reducer of the tf-idf rows, creating a new clusterer if documents are indexed.
+        Otherwise, the reducer is used when documents are indexed.
+
+        Parameters
+        ----------
+        reducer : DimensionReducer, optional
+            The reducer of the tf-idf rows. The default is None (distances over all terms).
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__reducer = reducer
+        if self.__tfidf_matrix is not None:
+            self.__clusterer = Clusterer(self.__corpus, self.__tfidf_matrix, timer=self.__timer, reducer=self.__reducer, detector=self.__detector,
+                                         inverted_index=self.__inverted_index)
+            self.__method = None
+
+    def deduplicate(self, detector=None):
+        """
+        The method to set the detector of near-duplicate documents, creating a new clusterer if documents are indexed.
+        Otherwise, the detector is used when documents are indexed.
+        Each group of near-duplicates is clustered as its first document, and its documents end up in the same cluster and folder.
+
+        Parameters
+        ----------
+        detector : DuplicateDetector, optional
+            The detector of near-duplicate documents. The default is None (no collapsing).
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__detector = detector
+        if self.__tfidf_matrix is not None:
+            self.__clusterer = Clusterer(self.__corpus, self.__tfidf_matrix, timer=self.__timer, reducer=self.__reducer, detector=self.__detector,
+                                         inverted_index=self.__inverted_index)
+            self.__method = None
+
+    def cluster(self, method='average', cut_off=0):
+        """
+        The method to cluster the documents, and cut the hierarchy at a cut-off height.
+
+        Parameters
+        ----------
+        method : string, optional
+            The method used for calculating distances between two clusters. The default is average.
+        cut_off : float, optional
+            The cut-off height. The default is 0 (a single cluster).
+
+        Raises
+        ------
+        ValueError
+            If there is no index to be clustered.
+
+        Returns
+        -------
+        Clusterer
+            The clusterer.
+
+        """
+        if self.__clusterer is None:
+            raise ValueError('There are no documents to be clustered.')
+        self.__clusterer.cluster(method)
+        self.__clusterer.cut_off = cut_off
+        self.__method = method
+        return self.__clusterer
+
+    def export_clusters(self, path, file_format=None, autorenaming_option=True):
+        """
+        The method to write the clusters obtained as a JSON or CSV file.
+        The JSON file lists each clusters with its documents, and the CSV file has a row for each documents.
+
+        Parameters
+        ----------
+        path : string
+            The file path.
+        file_format : string, optional
+            The file format, json or csv. The default is None (based on the file extension).
+        autorenaming_option : boolean, optional
+            The autorenaming status. The default is True.
+
+        Raises
+        ------
+        ValueError
+            If the documents are not clustered yet, or the file format is not supported.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.__method is None:
+            raise ValueError('The documents are not clustered yet.')
+        file_format = file_format if file_format is not None else os.path.splitext(path)[1].lstrip('.').lower()
+        cluster_list = self._get_clusters(autorenaming_option)
+        if file_format == 'json':
+            data = {}
+            data['folder_path'] = self.__folder_path
+            data['method'] = self.__method
+            data['cut_off'] = self.__clusterer.cut_off
+            data['clusters'] = [{'id': cluster_id, 'name': name, 'documents': [{'doc_id': doc.doc_id, 'title': doc.title} for doc in docs]}
+                                for cluster_id, name, docs in cluster_list]
+            with open(path, 'w', encoding='utf-8') as handle:
+                json.dump(data, handle, ensure_ascii=False, indent=4)
+        elif file_format == 'csv':
+            with open(path, 'w', encoding='utf-8', newline='') as handle:
+                writer = csv.writer(handle)
+                writer.writerow(['doc_id', 'title', 'cluster_id', 'cluster_name'])
+                for cluster_id, name, docs in cluster_list:
+                    for doc in docs:
+                        writer.writerow([doc.doc_id, doc.title, cluster_id, name])
+        else:
+            raise ValueError('File format ' + file_format + ' is not supported.')
+
+    def organize(self, autorenaming_option=True, strategy='copy', dry_run=False, progress_callback=None):
+        """
+        The method to organize documents into folders based on documents' clusters.
+
+        Parameters
+        ----------
+        autorenaming_option : boolean, optional
+            The autorenaming status. The default is True.
+        strategy : string, optional
+            The way documents are put into the folder of their cluster: copy, hardlink, symlink or move. The default is copy.
+        dry_run : boolean, optional
+            The dry run status (if true, only the manifest and the summary are built, and nothing is written). The default is False.
+        progress_callback : function, optional
+            The function called with the number of organized documents and the number of all documents. The default is None.
+
+        Raises
+        ------
+        FileExistsError
+            If the organized folder exists.
+        ValueError
+            If the documents are not clustered yet, or the strategy is not supported.
+
+        Returns
+        -------
+        Organizer
+            The organizer, with the manifest and the summary of organizing.
+
+        """
+        if self.__method is None:
+            raise ValueError('The documents are not clustered yet.')
+        organizer = Organizer(self.__folder_path, strategy)
+        organizer._organize(self.__clusterer.extract_clusters(autorenaming_option), dry_run=dry_run, progress_callback=progress_callback)
+        return organizer
+
+    def _get_clusters(self, autorenaming_option=True):
+        """
+        The method to get the clusters obtained, with their id, name and documents.
+
+        Parameters
+        ----------
+        autorenaming_option : boolean, optional
+            The autorenaming status. The default is True.
+
+        Returns
+        -------
+        list
+            The id, name and list of documents of each clusters, ordered by id.
+
+        """
+        # Cluster names are listed in the order of cluster ids.
+        names = list(self.__clusterer.extract_clusters(autorenaming_option).keys())
+        cluster_list = [(cluster_id, name, []) for cluster_id, name in enumerate(names)]
+        documents = {doc.doc_id: doc for doc in self.__corpus}
+        for doc_id, cluster_id in self.__clusterer.assign_clusters().items():
+            cluster_list[cluster_id][2].append(documents[doc_id])
+        return cluster_list
+
+    def _index_documents(self, documents, inverted_index=None, removed_doc_ids=None, progress_callback=None):
+        """
+        The method to index documents, in parallel if the parallel option is on.
+        Postings of removed documents are retracted first, when updating an index.
+
+        Parameters
+        ----------
+        documents : list
+            The list of documents to be indexed.
+        inverted_index : InvertedIndex, optional
+            The current inverted index (for updating). The default is None.
+        removed_doc_ids : list, optional
+            The list of documents' id whose postings are retracted (for updating). The default is None.
+        progress_callback : function, optional
+            The function called with the number of indexed documents and the number of documents to index. The default is None.
+
+        Returns
+        -------
+        InvertedIndex
+            The inverted index.
+
+        """
+        stopwords_removal_option, stemming_option, case_folding_option, normalization_option = self.__preprocessor_option
+        indexer = Indexer(inverted_index, self.__stem_cache, self.__timer)
+        if removed_doc_ids is not None:
+            indexer._remove(removed_doc_ids)
+        if self.__parallel_option is True:
+            indexer.index_parallel(documents, stopwords_removal_option, stemming_option, case_folding_option, normalization_option, progress_callback=progress_callback)
+        else:
+            # The next documents are read by a pool of threads while the current one is indexed.
+            # Only the time spent waiting for a document to be read is measured as reading.
+            for i, doc in enumerate(CorpusReader._stream(documents, timer=self.__timer)):
+                indexer.index(doc, stopwords_removal_option, stemming_option, case_folding_option, normalization_option)
+                if progress_callback is not None:
+                    progress_callback(i + 1, len(documents))
+        return indexer.inverted_index
+
+    def __set_tfidf_matrix(self, tfidf_matrix=None):
+        """
+        The method to set the tf-idf matrix, binding each document in corpus to its row, and create a new clusterer.
+        A matrix built from the inverted index only has the terms kept by the pruner.
+
+        Parameters
+        ----------
+        tfidf_matrix : TfidfMatrix, optional
+            The tf-idf matrix of the corpus. The default is None (built from the inverted index).
+
+        Raises
+        ------
+        ValueError
+            If no term is left after pruning the vocabulary. The tf-idf matrix and the clusterer are then left as they were.
+
+        Returns
+        -------
+        None.
+
+        """
+        terms = None
+        if tfidf_matrix is None and self.__pruner is not None:
+            with self.__timer._measure('pruning'):
+                terms = self.__pruner._prune(self.__inverted_index, len(self.__corpus))
+        with self.__timer._measure('vectorization'):
+            if tfidf_matrix is None:
+                tfidf_matrix = TfidfMatrix(self.__inverted_index, self.__corpus.doc_ids, terms=terms)
+            self.__corpus._build_vectors(tfidf_matrix)
+        self.__tfidf_matrix = tfidf_matrix
+        self.__clusterer = Clusterer(self.__corpus, tfidf_matrix, timer=self.__timer, reducer=self.__reducer, detector=self.__detector,
+                                     inverted_index=self.__inverted_index)
+        self.__method = None
+
+    def __reset_tfidf_matrix(self):
+        """
+        The method to drop the tf-idf matrix and the clusterer of the previous corpus, so they are never left bound to another corpus.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__tfidf_matrix = None
+        self.__clusterer = None
+        self.__method = None
+
+    @staticmethod
+    def _merge_corpus(corpus, added, modified, deleted):
+        """
+        The method to update a corpus with its added, modified and deleted documents.
+
+        Parameters
+        ----------
+        corpus : CorpusStore
+            The store of indexed documents.
+        added : list
+            The list of new documents.
+        modified : list
+            The list of modified documents.
+        deleted : list
+            The list of deleted documents.
+
+        Returns
+        -------
+        corpus : CorpusStore
+            The updated store of documents, with modified documents replaced, deleted documents removed and new documents appended.
+            The added and modified documents become views of the updated store.
+        removed_doc_ids : list
+            The list of deleted and modified documents' id, whose postings are to be retracted.
+
+        """
+        modified_corpus = {doc.doc_id: doc for doc in modified}
+        deleted_doc_ids = set([doc.doc_id for doc in deleted])
+        updated_corpus = [modified_corpus.get(doc.doc_id, doc) for doc in corpus if doc.doc_id not in deleted_doc_ids]
+        removed_doc_ids = list(deleted_doc_ids) + list(modified_corpus.keys())
+        return CorpusStore._from_documents(updated_corpus + added), removed_doc_ids
+
+    @staticmethod
+    def _get_stem_cache_path(index_path):
+        """
+        The method to get the file path of the cache of stemmed tokens saved next to an index.
+
+        Parameters
+        ----------
+        index_path : string
+            The file path of the index.
+
+        Returns
+        -------
+        string
+            The file path of the cache of stemmed tokens.
+
+        """
+        return os.path.splitext(index_path)[0] + '.stems'
\ No newline at end of file
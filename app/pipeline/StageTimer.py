@@ -0,0 +1,174 @@
+
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+class StageTimer:
+
+    # Stages are listed in the order they are run, from reading the files to rendering the dendrogram.
+    STAGE_LIST = ['reading', 'preprocessing', 'tokenization', 'stopwords_removal', 'stemming', 'normalization', 'posting',
+                  'pruning', 'vectorization', 'deduplication', 'reduction', 'distance_matrix', 'linkage', 'auto_naming', 'rendering']
+
+    def __init__(self, detailed=False):
+        """
+        The constructor for StageTimer class.
+        The timer adds up the wall time and the CPU time spent in each stages of the pipeline, and the number of times each stages is run.
+
+        Parameters
+        ----------
+        detailed : boolean, optional
+            The detailed timing status (if true, tokenization, stop words removal, stemming and normalization are measured as separate stages,
+            each in its own pass over the tokens, instead of a single preprocessing stage). The default is False.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__detailed = detailed
+        self.__stages = {}
+
+        # Stages may be measured by several threads (e.g. linkage matrices precomputed in the background).
+        self.__lock = threading.Lock()
+
+    @property
+    def detailed(self):
+        """
+        The method to get the detailed timing status.
+
+        Returns
+        -------
+        boolean
+            True if the steps of preprocessing are measured as separate stages.
+
+        """
+        return self.__detailed
+
+    @property
+    def stages(self):
+        """
+        The method to get the time spent in each stages.
+        The CPU time is the time of the thread running the stage, summed over processes when indexing in parallel.
+
+        Returns
+        -------
+        dictionary
+            The wall time (in seconds), the CPU time (in seconds) and the number of calls of each measured stages, in the order of STAGE_LIST.
+            Written as {stage1: {'wall': 1.5, 'cpu': 1.4, 'calls': 10}, stage2: {'wall': 0.2, 'cpu': 0.2, 'calls': 1}, etc.}.
+
+        """
+        with self.__lock:
+            order = self.STAGE_LIST + sorted(stage for stage in self.__stages if stage not in self.STAGE_LIST)
+            return {stage: {'wall': round(self.__stages[stage][0], 6), 'cpu': round(self.__stages[stage][1], 6), 'calls': self.__stages[stage][2]}
+                    for stage in order if stage in self.__stages}
+
+    @contextmanager
+    def _measure(self, stage):
+        """
+        The method to measure the code run inside a with statement as a stage.
+
+        Parameters
+        ----------
+        stage : string
+            The stage.
+
+        Yields
+        ------
+        None.
+
+        """
+        start_wall, start_cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self._add(stage, time.perf_counter() - start_wall, time.thread_time() - start_cpu)
+
+    def _add(self, stage, wall, cpu, calls=1):
+        """
+        The method to add time spent in a stage.
+
+        Parameters
+        ----------
+        stage : string
+            The stage.
+        wall : float
+            The wall time (in seconds).
+        cpu : float
+            The CPU time (in seconds).
+        calls : int, optional
+            The number of calls. The default is 1.
+
+        Returns
+        -------
+        None.
+
+        """
+        with self.__lock:
+            total_wall, total_cpu, total_calls = self.__stages.get(stage, (0.0, 0.0, 0))
+            self.__stages[stage] = (total_wall + wall, total_cpu + cpu, total_calls + calls)
+
+    def _merge(self, stages):
+        """
+        The method to add the time spent in the stages measured by another timer (e.g. by a process of the pool).
+
+        Parameters
+        ----------
+        stages : dictionary
+            The time spent in each stages, as returned by method _drain.
+
+        Returns
+        -------
+        None.
+
+        """
+        for stage, (wall, cpu, calls) in stages.items():
+            self._add(stage, wall, cpu, calls)
+
+    def _drain(self):
+        """
+        The method to get the time spent in each stages since the last drain, and reset the timer.
+
+        Returns
+        -------
+        stages : dictionary
+            The wall time, the CPU time and the number of calls of each stages.
+            Written as {stage1: (wall, cpu, calls), stage2: (wall, cpu, calls), etc.}.
+
+        """
+        with self.__lock:
+            stages, self.__stages = self.__stages, {}
+        return stages
+
+    def _reset(self):
+        """
+        The method to forget the time spent in all stages.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._drain()
+
+    def _save(self, path):
+        """
+        The method to write the time spent in each stages as a JSON file.
+
+        Parameters
+        ----------
+        path : string
+            The file path.
+
+        Returns
+        -------
+        None.
+
+        """
+        stages = self.stages
+        data = {}
+        data['stages'] = stages
+        data['total'] = {'wall': round(sum(stage['wall'] for stage in stages.values()), 6),
+                         'cpu': round(sum(stage['cpu'] for stage in stages.values()), 6)}
+        with open(path, 'w', encoding='utf-8') as handle:
+            json.dump(data, handle, indent=4)
\ No newline at end of file
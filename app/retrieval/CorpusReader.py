@@ -0,0 +1,309 @@
+
+from retrieval.CorpusStore import CorpusStore
+
+import os
+import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+class CorpusReader:
+
+    # Files are read and their status are checked by a pool of threads, so the latency of each file (e.g. on a network share) overlaps.
+    # Threads are given batches of files, so local files are not slowed down by handing each file to a thread.
+    WORKERS = 8
+    BATCH_SIZE = 64
+
+    def __init__(self, folder_path, workers=None):
+        """
+        The constructor for CorpusReader class.
+
+        Parameters
+        ----------
+        folder_path : string
+            The folder path containing the documents.
+        workers : int, optional
+            The number of threads checking the files. The default is None (WORKERS).
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__folder_path = folder_path
+        self.__workers = workers if workers is not None else self.WORKERS
+
+    @property
+    def folder_path(self):
+        """
+        The method to get the folder path containing the documents.
+
+        Returns
+        -------
+        string
+            The folder path.
+
+        """
+        return self.__folder_path
+
+    def _list_documents(self, start=0, progress_callback=None):
+        """
+        The method to get a list of documents for all .txt files in the folder, without reading their content.
+
+        Parameters
+        ----------
+        start : int, optional
+            The number of the first document's id. The default is 0.
+        progress_callback : function, optional
+            The function called with the number of listed files and the number of all files. The default is None.
+
+        Returns
+        -------
+        CorpusStore
+            The store of documents, each with its file path but without content.
+
+        """
+        path_list = self._list_files()
+        status_list = self._map(os.stat, path_list, self.__workers, progress_callback)
+        return CorpusStore(['doc_' + str(start + i) for i in range(0, len(path_list))], [self._get_title(path) for path in path_list], path_list,
+                           [status.st_size for status in status_list], [status.st_mtime for status in status_list])
+    
+    def _diff(self, corpus, progress_callback=None, checksum=False):
+        """
+        The method to compare the documents in the folder with an indexed corpus.
+        A document is modified if its file size or modification time changed and its content hash is different.
+
+        Parameters
+        ----------
+        corpus : CorpusStore
+            The store of indexed documents.
+        progress_callback : function, optional
+            The function called with the number of checked files and the number of indexed files still in the folder. The default is None.
+        checksum : boolean, optional
+            The checksum status (if true, every file is hashed, so a change keeping the file size and modification time is found). The default is False.
+
+        Returns
+        -------
+        added : list
+            The list of new documents, with new ids.
+        modified : list
+            The list of modified documents, with the same ids as the indexed documents.
+        deleted : list
+            The list of indexed documents whose file does not exist anymore.
+
+        """
+        current_path_list = self._list_files()
+        current_paths = set(current_path_list)
+        
+        # Documents indexed by older versions have no file path stored, so it is taken from the title.
+        indexed = {}
+        for document in corpus:
+            path = document.path if document.path is not None else os.path.join(self.__folder_path, document.title + '.txt')
+            indexed[path] = document
+        
+        # Check the file size and modification time first, and only hash the files which look changed.
+        # Documents without a manifest are always reindexed.
+        def _is_modified(item):
+            path, document = item
+            status = os.stat(path)
+            if not checksum and document.size == status.st_size and document.mtime == status.st_mtime:
+                return False
+            if document.content_hash is not None and document.content_hash == CorpusReader._hash(path):
+                document._set_status(status.st_size, status.st_mtime)
+                return False
+            return True
+        
+        deleted = [document for path, document in indexed.items() if path not in current_paths]
+        kept = [(path, document) for path, document in indexed.items() if path in current_paths]
+        modified_list = [(document.doc_id, path)
+                         for (path, document), is_modified in zip(kept, self._map(_is_modified, kept, self.__workers, progress_callback)) if is_modified]
+        
+        # Give new documents ids following the largest indexed id.
+        start = max([int(doc_id.split('_')[-1]) for doc_id in corpus.doc_ids], default=-1) + 1
+        added_paths = [path for path in current_path_list if path not in indexed]
+        added_list = [('doc_' + str(start + i), path) for i, path in enumerate(added_paths)]
+        
+        # Modified and new documents are views of a single store, the modified ones first.
+        store = self.__create_store(modified_list + added_list)
+        return store[len(modified_list):], store[:len(modified_list)], deleted
+
+    def _list_files(self):
+        """
+        The method to get the file paths of all .txt files in the folder.
+
+        Returns
+        -------
+        path_list : list
+            The list of file paths.
+
+        """
+        path_list = []
+        for root, directories, files in os.walk(self.__folder_path):
+            for file in files:
+                if '.txt' in file:
+                    path_list.append(os.path.join(root, file))
+        return path_list
+
+    def _get_title(self, path):
+        """
+        The method to get the title of a document from its file path.
+
+        Parameters
+        ----------
+        path : string
+            The file path.
+
+        Returns
+        -------
+        string
+            The document's title, written as the file path relative to the folder without extension.
+
+        """
+        return os.path.relpath(os.path.splitext(path)[0], self.__folder_path)
+
+    @staticmethod
+    def _stream(corpus, workers=WORKERS, max_in_flight=BATCH_SIZE, timer=None):
+        """
+        The method to lazily load the content of each documents, in the order of the corpus.
+        A pool of threads reads the next documents while the current one is processed, keeping a bounded number of documents in memory.
+        A document's content should be deleted once its term frequencies are counted.
+
+        Parameters
+        ----------
+        corpus : list
+            The list of documents.
+        workers : int, optional
+            The number of threads reading the documents. The default is WORKERS.
+        max_in_flight : int, optional
+            The maximum number of documents read ahead. The default is BATCH_SIZE.
+        timer : StageTimer, optional
+            The timer measuring the time spent waiting for documents to be read, as the reading stage. The default is None.
+
+        Yields
+        ------
+        Document
+            The document, with its content loaded.
+
+        """
+        def _load(document):
+            if document.content is None:
+                CorpusReader._load(document)
+            return document
+        
+        with ThreadPoolExecutor(workers) as executor:
+            pending = deque()
+            documents = iter(corpus)
+            for document in documents:
+                pending.append(executor.submit(_load, document))
+                if len(pending) >= max_in_flight:
+                    break
+            while len(pending) > 0:
+                future = pending.popleft()
+                if timer is not None:
+                    with timer._measure('reading'):
+                        document = future.result()
+                else:
+                    document = future.result()
+                
+                # Read one more document for each document processed.
+                next_document = next(documents, None)
+                if next_document is not None:
+                    pending.append(executor.submit(_load, next_document))
+                yield document
+
+    @staticmethod
+    def _load(document):
+        """
+        The method to read the content of a document file, and record the hash of the file content.
+
+        Parameters
+        ----------
+        document : Document
+            The document.
+
+        Returns
+        -------
+        content : string
+            The document's content.
+
+        """
+        with open(document.path, 'rb') as handle:
+            data = handle.read()
+        document.content_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+        
+        # Line breaks are removed from the content (as the universal newlines "\r\n", "\r" and "\n").
+        content = data.decode('utf-8').replace('\r', '').replace('\n', '')
+        document.content = content
+        return content
+
+    @staticmethod
+    def _map(function, items, workers=WORKERS, progress_callback=None):
+        """
+        The method to apply a function to each items with a pool of threads, giving each thread a batch of items.
+
+        Parameters
+        ----------
+        function : function
+            The function, which is called with an item.
+        items : list
+            The list of items.
+        workers : int, optional
+            The number of threads. The default is WORKERS.
+        progress_callback : function, optional
+            The function called with the number of done items and the number of all items, after each batch. The default is None.
+
+        Returns
+        -------
+        result : list
+            The result of the function for each items, in the order of the items.
+
+        """
+        batch_list = [items[i:i + CorpusReader.BATCH_SIZE] for i in range(0, len(items), CorpusReader.BATCH_SIZE)]
+        result = []
+        with ThreadPoolExecutor(workers) as executor:
+            for batch_result in executor.map(lambda batch: [function(item) for item in batch], batch_list):
+                result.extend(batch_result)
+                if progress_callback is not None:
+                    progress_callback(len(result), len(items))
+        return result
+
+    @staticmethod
+    def _hash(path):
+        """
+        The method to get the hash of a file content.
+
+        Parameters
+        ----------
+        path : string
+            The file path.
+
+        Returns
+        -------
+        string
+            The hash of the file content.
+
+        """
+        content_hash = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as handle:
+            for block in iter(lambda: handle.read(1024 * 1024), b''):
+                content_hash.update(block)
+        return content_hash.hexdigest()
+
+    def __create_store(self, document_list):
+        """
+        The method to create a store of documents for files, recording their file size and modification time.
+
+        Parameters
+        ----------
+        document_list : list
+            The id and file path of each documents, written as [(doc1, path1), (doc2, path2), etc.].
+
+        Returns
+        -------
+        CorpusStore
+            The store of documents, without content.
+
+        """
+        status_list = [os.stat(path) for doc_id, path in document_list]
+        return CorpusStore([doc_id for doc_id, path in document_list], [self._get_title(path) for doc_id, path in document_list],
+                           [path for doc_id, path in document_list], [status.st_size for status in status_list],
+                           [status.st_mtime for status in status_list])
\ No newline at end of file
@@ -0,0 +1,386 @@
+
+from retrieval.Document import Document
+
+import math
+from array import array
+
+class CorpusStore:
+
+    # Content hashes are stored as raw bytes, HASH_SIZE bytes for each documents.
+    HASH_SIZE = 16
+
+    def __init__(self, doc_ids=(), titles=(), paths=None, sizes=None, mtimes=None, content_hashes=None):
+        """
+        The constructor for CorpusStore class.
+        The store keeps the metadata of all documents in compact arrays, a column for each fields, instead of an object for each documents.
+        Strings of a column are concatenated into a single string, along with the offset of each strings.
+        Documents are lightweight views of a row of the store, created on demand.
+
+        Parameters
+        ----------
+        doc_ids : list, optional
+            The id of each documents. The default is an empty list.
+        titles : list, optional
+            The title of each documents. The default is an empty list.
+        paths : list, optional
+            The file path of each documents, or None. The default is None (no file path).
+        sizes : list, optional
+            The file size (in bytes) of each documents, or None. The default is None (no file size).
+        mtimes : list, optional
+            The file modification time of each documents, or None. The default is None (no modification time).
+        content_hashes : list, optional
+            The hash of each documents' file content, written as a hexadecimal string, or None. The default is None (no hash).
+
+        Returns
+        -------
+        None.
+
+        """
+        n = len(doc_ids)
+        self.__length = n
+        self.__doc_ids = self.__pack(doc_ids)
+        self.__titles = self.__pack(titles)
+        self.__paths = self.__pack(paths if paths is not None else [None] * n)
+        self.__sizes = array('q', (-1 if size is None else size for size in sizes)) if sizes is not None else array('q', [-1]) * n
+        self.__mtimes = array('d', (math.nan if mtime is None else mtime for mtime in mtimes)) if mtimes is not None else array('d', [math.nan]) * n
+        self.__content_hashes = bytearray(self.HASH_SIZE * n)
+        self.__hashed = array('b', [0]) * n
+        if content_hashes is not None:
+            for row, content_hash in enumerate(content_hashes):
+                self.__set_content_hash(row, content_hash)
+
+        # Contents are only kept while documents are being indexed.
+        self.__contents = {}
+        self.__tfidf_matrix = None
+
+    def __len__(self):
+        """
+        The method to get the number of documents.
+
+        Returns
+        -------
+        int
+            The number of documents.
+
+        """
+        return self.__length
+
+    def __getitem__(self, row):
+        """
+        The method to get the document of a row, or the documents of a slice of rows.
+
+        Parameters
+        ----------
+        row : int or slice
+            The row.
+
+        Raises
+        ------
+        IndexError
+            If the row is out of range.
+
+        Returns
+        -------
+        Document or list
+            The view of the document, or the list of views of the documents.
+
+        """
+        if isinstance(row, slice):
+            return [Document._view(self, i) for i in range(*row.indices(self.__length))]
+        if row < 0:
+            row += self.__length
+        if row < 0 or row >= self.__length:
+            raise IndexError('Document row out of range.')
+        return Document._view(self, row)
+
+    def __iter__(self):
+        """
+        The method to iterate over the documents, in the order of rows.
+
+        Yields
+        ------
+        Document
+            The view of the document.
+
+        """
+        for row in range(0, self.__length):
+            yield Document._view(self, row)
+
+    @property
+    def doc_ids(self):
+        """
+        The method to get the id of each documents.
+
+        Returns
+        -------
+        list
+            The documents' id, in the order of rows.
+
+        """
+        return self.__unpack(self.__doc_ids)
+
+    @property
+    def titles(self):
+        """
+        The method to get the title of each documents.
+
+        Returns
+        -------
+        list
+            The documents' title, in the order of rows.
+
+        """
+        return self.__unpack(self.__titles)
+
+    @property
+    def tfidf_matrix(self):
+        """
+        The method to get the tf-idf matrix the documents are bound to.
+
+        Returns
+        -------
+        TfidfMatrix
+            The tf-idf matrix, or None.
+
+        """
+        return self.__tfidf_matrix
+
+    def _build_vectors(self, tfidf_matrix):
+        """
+        The method to bind all documents to their row of the tf-idf matrix.
+
+        Parameters
+        ----------
+        tfidf_matrix : TfidfMatrix
+            The tf-idf matrix of the corpus.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__tfidf_matrix = tfidf_matrix
+
+    def _get(self, row, field):
+        """
+        The method to get a field of the document of a row.
+
+        Parameters
+        ----------
+        row : int
+            The row.
+        field : string
+            The field: doc_id, title, path, size, mtime, content_hash or content.
+
+        Returns
+        -------
+        object
+            The value of the field, or None.
+
+        """
+        if field == 'doc_id':
+            return self.__get_string(self.__doc_ids, row)
+        elif field == 'title':
+            return self.__get_string(self.__titles, row)
+        elif field == 'path':
+            path = self.__get_string(self.__paths, row)
+            return path if path != '' else None
+        elif field == 'size':
+            size = self.__sizes[row]
+            return size if size >= 0 else None
+        elif field == 'mtime':
+            mtime = self.__mtimes[row]
+            return mtime if not math.isnan(mtime) else None
+        elif field == 'content_hash':
+            if not self.__hashed[row]:
+                return None
+            return self.__content_hashes[row * self.HASH_SIZE:(row + 1) * self.HASH_SIZE].hex()
+        elif field == 'content':
+            return self.__contents.get(row)
+        raise KeyError(field)
+
+    def _set(self, row, field, value):
+        """
+        The method to set a field of the document of a row.
+        Only the file size, the modification time, the content hash and the content can be changed.
+
+        Parameters
+        ----------
+        row : int
+            The row.
+        field : string
+            The field: size, mtime, content_hash or content.
+        value : object
+            The value of the field, or None.
+
+        Returns
+        -------
+        None.
+
+        """
+        if field == 'size':
+            self.__sizes[row] = -1 if value is None else value
+        elif field == 'mtime':
+            self.__mtimes[row] = math.nan if value is None else value
+        elif field == 'content_hash':
+            self.__set_content_hash(row, value)
+        elif field == 'content':
+            if value is None:
+                self.__contents.pop(row, None)
+            else:
+                self.__contents[row] = value
+        else:
+            raise KeyError(field)
+
+    def _get_vector(self, row):
+        """
+        The method to get the vector of the document of a row.
+
+        Parameters
+        ----------
+        row : int
+            The row.
+
+        Returns
+        -------
+        csr_matrix
+            The vector, written as a 1 x terms sparse matrix.
+
+        """
+        return self.__tfidf_matrix._get_vector(self._get(row, 'doc_id'))
+
+    def _get_manifest(self):
+        """
+        The method to get the metadata of each documents, to be saved along with an index.
+
+        Returns
+        -------
+        list
+            The id, title, file path, file size, modification time and content hash of each documents.
+            Written as [[doc_id1, title1, path1, size1, mtime1, hash1], [doc_id2, title2, path2, size2, mtime2, hash2], etc.].
+
+        """
+        fields = ('doc_id', 'title', 'path', 'size', 'mtime', 'content_hash')
+        return [[self._get(row, field) for field in fields] for row in range(0, self.__length)]
+
+    @staticmethod
+    def _from_documents(documents):
+        """
+        The method to build a store from documents, e.g. documents of several stores.
+        Each given document becomes a view of the new store, so changes made through it (e.g. while indexing) are kept by the new store.
+
+        Parameters
+        ----------
+        documents : list
+            The list of documents.
+
+        Returns
+        -------
+        store : CorpusStore
+            The store, with a row for each documents in the same order.
+
+        """
+        documents = list(documents)
+        store = CorpusStore([doc.doc_id for doc in documents], [doc.title for doc in documents], [doc.path for doc in documents],
+                            [doc.size for doc in documents], [doc.mtime for doc in documents], [doc.content_hash for doc in documents])
+        for row, document in enumerate(documents):
+            if document.content is not None:
+                store._set(row, 'content', document.content)
+            document._bind(store, row)
+        return store
+
+    def __set_content_hash(self, row, content_hash):
+        """
+        The method to set the content hash of the document of a row.
+
+        Parameters
+        ----------
+        row : int
+            The row.
+        content_hash : string
+            The hash, written as a hexadecimal string of HASH_SIZE bytes, or None.
+
+        Raises
+        ------
+        ValueError
+            If the hash is not a hexadecimal string of HASH_SIZE bytes.
+
+        Returns
+        -------
+        None.
+
+        """
+        if content_hash is None:
+            self.__hashed[row] = 0
+            return
+        digest = bytes.fromhex(content_hash)
+        if len(digest) != self.HASH_SIZE:
+            raise ValueError('Content hash must be ' + str(self.HASH_SIZE) + ' bytes long.')
+        self.__content_hashes[row * self.HASH_SIZE:(row + 1) * self.HASH_SIZE] = digest
+        self.__hashed[row] = 1
+
+    @staticmethod
+    def __pack(strings):
+        """
+        The method to concatenate a column of strings, recording the offset of each strings.
+
+        Parameters
+        ----------
+        strings : list
+            The list of strings, where None is stored as an empty string.
+
+        Returns
+        -------
+        text : string
+            The concatenated strings.
+        offsets : array
+            The offset of each strings, followed by the length of the text.
+
+        """
+        strings = ['' if string is None else string for string in strings]
+        offsets = array('q', [0])
+        total = 0
+        for string in strings:
+            total += len(string)
+            offsets.append(total)
+        return ''.join(strings), offsets
+
+    @staticmethod
+    def __get_string(column, row):
+        """
+        The method to get the string of a row from a column.
+
+        Parameters
+        ----------
+        column : tuple
+            The concatenated strings and their offsets.
+        row : int
+            The row.
+
+        Returns
+        -------
+        string
+            The string.
+
+        """
+        text, offsets = column
+        return text[offsets[row]:offsets[row + 1]]
+
+    @staticmethod
+    def __unpack(column):
+        """
+        The method to get all strings of a column.
+
+        Parameters
+        ----------
+        column : tuple
+            The concatenated strings and their offsets.
+
+        Returns
+        -------
+        list
+            The list of strings.
+
+        """
+        text, offsets = column
+        return [text[offsets[row]:offsets[row + 1]] for row in range(0, len(offsets) - 1)]
\ No newline at end of file
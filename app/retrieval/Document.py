@@ -1,13 +1,14 @@
 
-from scipy.spatial.distance import cosine
-
-import math
-
 class Document:
     
-    def __init__(self, doc_id, title, content):
+    # A document is a view of a row of a corpus store, so it only keeps the store and the row.
+    # A document created on its own keeps its fields in a lightweight row, until it is added to the store of a corpus.
+    __slots__ = ('__store', '__row')
+    
+    def __init__(self, doc_id, title, content=None, path=None, size=None, mtime=None):
         """
         The constructor for Document class.
+        The document keeps its own fields, until it is added to the store of a corpus (with CorpusStore._from_documents).
 
         Parameters
         ----------
@@ -15,17 +16,63 @@ class Document:
             The document's id.
         title : string
             The document's title.
-        content : string
-            The document's content.
+        content : string, optional
+            The document's content. The default is None (the content is read later from the file path).
+        path : string, optional
+            The document's file path. The default is None.
+        size : int, optional
+            The document's file size (in bytes) when it was listed. The default is None.
+        mtime : float, optional
+            The document's file modification time when it was listed. The default is None.
 
         Returns
         -------
         None.
 
         """
-        self.__doc_id = doc_id
-        self.__title = title
-        self.__content = content
+        self.__store = _DocumentFields(doc_id, title, content, path, size, mtime)
+        self.__row = 0
+    
+    @staticmethod
+    def _view(store, row):
+        """
+        The method to get a view of a row of a corpus store.
+
+        Parameters
+        ----------
+        store : CorpusStore
+            The corpus store.
+        row : int
+            The row.
+
+        Returns
+        -------
+        document : Document
+            The document.
+
+        """
+        document = Document.__new__(Document)
+        document._bind(store, row)
+        return document
+    
+    def _bind(self, store, row):
+        """
+        The method to make the document a view of a row of a corpus store.
+
+        Parameters
+        ----------
+        store : CorpusStore
+            The corpus store.
+        row : int
+            The row.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__store = store
+        self.__row = row
     
     @property
     def doc_id(self):
@@ -38,7 +85,7 @@ class Document:
             The document's id.
 
         """
-        return self.__doc_id
+        return self.__store._get(self.__row, 'doc_id')
     
     @property
     def title(self):
@@ -51,7 +98,7 @@ class Document:
             The document's title.
 
         """
-        return self.__title
+        return self.__store._get(self.__row, 'title')
     
     @property
     def content(self):
@@ -64,7 +111,24 @@ class Document:
             The document's content.
 
         """
-        return self.__content
+        return self.__store._get(self.__row, 'content')
+    
+    @content.setter
+    def content(self, content):
+        """
+        The method to set the content of document.
+
+        Parameters
+        ----------
+        content : string
+            The document's content.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__store._set(self.__row, 'content', content)
     
     @content.deleter
     def content(self):
@@ -76,56 +140,160 @@ class Document:
         None.
 
         """
-        del self.__content
+        self.__store._set(self.__row, 'content', None)
+    
+    @property
+    def path(self):
+        """
+        The method to get the file path of document.
+
+        Returns
+        -------
+        string
+            The document's file path, or None.
+
+        """
+        return self.__store._get(self.__row, 'path')
+    
+    @property
+    def size(self):
+        """
+        The method to get the file size of document, as recorded in the index manifest.
+
+        Returns
+        -------
+        int
+            The document's file size (in bytes), or None.
+
+        """
+        return self.__store._get(self.__row, 'size')
+    
+    @property
+    def mtime(self):
+        """
+        The method to get the file modification time of document, as recorded in the index manifest.
+
+        Returns
+        -------
+        float
+            The document's file modification time, or None.
+
+        """
+        return self.__store._get(self.__row, 'mtime')
+    
+    def _set_status(self, size, mtime):
+        """
+        The method to set the file size and modification time of document.
+
+        Parameters
+        ----------
+        size : int
+            The document's file size (in bytes).
+        mtime : float
+            The document's file modification time.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__store._set(self.__row, 'size', size)
+        self.__store._set(self.__row, 'mtime', mtime)
+    
+    @property
+    def content_hash(self):
+        """
+        The method to get the hash of document's file content, as recorded in the index manifest.
+
+        Returns
+        -------
+        string
+            The hash of document's file content, or None.
+
+        """
+        return self.__store._get(self.__row, 'content_hash')
+    
+    @content_hash.setter
+    def content_hash(self, content_hash):
+        """
+        The method to set the hash of document's file content.
+
+        Parameters
+        ----------
+        content_hash : string
+            The hash of document's file content.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__store._set(self.__row, 'content_hash', content_hash)
     
     @property
     def vector(self):
         """
         The method to get the vector as the document's representation.
+        The vector is a view into the document's row of the tf-idf matrix.
 
         Returns
         -------
-        list
-            The vector as the document's representation.
+        csr_matrix
+            The vector as the document's representation, written as a 1 x terms sparse matrix.
 
         """
-        return self.__vector
+        return self.__store._get_vector(self.__row)
     
-    def build_vector(self, index, dictionary, corpus_size):
+    def build_vector(self, tfidf_matrix):
         """
-        Build a vector as the document's representation.
+        Bind the document, along with all documents of its store (if it is added to the store of a corpus), to its row of the tf-idf matrix.
         Each dimension of the vector is a term's weight.
 
         Parameters
         ----------
-        index : dictionary
-            The inverted index.
-        dictionary : list
-            The list of terms.
-        corpus_size : int
-            The size of corpus.
+        tfidf_matrix : TfidfMatrix
+            The tf-idf matrix of the corpus.
 
         Returns
         -------
         None.
 
         """
-        self.__vector = []
-        for term in dictionary:
-            weight = 0
-            
-            # Check whether a term is contained in a document.
-            # If a term is not contained in a document, its weight equals to 0.
-            if self.__doc_id in index[term]:
-                # Calculate tf weight for a term.
-                tf = math.log10(index[term][self.__doc_id] + 1)
-                
-                # Calculate idf weight for a term.
-                idf = math.log10((corpus_size) / len(index[term]))
-                    
-                # Calculate tf-idf weight for a term.
-                weight = tf * idf
-            self.__vector.append(weight)
+        self.__store._build_vectors(tfidf_matrix)
+    
+    def __reduce__(self):
+        """
+        The method to get the document to be pickled, e.g. to be sent to a process.
+        The document is pickled on its own, without its store, and its tf-idf matrix is not pickled.
+
+        Returns
+        -------
+        tuple
+            The class, the arguments of its constructor and the content hash.
+
+        """
+        return (Document, (self.doc_id, self.title, self.content, self.path, self.size, self.mtime), self.content_hash)
+    
+    def __setstate__(self, state):
+        """
+        The method to restore the document's state from a pickle.
+        Documents pickled by older versions are pickled with all their attributes, and may have no content, file path and manifest stored.
+
+        Parameters
+        ----------
+        state : string or dictionary
+            The content hash, or the attributes of a document pickled by older versions.
+
+        Returns
+        -------
+        None.
+
+        """
+        if isinstance(state, dict):
+            self.__init__(state['_Document__doc_id'], state['_Document__title'], state.get('_Document__content'),
+                          state.get('_Document__path'), state.get('_Document__size'), state.get('_Document__mtime'))
+            state = state.get('_Document__content_hash')
+        self.content_hash = state
     
     def calc_distance(self, other_doc):
         """
@@ -144,10 +312,128 @@ class Document:
         """
         # Check whether the other document is the same document as this.
         # If two documents are equal, the distance is set to 0.
-        if other_doc.doc_id == self.__doc_id:
+        if other_doc.doc_id == self.doc_id:
             return 0
         
         # Get vectors of two documents and count distance between those two vectors.
-        vector_i = self.__vector
-        vector_j = other_doc.vector
-        return cosine(vector_i, vector_j)
\ No newline at end of file
+        # SciPy's spatial module is only imported here, since no other part of the application needs it.
+        from scipy.spatial.distance import cosine
+        vector_i = self.vector.toarray().ravel()
+        vector_j = other_doc.vector.toarray().ravel()
+        return cosine(vector_i, vector_j)
+
+class _DocumentFields:
+    
+    # The fields of a document which is not added to the store of a corpus yet, read and written as a row of a store.
+    FIELD_LIST = ('doc_id', 'title', 'path', 'size', 'mtime', 'content_hash', 'content')
+    __slots__ = FIELD_LIST + ('tfidf_matrix',)
+    
+    def __init__(self, doc_id, title, content=None, path=None, size=None, mtime=None):
+        """
+        The constructor for _DocumentFields class.
+
+        Parameters
+        ----------
+        doc_id : string
+            The document's id.
+        title : string
+            The document's title.
+        content : string, optional
+            The document's content. The default is None.
+        path : string, optional
+            The document's file path. The default is None.
+        size : int, optional
+            The document's file size (in bytes). The default is None.
+        mtime : float, optional
+            The document's file modification time. The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.doc_id = doc_id
+        self.title = title
+        self.content = content
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.content_hash = None
+        self.tfidf_matrix = None
+    
+    def _get(self, row, field):
+        """
+        The method to get a field of the document.
+
+        Parameters
+        ----------
+        row : int
+            The row, which is always 0.
+        field : string
+            The field: doc_id, title, path, size, mtime, content_hash or content.
+
+        Returns
+        -------
+        object
+            The value of the field, or None.
+
+        """
+        if field not in self.FIELD_LIST:
+            raise KeyError(field)
+        return getattr(self, field)
+    
+    def _set(self, row, field, value):
+        """
+        The method to set a field of the document.
+        Only the file size, the modification time, the content hash and the content can be changed.
+
+        Parameters
+        ----------
+        row : int
+            The row, which is always 0.
+        field : string
+            The field: size, mtime, content_hash or content.
+        value : object
+            The value of the field, or None.
+
+        Returns
+        -------
+        None.
+
+        """
+        if field not in ('size', 'mtime', 'content_hash', 'content'):
+            raise KeyError(field)
+        setattr(self, field, value)
+    
+    def _get_vector(self, row):
+        """
+        The method to get the vector of the document.
+
+        Parameters
+        ----------
+        row : int
+            The row, which is always 0.
+
+        Returns
+        -------
+        csr_matrix
+            The vector, written as a 1 x terms sparse matrix.
+
+        """
+        return self.tfidf_matrix._get_vector(self.doc_id)
+    
+    def _build_vectors(self, tfidf_matrix):
+        """
+        The method to bind the document to its row of the tf-idf matrix.
+
+        Parameters
+        ----------
+        tfidf_matrix : TfidfMatrix
+            The tf-idf matrix of the corpus.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.tfidf_matrix = tfidf_matrix
\ No newline at end of file
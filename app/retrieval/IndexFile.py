@@ -0,0 +1,372 @@
+
+from retrieval.CorpusStore import CorpusStore
+from retrieval.InvertedIndex import InvertedIndex
+from retrieval.MappedInvertedIndex import MappedInvertedIndex
+from retrieval.TfidfMatrix import TfidfMatrix
+from retrieval.VocabularyPruner import VocabularyPruner
+from clustering.DimensionReducer import DimensionReducer
+from clustering.DuplicateDetector import DuplicateDetector
+
+from scipy.sparse import csr_matrix
+
+import os
+import json
+import pickle
+import struct
+import numpy as np
+
+class IndexFile:
+
+    # The file starts with a prefix (magic number, format version and header length), followed by a JSON header
+    # (metadata, terms, documents and array descriptions) and the arrays, each aligned to ALIGNMENT bytes.
+    # Version 2 adds the manifest (file size, modification time and content hash) of each documents.
+    # Version 3 adds the pruning option, and the columns of the tf-idf matrix when the vocabulary is pruned.
+    # Version 4 adds the reduction option.
+    # Version 5 adds the detection option of near-duplicate documents.
+    MAGIC = b'ADCINDEX'
+    VERSION = 5
+    PREFIX = struct.Struct('<8sIQ')
+    ALIGNMENT = 64
+
+    def __init__(self, inverted_index, corpus, folder_path, preprocessor_option, tfidf_matrix=None, pruner=None, reducer=None, detector=None):
+        """
+        The constructor for IndexFile class.
+
+        Parameters
+        ----------
+        inverted_index : InvertedIndex
+            The inverted index.
+        corpus : CorpusStore
+            The store of documents.
+        folder_path : string
+            The folder path of corpus.
+        preprocessor_option : list
+            The preprocessor option.
+        tfidf_matrix : TfidfMatrix, optional
+            The tf-idf matrix of the corpus. The default is None.
+        pruner : VocabularyPruner, optional
+            The pruner of the vocabulary the tf-idf matrix was built with. The default is None (all terms are kept).
+        reducer : DimensionReducer, optional
+            The reducer of the tf-idf rows used for clustering. The default is None (distances over all terms).
+        detector : DuplicateDetector, optional
+            The detector of near-duplicate documents used for clustering. The default is None (no collapsing).
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__inverted_index = inverted_index
+        self.__corpus = corpus
+        self.__folder_path = folder_path
+        self.__preprocessor_option = list(preprocessor_option)
+        self.__tfidf_matrix = tfidf_matrix
+        self.__pruner = pruner
+        self.__reducer = reducer
+        self.__detector = detector
+
+    @property
+    def inverted_index(self):
+        """
+        The method to get the inverted index.
+
+        Returns
+        -------
+        InvertedIndex
+            The inverted index, or a read-only MappedInvertedIndex if it was loaded from an index file.
+
+        """
+        return self.__inverted_index
+
+    @property
+    def corpus(self):
+        """
+        The method to get the corpus.
+
+        Returns
+        -------
+        CorpusStore
+            The store of documents.
+
+        """
+        return self.__corpus
+
+    @property
+    def folder_path(self):
+        """
+        The method to get the folder path of corpus.
+
+        Returns
+        -------
+        string
+            The folder path.
+
+        """
+        return self.__folder_path
+
+    @property
+    def preprocessor_option(self):
+        """
+        The method to get the preprocessor option.
+
+        Returns
+        -------
+        list
+            The preprocessor option.
+
+        """
+        return self.__preprocessor_option
+
+    @property
+    def tfidf_matrix(self):
+        """
+        The method to get the tf-idf matrix.
+
+        Returns
+        -------
+        TfidfMatrix
+            The tf-idf matrix of the corpus, or None if it was not saved.
+
+        """
+        return self.__tfidf_matrix
+
+    @property
+    def pruner(self):
+        """
+        The method to get the pruner of the vocabulary.
+
+        Returns
+        -------
+        VocabularyPruner
+            The pruner the tf-idf matrix was built with, or None if all terms are kept.
+
+        """
+        return self.__pruner
+
+    @property
+    def reducer(self):
+        """
+        The method to get the reducer of the tf-idf rows.
+
+        Returns
+        -------
+        DimensionReducer
+            The reducer used for clustering, or None if distances are calculated over all terms.
+
+        """
+        return self.__reducer
+
+    @property
+    def detector(self):
+        """
+        The method to get the detector of near-duplicate documents.
+
+        Returns
+        -------
+        DuplicateDetector
+            The detector used for clustering, or None if near-duplicates are not collapsed.
+
+        """
+        return self.__detector
+
+    def _save(self, path):
+        """
+        The method to save the index as a binary file.
+        Postings are stored as integer arrays (document numbers and frequencies) grouped by term.
+
+        Parameters
+        ----------
+        path : string
+            The file path.
+
+        Raises
+        ------
+        ValueError
+            If the file path is empty.
+        PermissionError
+            If the file cannot be replaced, e.g. on Windows, while it is memory-mapped by the loaded index.
+
+        Returns
+        -------
+        None.
+
+        """
+        if path == '':
+            raise ValueError('There is no file path to save the index to.')
+        doc_ids = self.__corpus.doc_ids
+        doc_numbers = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+
+        # Store terms sorted as the tf-idf matrix columns are, so the loaded index is already sorted.
+        terms = self.__inverted_index.sorted_terms
+
+        # Map the document numbers of the index to the document numbers of the file.
+        doc_rows = np.array([doc_numbers.get(doc_id, -1) for doc_id in self.__inverted_index.doc_ids], dtype=np.int32)
+
+        # Build the posting arrays, grouped by term.
+        docs, freqs, lengths = self.__inverted_index._join_postings(terms)
+        term_offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        term_offsets[1:] = np.cumsum(lengths)
+
+        arrays = {}
+        arrays['term_offsets'] = term_offsets
+        arrays['posting_docs'] = doc_rows[docs]
+        arrays['posting_freqs'] = freqs.astype(np.int32)
+        if self.__tfidf_matrix is not None:
+            matrix = self.__tfidf_matrix.matrix
+            arrays['tfidf_indptr'] = matrix.indptr.astype(np.int64)
+            arrays['tfidf_indices'] = matrix.indices.astype(np.int32)
+            arrays['tfidf_data'] = matrix.data.astype(np.float64)
+
+            # If the vocabulary is pruned, store the term number of each columns.
+            if len(self.__tfidf_matrix.terms) != len(terms):
+                term_numbers = {term: i for i, term in enumerate(terms)}
+                arrays['tfidf_columns'] = np.array([term_numbers[term] for term in self.__tfidf_matrix.terms], dtype=np.int32)
+
+        # Describe each arrays with its offset from the start of the data section.
+        array_list = {}
+        offset = 0
+        for name, array in arrays.items():
+            array_list[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+            offset = self.__align(offset + array.nbytes)
+
+        header = {}
+        header['folder_path'] = self.__folder_path
+        header['preprocessor_option'] = [bool(option) for option in self.__preprocessor_option]
+        header['terms'] = terms
+        header['documents'] = self.__corpus._get_manifest()
+        header['tfidf_shape'] = list(self.__tfidf_matrix.matrix.shape) if self.__tfidf_matrix is not None else None
+        header['pruning_option'] = self.__pruner.option if self.__pruner is not None else None
+        header['reduction_option'] = self.__reducer.option if self.__reducer is not None else None
+        header['detection_option'] = self.__detector.option if self.__detector is not None else None
+        header['arrays'] = array_list
+        encoded_header = json.dumps(header, ensure_ascii=False).encode('utf-8')
+
+        # Write into a temporary file first, since the saved file may be memory-mapped by a loaded index.
+        temporary_path = path + '.tmp'
+        with open(temporary_path, 'wb') as handle:
+            handle.write(self.PREFIX.pack(self.MAGIC, self.VERSION, len(encoded_header)))
+            handle.write(encoded_header)
+            data_start = self.__align(self.PREFIX.size + len(encoded_header))
+            for name, array in arrays.items():
+                handle.write(b'\0' * (data_start + array_list[name]['offset'] - handle.tell()))
+                handle.write(array.tobytes())
+
+        # Some systems (e.g. Windows) do not replace a file which is memory-mapped, so the temporary file is removed instead.
+        try:
+            os.replace(temporary_path, path)
+        except PermissionError as error:
+            os.remove(temporary_path)
+            raise PermissionError('The index file ' + path + ' is in use (e.g. it is the loaded index), so it cannot be replaced. '
+                                  + 'Save the index under another name.') from error
+
+    @staticmethod
+    def _load(path):
+        """
+        The method to load an index file.
+        Arrays are memory-mapped, so the index is loaded without reading all postings.
+        Index files saved as pickle files by older versions are loaded as well.
+
+        Parameters
+        ----------
+        path : string
+            The file path.
+
+        Raises
+        ------
+        ValueError
+            If the file loaded is not an index file.
+
+        Returns
+        -------
+        IndexFile
+            The loaded index.
+
+        """
+        with open(path, 'rb') as handle:
+            prefix = handle.read(IndexFile.PREFIX.size)
+            if len(prefix) < IndexFile.PREFIX.size or not prefix.startswith(IndexFile.MAGIC):
+                handle.seek(0)
+                return IndexFile.__load_pickle(handle)
+            magic, version, header_length = IndexFile.PREFIX.unpack(prefix)
+            if version > IndexFile.VERSION:
+                raise ValueError('Index file version ' + str(version) + ' is not supported.')
+            header = json.loads(handle.read(header_length).decode('utf-8'))
+
+        # Map the whole file once, and view each arrays from it.
+        buffer = np.memmap(path, dtype=np.uint8, mode='r')
+        data_start = IndexFile.__align(IndexFile.PREFIX.size + header_length)
+        arrays = {}
+        for name, description in header['arrays'].items():
+            dtype = np.dtype(description['dtype'])
+            start = data_start + description['offset']
+            size = int(np.prod(description['shape'])) * dtype.itemsize
+            arrays[name] = buffer[start:start + size].view(dtype).reshape(description['shape'])
+
+        # Restore the manifest of each documents, if the file has one, into the columns of the store.
+        documents = header['documents']
+        doc_ids = [entry[0] for entry in documents]
+        manifest = all(len(entry) == 6 for entry in documents)
+        corpus = CorpusStore(doc_ids, [entry[1] for entry in documents], [entry[2] for entry in documents],
+                             [entry[3] for entry in documents] if manifest else None, [entry[4] for entry in documents] if manifest else None,
+                             [entry[5] for entry in documents] if manifest else None)
+        inverted_index = MappedInvertedIndex(header['terms'], doc_ids, arrays['term_offsets'], arrays['posting_docs'], arrays['posting_freqs'])
+
+        tfidf_matrix = None
+        if header['tfidf_shape'] is not None:
+            matrix = csr_matrix((arrays['tfidf_data'], arrays['tfidf_indices'], arrays['tfidf_indptr']), shape=tuple(header['tfidf_shape']), copy=False)
+            terms = [header['terms'][i] for i in arrays['tfidf_columns'].tolist()] if 'tfidf_columns' in arrays else None
+            tfidf_matrix = TfidfMatrix(inverted_index, doc_ids, matrix, terms)
+        pruner = VocabularyPruner._from_option(header.get('pruning_option'))
+        reducer = DimensionReducer._from_option(header.get('reduction_option'))
+        detector = DuplicateDetector._from_option(header.get('detection_option'))
+        return IndexFile(inverted_index, corpus, header['folder_path'], header['preprocessor_option'], tfidf_matrix, pruner, reducer, detector)
+
+    @staticmethod
+    def __load_pickle(handle):
+        """
+        The method to load an index saved as a pickle file.
+
+        Parameters
+        ----------
+        handle : file
+            The opened file.
+
+        Raises
+        ------
+        ValueError
+            If the file loaded is not an index file.
+
+        Returns
+        -------
+        IndexFile
+            The loaded index.
+
+        """
+        try:
+            data = pickle.load(handle)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, IndexError) as error:
+            raise ValueError('File loaded does not match.') from error
+
+        # Check whether the file loaded is the correct index file.
+        if isinstance(data, dict) and 'index' in data and 'metadata' in data and 'folder_path' in data['metadata'] and 'corpus' in data['metadata'] and 'preprocessor_option' in data['metadata']:
+            metadata = data['metadata']
+            return IndexFile(InvertedIndex._from_mapping(data['index']), CorpusStore._from_documents(metadata['corpus']), metadata['folder_path'], metadata['preprocessor_option'])
+        raise ValueError('File loaded does not match.')
+
+    @staticmethod
+    def __align(offset):
+        """
+        The method to round an offset up to the alignment of arrays.
+
+        Parameters
+        ----------
+        offset : int
+            The offset.
+
+        Returns
+        -------
+        int
+            The aligned offset.
+
+        """
+        return -(-offset // IndexFile.ALIGNMENT) * IndexFile.ALIGNMENT
\ No newline at end of file
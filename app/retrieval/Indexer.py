@@ -1,25 +1,43 @@
 
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import PorterStemmer
+from retrieval.PreprocessingPipeline import PreprocessingPipeline
+from retrieval.CorpusReader import CorpusReader
+from retrieval.InvertedIndex import InvertedIndex
+from pipeline.StageTimer import StageTimer
+
+import os
+import math
+import heapq
+from collections import Counter, deque
+from multiprocessing import Pool
 
 class Indexer:
     
-    def __init__(self, inverted_index=None):
+    def __init__(self, inverted_index=None, stem_cache=None, timer=None):
         """
         The constructor for Indexer class.
         
         Parameters
         ----------
-        inverted_index : dict
-            The inverted index. The default is None.
+        inverted_index : InvertedIndex
+            The inverted index. The default is None (a new index).
+        stem_cache : StemCache, optional
+            The cache of stemmed tokens. The default is None.
+        timer : StageTimer, optional
+            The timer measuring the reading, preprocessing and posting stages. The default is None (a new timer).
 
         Returns
         -------
         None.
 
         """
-        self.__inverted_index = {} if inverted_index is None else inverted_index
+        self.__inverted_index = InvertedIndex() if inverted_index is None else inverted_index
+        
+        # A read-only index (e.g. loaded from an index file) or a dictionary is copied into an InvertedIndex, so it can be updated.
+        if not isinstance(self.__inverted_index, InvertedIndex):
+            self.__inverted_index = InvertedIndex._from_mapping(self.__inverted_index)
+        self.__stem_cache = stem_cache
+        self.__timer = timer if timer is not None else StageTimer()
+        self.__pipeline = None
         
     @property
     def inverted_index(self):
@@ -28,139 +46,26 @@ class Indexer:
 
         Returns
         -------
-        dictionary
-            The inverted index built.
-            Written as {term1: {doc1: freq, doc2: freq}, term2: {doc1: freq}, etc.}.
+        InvertedIndex
+            The inverted index built, with terms and documents interned as integers.
+            Read as {term1: {doc1: freq, doc2: freq}, term2: {doc1: freq}, etc.}.
 
         """
         return self.__inverted_index
     
-    class Tokenizer:
-        
-        @staticmethod
-        def _tokenize(sequence):
-            """
-            The method to tokenize a character sequence into a list of tokens.
-
-            Parameters
-            ----------
-            sequence : string
-                The character sequence to be tokenized.
-
-            Returns
-            -------
-            result : list
-                The list of tokens.
-
-            """
-            return word_tokenize(sequence)
-        
-    class LinguisticPreprocessor:
-        
-        @staticmethod
-        def _remove_stopwords(token_list):
-            """
-            The method to remove stop words from a list of tokens.
-            Extended stop list are taken from Rank NL (https://www.ranks.nl/stopwords).
-            Language supported is English.
-
-            Parameters
-            ----------
-            token_list : list
-                The list of tokens.
-
-            Returns
-            -------
-            result : list
-                The list of terms (list of tokens without stop words).
-
-            """
-            stop_list = stopwords.words('english')
-            extended_stop_list = ['a', 'able', 'about', 'above', 'abst', 'accordance', 'according', 'accordingly', 'across', 'act', 'actually', 'added', 'adj', 'affected', 'affecting', 'affects', 'after', 'afterwards', 'again', 'against', 'ah', 'all', 'almost', 'alone', 'along', 'already', 'also', 'although', 'always', 'am', 'among', 'amongst', 'an', 'and', 'announce', 'another', 'any', 'anybody', 'anyhow', 'anymore', 'anyone', 'anything', 'anyway', 'anyways', 'anywhere', 'apparently', 'approximately', 'are', 'aren', 'arent', 'arise', 'around', 'as', 'aside', 'ask', 'asking', 'at', 'auth', 'available', 'away', 'awfully', 'b', 'back', 'be', 'became', 'because', 'become', 'becomes', 'becoming', 'been', 'before', 'beforehand', 'begin', 'beginning', 'beginnings', 'begins', 'behind', 'being', 'believe', 'below', 'beside', 'besides', 'between', 'beyond', 'biol', 'both', 'brief', 'briefly', 'but', 'by', 'c', 'ca', 'came', 'can', 'cannot', "can't", 'cause', 'causes', 'certain', 'certainly', 'co', 'com', 'come', 'comes', 'contain', 'containing', 'contains', 'could', 'couldnt', 'd', 'date', 'did', "didn't", 'different', 'do', 'does', "doesn't", 'doing', 'done', "don't", 'down', 'downwards', 'due', 'during', 'e', 'each', 'ed', 'edu', 'effect', 'eg', 'eight', 'eighty', 'either', 'else', 'elsewhere', 'end', 'ending', 'enough', 'especially', 'et', 'et-al', 'etc', 'even', 'ever', 'every', 'everybody', 'everyone', 'everything', 'everywhere', 'ex', 'except', 'f', 'far', 'few', 'ff', 'fifth', 'first', 'five', 'fix', 'followed', 'following', 'follows', 'for', 'former', 'formerly', 'forth', 'found', 'four', 'from', 'further', 'furthermore', 'g', 'gave', 'get', 'gets', 'getting', 'give', 'given', 'gives', 'giving', 'go', 'goes', 'gone', 'got', 'gotten', 'h', 'had', 'happens', 'hardly', 'has', "hasn't", 'have', "haven't", 'having', 'he', 'hed', 'hence', 'her', 'here', 'hereafter', 'hereby', 'herein', 'heres', 'hereupon', 'hers', 'herself', 'hes', 'hi', 'hid', 'him', 'himself', 'his', 'hither', 'home', 'how', 'howbeit', 'however', 'hundred', 'i', 'id', 'ie', 'if', "i'll", 'im', 'immediate', 'immediately', 'importance', 'important', 'in', 'inc', 'indeed', 'index', 'information', 'instead', 'into', 'invention', 'inward', 'is', "isn't", 'it', 'itd', "it'll", 'its', 'itself', "i've", 'j', 'just', 'k', 'keep\tkeeps', 'kept', 'kg', 'km', 'know', 'known', 'knows', 'l', 'largely', 'last', 'lately', 'later', 'latter', 'latterly', 'least', 'less', 'lest', 'let', 'lets', 'like', 'liked', 'likely', 'line', 'little', "'ll", 'look', 'looking', 'looks', 'ltd', 'm', 'made', 'mainly', 'make', 'makes', 'many', 'may', 'maybe', 'me', 'mean', 'means', 'meantime', 'meanwhile', 'merely', 'mg', 'might', 'million', 'miss', 'ml', 'more', 'moreover', 'most', 'mostly', 'mr', 'mrs', 'much', 'mug', 'must', 'my', 'myself', 'n', 'na', 'name', 'namely', 'nay', 'nd', 'near', 'nearly', 'necessarily', 'necessary', 'need', 'needs', 'neither', 'never', 'nevertheless', 'new', 'next', 'nine', 'ninety', 'no', 'nobody', 'non', 'none', 'nonetheless', 'noone', 'nor', 'normally', 'nos', 'not', 'noted', 'nothing', 'now', 'nowhere', 'o', 'obtain', 'obtained', 'obviously', 'of', 'off', 'often', 'oh', 'ok', 'okay', 'old', 'omitted', 'on', 'once', 'one', 'ones', 'only', 'onto', 'or', 'ord', 'other', 'others', 'otherwise', 'ought', 'our', 'ours', 'ourselves', 'out', 'outside', 'over', 'overall', 'owing', 'own', 'p', 'page', 'pages', 'part', 'particular', 'particularly', 'past', 'per', 'perhaps', 'placed', 'please', 'plus', 'poorly', 'possible', 'possibly', 'potentially', 'pp', 'predominantly', 'present', 'previously', 'primarily', 'probably', 'promptly', 'proud', 'provides', 'put', 'q', 'que', 'quickly', 'quite', 'qv', 'r', 'ran', 'rather', 'rd', 're', 'readily', 'really', 'recent', 'recently', 'ref', 'refs', 'regarding', 'regardless', 'regards', 'related', 'relatively', 'research', 'respectively', 'resulted', 'resulting', 'results', 'right', 'run', 's', 'said', 'same', 'saw', 'say', 'saying', 'says', 'sec', 'section', 'see', 'seeing', 'seem', 'seemed', 'seeming', 'seems', 'seen', 'self', 'selves', 'sent', 'seven', 'several', 'shall', 'she', 'shed', "she'll", 'shes', 'should', "shouldn't", 'show', 'showed', 'shown', 'showns', 'shows', 'significant', 'significantly', 'similar', 'similarly', 'since', 'six', 'slightly', 'so', 'some', 'somebody', 'somehow', 'someone', 'somethan', 'something', 'sometime', 'sometimes', 'somewhat', 'somewhere', 'soon', 'sorry', 'specifically', 'specified', 'specify', 'specifying', 'still', 'stop', 'strongly', 'sub', 'substantially', 'successfully', 'such', 'sufficiently', 'suggest', 'sup', 'sure\tt', 'take', 'taken', 'taking', 'tell', 'tends', 'th', 'than', 'thank', 'thanks', 'thanx', 'that', "that'll", 'thats', "that've", 'the', 'their', 'theirs', 'them', 'themselves', 'then', 'thence', 'there', 'thereafter', 'thereby', 'thered', 'therefore', 'therein', "there'll", 'thereof', 'therere', 'theres', 'thereto', 'thereupon', "there've", 'these', 'they', 'theyd', "they'll", 'theyre', "they've", 'think', 'this', 'those', 'thou', 'though', 'thoughh', 'thousand', 'throug', 'through', 'throughout', 'thru', 'thus', 'til', 'tip', 'to', 'together', 'too', 'took', 'toward', 'towards', 'tried', 'tries', 'truly', 'try', 'trying', 'ts', 'twice', 'two', 'u', 'un', 'under', 'unfortunately', 'unless', 'unlike', 'unlikely', 'until', 'unto', 'up', 'upon', 'ups', 'us', 'use', 'used', 'useful', 'usefully', 'usefulness', 'uses', 'using', 'usually', 'v', 'value', 'various', "'ve", 'very', 'via', 'viz', 'vol', 'vols', 'vs', 'w', 'want', 'wants', 'was', 'wasnt', 'way', 'we', 'wed', 'welcome', "we'll", 'went', 'were', 'werent', "we've", 'what', 'whatever', "what'll", 'whats', 'when', 'whence', 'whenever', 'where', 'whereafter', 'whereas', 'whereby', 'wherein', 'wheres', 'whereupon', 'wherever', 'whether', 'which', 'while', 'whim', 'whither', 'who', 'whod', 'whoever', 'whole', "who'll", 'whom', 'whomever', 'whos', 'whose', 'why', 'widely', 'willing', 'wish', 'with', 'within', 'without', 'wont', 'words', 'world', 'would', 'wouldnt', 'www', 'x', 'y', 'yes', 'yet', 'you', 'youd', "you'll", 'your', 'youre', 'yours', 'yourself', 'yourselves', "you've", 'z', 'zero']
-            result = []
-            for token in token_list:
-                # Check whether a token is a stop word or not.
-                # If a token is a stop word, the token will be removed.
-                if token not in stop_list and token not in extended_stop_list:
-                    result.append(token)
-            return result
-    
-        @staticmethod
-        def _stem(token_list):
-            """
-            The method to stem all tokens in a list of tokens.
-            Technique used is suffix-stripping technique, with Porter stemming algorithm.
-            Language supported is English.
-
-            Parameters
-            ----------
-            token_list : list
-                The list of tokens.
-
-            Returns
-            -------
-            result : list
-                The list of terms (list of stemmed tokens).
-
-            """
-            stemmer = PorterStemmer()
-            result = []
-            for token in token_list:
-                stemmed = stemmer.stem(token)
-                
-                # Return the stemmed token capitalized/uppered if the token is capitalized/uppered.
-                if token.isupper():    
-                    result.append(stemmed.upper())
-                elif token[0].isupper():
-                    result.append(stemmed.capitalize())
-                else:
-                    result.append(stemmed)
-            return result
-        
-        @staticmethod
-        def _case_fold(token_list):
-            """
-            The method to case fold all tokens in a list of tokens.
-            
-            Parameters
-            ----------
-            token_list : list
-                The list of tokens.
-
-            Returns
-            -------
-            result : list
-                The list of terms (list of lowered tokens).
-
-            """
-            result = []
-            for token in token_list:
-                result.append(token.lower())
-            return result
-        
-        @staticmethod
-        def _normalize(token_list):
-            """
-            The method to normalize all tokens in a list of tokens.
-
-            Parameters
-            ----------
-            token_list : list
-                The list of tokens.
-
-            Returns
-            -------
-            result : list
-                The list of terms (list of normalized tokens).
-
-            """
-            result = []
-            for token in token_list:
-                normalized_token = ''.join(char for char in token if char.isalpha())
-                if normalized_token != '':
-                    result.append(normalized_token)
-            return result
+    @property
+    def timer(self):
+        """
+        The method to get the timer measuring the stages of indexing.
 
+        Returns
+        -------
+        StageTimer
+            The timer.
+
+        """
+        return self.__timer
+    
     def index(self, document, stopwords_removal_option=True, stemming_option=True, case_folding_option=True, normalization_option=True):
         """
         The method to build an inverted index.
@@ -184,25 +89,254 @@ class Indexer:
         None.
 
         """
-        # Get the list of terms in a document.
+        # Count the frequency of each terms in a document and store them in the index.
         dictionary = self.__preprocess(document, stopwords_removal_option, stemming_option, case_folding_option, normalization_option)
-        
-        # Get the document's id.
-        doc_id = document.doc_id
-        for term in dictionary:
-            # Check whether a term is already stored in the index.
-            # If a term is not stored yet, the term will be stored as a new key in the index.
-            if term not in self.__inverted_index:
-                self.__inverted_index[term] = {}
-                
-            # Check whether the document is stored in the posting list.
-            # If the document is not stored yet, the frequency will be set to 1.
-            # Else, the frequency will be set to the previous frequency + 1.
-            self.__inverted_index[term][doc_id] = 1 if doc_id not in self.inverted_index[term] else self.__inverted_index[term][doc_id] + 1
+        with self.__timer._measure('posting'):
+            self.__inverted_index._add(document.doc_id, Counter(dictionary))
         
         # Delete the document's content (to save some space).
         del document.content
+    
+    def index_parallel(self, corpus, stopwords_removal_option=True, stemming_option=True, case_folding_option=True, normalization_option=True, processes=None, progress_callback=None, max_in_flight=1000):
+        """
+        The method to build an inverted index using a pool of processes.
+        Each process reads and preprocesses a chunk of documents and returns the term frequencies of each documents,
+        which are then merged into the inverted index.
+        The time spent by each processes in each stages is added to the timer, so the wall time of a stage may exceed the elapsed time.
+
+        Parameters
+        ----------
+        corpus : list
+            The list of documents.
+        stopwords_removal_option : boolean
+            The stopwords removal status (if true, stopwords removal step will be done). The default is True.
+        stemming_option : boolean
+            The stemming status (if true, stemming step will be done). The default is True.
+        case_folding_option : boolean
+            The case folding status (if true, case folding step will be done). The default is True.
+        normalization_option : boolean
+            The normalization status (if true, normalization step will be done). The default is True.
+        processes : int, optional
+            The number of processes. The default is None (the number of CPUs).
+        progress_callback : function, optional
+            The function called with the number of indexed documents and the corpus size after each chunk. The default is None.
+        max_in_flight : int, optional
+            The maximum number of documents sent to the pool and not merged yet. The default is 1000.
+
+        Returns
+        -------
+        None.
+
+        """
+        if processes is None:
+            processes = os.cpu_count() or 1
+        pipeline = self.__get_pipeline(stopwords_removal_option, stemming_option, case_folding_option, normalization_option)
         
+        # Split the corpus into chunks of balanced size.
+        # There are more chunks than processes, so that the progress can be reported more often,
+        # and chunks are small enough to keep a few of them in flight under the cap.
+        chunk_size = max(1, max_in_flight // (2 * processes))
+        chunk_queue = deque(self.__balance_chunks(corpus, max(processes * 4, math.ceil(len(corpus) / chunk_size))))
+        
+        indexed = 0
+        in_flight = 0
+        pending = deque()
+        # Each process receives the preprocessing pipeline once, when it is started.
+        with Pool(processes, initializer=Indexer._init_worker, initargs=(pipeline, True, self.__timer.detailed)) as pool:
+            while len(chunk_queue) > 0 or len(pending) > 0:
+                # Send chunks to the pool as long as the number of documents in flight stays under the cap.
+                while len(chunk_queue) > 0 and (len(pending) == 0 or in_flight + len(chunk_queue[0]) <= max_in_flight):
+                    chunk = chunk_queue.popleft()
+                    pending.append((chunk, pool.apply_async(Indexer._count_terms, (chunk,))))
+                    in_flight += len(chunk)
+                
+                # Wait for the oldest chunk and merge its result.
+                chunk, async_result = pending.popleft()
+                result, stemmed, stages = async_result.get()
+                in_flight -= len(chunk)
+                self.__timer._merge(stages)
+                
+                # Merge the tokens stemmed by the process into the cache.
+                if stemmed is not None:
+                    self.__stem_cache._merge(*stemmed)
+                with self.__timer._measure('posting'):
+                    for document, (doc_id, term_frequency, content_hash) in zip(chunk, result):
+                        self.__inverted_index._add(doc_id, term_frequency)
+                        document.content_hash = content_hash
+                        
+                        # Delete the document's content (to save some space).
+                        del document.content
+                indexed += len(chunk)
+                if progress_callback is not None:
+                    progress_callback(indexed, len(corpus))
+    
+    def _remove(self, doc_ids):
+        """
+        The method to retract all postings of documents from the inverted index.
+        Terms left without any posting are removed from the vocabulary of the index.
+
+        Parameters
+        ----------
+        doc_ids : list
+            The list of documents' id.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__inverted_index._remove(doc_ids)
+    
+    @staticmethod
+    def _init_worker(pipeline, timed=False, detailed=False):
+        """
+        The method to initialize a process of the pool with the preprocessing pipeline.
+
+        Parameters
+        ----------
+        pipeline : PreprocessingPipeline
+            The preprocessing pipeline.
+        timed : boolean, optional
+            The timing status (if true, the process measures the time spent in each stages). The default is False.
+        detailed : boolean, optional
+            The detailed timing status (if true, the steps of preprocessing are measured as separate stages). The default is False.
+
+        Returns
+        -------
+        None.
+
+        """
+        Indexer.__worker_pipeline = pipeline
+        Indexer.__worker_timer = StageTimer(detailed) if timed else None
+        
+        # Record the tokens cached by the process's copy of the cache, so only its own work is sent back.
+        if pipeline.stem_cache is not None:
+            pipeline.stem_cache._record()
+    
+    @staticmethod
+    def _count_terms(chunk):
+        """
+        The method to count the frequency of each terms in a chunk of documents.
+        This method is run by the processes of the pool.
+
+        Parameters
+        ----------
+        chunk : list
+            The chunk of documents.
+
+        Returns
+        -------
+        result : list
+            The list of each documents' id, its term frequencies and the hash of its file content.
+            Written as [(doc1, {term1: freq, term2: freq}, hash1), (doc2, {term1: freq}, hash2), etc.].
+        stemmed : tuple
+            The tokens stemmed by the process and its cache counters, or None if there is no cache.
+        stages : dictionary
+            The time spent by the process in each stages since the last chunk, or an empty dictionary if it is not timed.
+
+        """
+        pipeline = Indexer.__worker_pipeline
+        timer = Indexer.__worker_timer
+        result = []
+        for document in chunk:
+            # Read the document's content if it is not loaded yet.
+            if document.content is not None:
+                content = document.content
+            elif timer is not None:
+                with timer._measure('reading'):
+                    content = CorpusReader._load(document)
+            else:
+                content = CorpusReader._load(document)
+            result.append((document.doc_id, Counter(Indexer.__process(pipeline, content, timer)), document.content_hash))
+        stemmed = pipeline.stem_cache._drain() if pipeline.stem_cache is not None else None
+        return result, stemmed, timer._drain() if timer is not None else {}
+    
+    @staticmethod
+    def __process(pipeline, content, timer):
+        """
+        The method to get a list of terms in a document's content with the preprocessing pipeline.
+        Preprocessing is done in a single pass over the tokens and measured as one stage, unless the timer measures each of its steps.
+
+        Parameters
+        ----------
+        pipeline : PreprocessingPipeline
+            The preprocessing pipeline.
+        content : string
+            The document's content.
+        timer : StageTimer
+            The timer, or None if preprocessing is not measured.
+
+        Returns
+        -------
+        list
+            The list of terms in the document's content.
+
+        """
+        if timer is None:
+            return pipeline._process(content)
+        if timer.detailed:
+            return pipeline._process(content, timer)
+        with timer._measure('preprocessing'):
+            return pipeline._process(content)
+    
+    @staticmethod
+    def __balance_chunks(corpus, n):
+        """
+        The method to split a corpus into chunks of balanced size.
+        Each document, from the largest, is put into the currently smallest chunk.
+        The size of a document is the length of its content if it is loaded, else the size of its file.
+
+        Parameters
+        ----------
+        corpus : list
+            The list of documents.
+        n : int
+            The number of chunks.
+
+        Returns
+        -------
+        list
+            The list of chunks, without empty chunks.
+
+        """
+        def _get_size(document):
+            return len(document.content) if document.content is not None else os.path.getsize(document.path)
+        
+        chunk_list = [[] for i in range(0, max(1, min(n, len(corpus))))]
+        heap = [(0, i) for i in range(0, len(chunk_list))]
+        for size, document in sorted(((_get_size(document), document) for document in corpus), key=lambda item: item[0], reverse=True):
+            chunk_size, i = heapq.heappop(heap)
+            chunk_list[i].append(document)
+            heapq.heappush(heap, (chunk_size + size, i))
+        return [chunk for chunk in chunk_list if len(chunk) > 0]
+        
+    def __get_pipeline(self, stopwords_removal_option=True, stemming_option=True, case_folding_option=True, normalization_option=True):
+        """
+        The method to get the preprocessing pipeline for the preprocessor options.
+        The pipeline is only rebuilt when the options change.
+
+        Parameters
+        ----------
+        stopwords_removal_option : boolean
+            The stopwords removal status (if true, stopwords removal step will be done). The default is True.
+        stemming_option : boolean
+            The stemming status (if true, stemming step will be done). The default is True.
+        case_folding_option : boolean
+            The case folding status (if true, case folding step will be done). The default is True.
+        normalization_option : boolean
+            The normalization status (if true, normalization step will be done). The default is True.
+
+        Returns
+        -------
+        PreprocessingPipeline
+            The preprocessing pipeline.
+
+        """
+        option = (stopwords_removal_option, stemming_option, case_folding_option, normalization_option)
+        if self.__pipeline is None or self.__pipeline.option != option:
+            self.__pipeline = PreprocessingPipeline(*option, stem_cache=self.__stem_cache)
+        return self.__pipeline
+    
     def __preprocess(self, document, stopwords_removal_option=True, stemming_option=True, case_folding_option=True, normalization_option=True):
         """
         The method to get a list of terms in a document.
@@ -227,23 +361,11 @@ class Indexer:
             The list of terms in the document.
 
         """
-        # Do tokenization process.
-        token_list = self.Tokenizer._tokenize(document.content)
-        
-        # Do linguistic preprocessing (stop words removal, stemming, case folding and normalization).
-        dictionary = []
-        if stopwords_removal_option is True:
-            dictionary = self.LinguisticPreprocessor._remove_stopwords(token_list)
-        
-        if stemming_option is True:
-            dictionary = self.LinguisticPreprocessor._stem(token_list if dictionary == [] else dictionary)
+        # Read the document's content if it is not loaded yet.
+        content = document.content
+        if content is None:
+            with self.__timer._measure('reading'):
+                content = CorpusReader._load(document)
         
-        if case_folding_option is True:
-            dictionary = self.LinguisticPreprocessor._case_fold(token_list if dictionary == [] else dictionary)
-            
-        if normalization_option is True:
-            dictionary = self.LinguisticPreprocessor._normalize(token_list if dictionary == [] else dictionary)
-            
-        # Check if dictionary is empty.
-        # If it is not empty, return the dictionary. If it is empty, return token_list instead.
-        return dictionary if dictionary != [] else token_list
\ No newline at end of file
+        pipeline = self.__get_pipeline(stopwords_removal_option, stemming_option, case_folding_option, normalization_option)
+        return Indexer.__process(pipeline, content, self.__timer)
\ No newline at end of file
@@ -0,0 +1,339 @@
+
+from retrieval.MappedInvertedIndex import MappedInvertedIndex
+
+import numpy as np
+from array import array
+from itertools import compress
+from collections.abc import Mapping
+
+class InvertedIndex(Mapping):
+
+    def __init__(self):
+        """
+        The constructor for InvertedIndex class.
+        Terms and documents are interned as integers: each term has a term id and each document a document number, which never change.
+        The posting list of a term is stored as two parallel integer arrays, the document numbers and the frequencies.
+        Each document also keeps the list of its term ids, so its postings can be retracted without walking through every terms.
+        The index can still be read as {term1: {doc1: freq, doc2: freq}, term2: {doc1: freq}, etc.}.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__terms = []
+        self.__term_ids = {}
+        self.__doc_ids = []
+        self.__doc_numbers = {}
+        self.__posting_docs = []
+        self.__posting_freqs = []
+        self.__doc_terms = []
+
+        # The number of terms which have postings, and the sorted vocabulary, built on first use.
+        self.__size = 0
+        self.__sorted_terms = None
+
+    def __getitem__(self, term):
+        """
+        The method to get the posting list of a term.
+
+        Parameters
+        ----------
+        term : string
+            The term.
+
+        Raises
+        ------
+        KeyError
+            If the term has no postings.
+
+        Returns
+        -------
+        dictionary
+            The posting list, written as {doc1: freq, doc2: freq, etc.}.
+
+        """
+        docs, freqs = self._get_postings(term)
+        doc_ids = self.__doc_ids
+        return {doc_ids[doc_number]: freq for doc_number, freq in zip(docs, freqs)}
+
+    def __iter__(self):
+        """
+        The method to iterate over the terms which have postings, in the order of their term id.
+
+        Yields
+        ------
+        string
+            The term.
+
+        """
+        for term, docs in zip(self.__terms, self.__posting_docs):
+            if len(docs) > 0:
+                yield term
+
+    def __len__(self):
+        """
+        The method to get the number of terms which have postings.
+
+        Returns
+        -------
+        int
+            The number of terms.
+
+        """
+        return self.__size
+
+    def __contains__(self, term):
+        """
+        The method to check whether a term has postings in the index.
+
+        Parameters
+        ----------
+        term : string
+            The term.
+
+        Returns
+        -------
+        boolean
+            True if the term has postings.
+
+        """
+        term_id = self.__term_ids.get(term)
+        return term_id is not None and len(self.__posting_docs[term_id]) > 0
+
+    @property
+    def doc_ids(self):
+        """
+        The method to get the id of each documents, indexed by their document number.
+
+        Returns
+        -------
+        list
+            The list of documents' id, including documents whose postings were retracted.
+
+        """
+        return self.__doc_ids
+
+    @property
+    def sorted_terms(self):
+        """
+        The method to get the vocabulary, sorted case-insensitively as the columns of a tf-idf matrix.
+        The sorted vocabulary is cached until a term is added or removed.
+
+        Returns
+        -------
+        list
+            The sorted terms.
+
+        """
+        if self.__sorted_terms is None:
+            self.__sorted_terms = sorted(self, key=str.lower)
+        return self.__sorted_terms
+
+    def _get_postings(self, term):
+        """
+        The method to get the posting list of a term as integer arrays.
+        The arrays are those of the index, so they must not be changed.
+
+        Parameters
+        ----------
+        term : string
+            The term.
+
+        Raises
+        ------
+        KeyError
+            If the term has no postings.
+
+        Returns
+        -------
+        docs : array
+            The document number of each postings.
+        freqs : array
+            The frequency of each postings.
+
+        """
+        term_id = self.__term_ids[term]
+        docs = self.__posting_docs[term_id]
+        if len(docs) == 0:
+            raise KeyError(term)
+        return docs, self.__posting_freqs[term_id]
+
+    def _join_postings(self, terms):
+        """
+        The method to join the posting lists of terms into whole integer arrays, term after term.
+
+        Parameters
+        ----------
+        terms : list
+            The list of terms.
+
+        Raises
+        ------
+        KeyError
+            If a term has no postings.
+
+        Returns
+        -------
+        docs : array
+            The document number of each postings.
+        freqs : array
+            The frequency of each postings.
+        lengths : array
+            The number of postings of each terms.
+
+        """
+        term_ids, posting_docs, posting_freqs = self.__term_ids, self.__posting_docs, self.__posting_freqs
+        all_docs, all_freqs, lengths = array('i'), array('i'), []
+        for term in terms:
+            term_id = term_ids[term]
+            docs, freqs = posting_docs[term_id], posting_freqs[term_id]
+            if not docs:
+                raise KeyError(term)
+            all_docs.extend(docs)
+            all_freqs.extend(freqs)
+            lengths.append(len(docs))
+        return np.frombuffer(all_docs, dtype=np.intc), np.frombuffer(all_freqs, dtype=np.intc), np.array(lengths, dtype=np.int64)
+
+    def _add(self, doc_id, term_frequency):
+        """
+        The method to add the postings of a document, from the frequency of each of its terms.
+        If the document is already indexed, the frequencies are added to its previous ones.
+
+        Parameters
+        ----------
+        doc_id : string
+            The document's id.
+        term_frequency : dictionary
+            The frequency of each terms in the document.
+
+        Returns
+        -------
+        None.
+
+        """
+        doc_number = self.__get_doc_number(doc_id)
+        doc_terms = self.__doc_terms[doc_number]
+        previous_terms = set(doc_terms) if len(doc_terms) > 0 else ()
+        term_ids, posting_docs, posting_freqs = self.__term_ids, self.__posting_docs, self.__posting_freqs
+        for term, freq in term_frequency.items():
+            term_id = term_ids.get(term)
+            if term_id is None:
+                term_id = len(self.__terms)
+                term_ids[term] = term_id
+                self.__terms.append(term)
+                posting_docs.append(array('i'))
+                posting_freqs.append(array('i'))
+            elif term_id in previous_terms:
+                i = posting_docs[term_id].index(doc_number)
+                posting_freqs[term_id][i] += freq
+                continue
+
+            # A term which gets its first posting is added to the vocabulary.
+            docs = posting_docs[term_id]
+            if not docs:
+                self.__size += 1
+                self.__sorted_terms = None
+            docs.append(doc_number)
+            posting_freqs[term_id].append(freq)
+            doc_terms.append(term_id)
+
+    def _remove(self, doc_ids):
+        """
+        The method to retract all postings of documents.
+        Only the posting lists of the terms of those documents are rebuilt, and terms left without any posting leave the vocabulary.
+
+        Parameters
+        ----------
+        doc_ids : list
+            The list of documents' id.
+
+        Returns
+        -------
+        None.
+
+        """
+        # Collect the terms of the removed documents.
+        doc_numbers, term_ids = set(), set()
+        for doc_id in doc_ids:
+            doc_number = self.__doc_numbers.get(doc_id)
+            if doc_number is None:
+                continue
+            doc_numbers.add(doc_number)
+            term_ids.update(self.__doc_terms[doc_number])
+            self.__doc_terms[doc_number] = array('i')
+
+        for term_id in term_ids:
+            docs, freqs = self.__posting_docs[term_id], self.__posting_freqs[term_id]
+            kept = [doc_number not in doc_numbers for doc_number in docs]
+            self.__posting_docs[term_id] = array('i', compress(docs, kept))
+            self.__posting_freqs[term_id] = array('i', compress(freqs, kept))
+            if len(self.__posting_docs[term_id]) == 0:
+                self.__size -= 1
+                self.__sorted_terms = None
+
+    @staticmethod
+    def _from_mapping(inverted_index):
+        """
+        The method to build an index from another inverted index, e.g. a read-only index loaded from an index file or a dictionary.
+
+        Parameters
+        ----------
+        inverted_index : dictionary
+            The inverted index, written as {term1: {doc1: freq, doc2: freq}, term2: {doc1: freq}, etc.}.
+
+        Returns
+        -------
+        index : InvertedIndex
+            The index.
+
+        """
+        index = InvertedIndex()
+
+        # A loaded index is copied array by array, keeping its document numbers.
+        mapped = isinstance(inverted_index, MappedInvertedIndex)
+        if mapped:
+            for doc_id in inverted_index.doc_ids:
+                index.__get_doc_number(doc_id)
+        for term in inverted_index:
+            if mapped:
+                docs, freqs = inverted_index._get_postings(term)
+                docs, freqs = array('i', docs.tolist()), array('i', freqs.tolist())
+            else:
+                posting_list = inverted_index[term]
+                docs = array('i', [index.__get_doc_number(doc_id) for doc_id in posting_list.keys()])
+                freqs = array('i', posting_list.values())
+            if len(docs) == 0:
+                continue
+            term_id = len(index.__terms)
+            index.__term_ids[term] = term_id
+            index.__terms.append(term)
+            index.__posting_docs.append(docs)
+            index.__posting_freqs.append(freqs)
+            for doc_number in docs:
+                index.__doc_terms[doc_number].append(term_id)
+        index.__size = len(index.__terms)
+        return index
+
+    def __get_doc_number(self, doc_id):
+        """
+        The method to get the number of a document, giving a new number to a new document.
+
+        Parameters
+        ----------
+        doc_id : string
+            The document's id.
+
+        Returns
+        -------
+        int
+            The document number.
+
+        """
+        doc_number = self.__doc_numbers.get(doc_id)
+        if doc_number is None:
+            doc_number = len(self.__doc_ids)
+            self.__doc_numbers[doc_id] = doc_number
+            self.__doc_ids.append(doc_id)
+            self.__doc_terms.append(array('i'))
+        return doc_number
\ No newline at end of file
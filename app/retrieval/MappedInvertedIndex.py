@@ -0,0 +1,189 @@
+
+import numpy as np
+from collections.abc import Mapping
+
+class MappedInvertedIndex(Mapping):
+
+    def __init__(self, terms, doc_ids, term_offsets, posting_docs, posting_freqs):
+        """
+        The constructor for MappedInvertedIndex class.
+        It is a read-only inverted index backed by (possibly memory-mapped) integer arrays.
+        The posting list of a term is only built when the term is looked up.
+
+        Parameters
+        ----------
+        terms : list
+            The list of terms.
+        doc_ids : list
+            The list of documents' id, indexed by the document numbers stored in posting_docs.
+        term_offsets : array
+            The offsets of each terms' postings, of size len(terms) + 1.
+        posting_docs : array
+            The document number of each postings.
+        posting_freqs : array
+            The frequency of each postings.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__terms = terms
+        self.__doc_ids = doc_ids
+        self.__term_offsets = term_offsets
+        self.__posting_docs = posting_docs
+        self.__posting_freqs = posting_freqs
+        self.__term_ids = None
+        self.__sorted_terms = None
+
+    def __getitem__(self, term):
+        """
+        The method to get the posting list of a term.
+
+        Parameters
+        ----------
+        term : string
+            The term.
+
+        Returns
+        -------
+        dictionary
+            The posting list, written as {doc1: freq, doc2: freq, etc.}.
+
+        """
+        docs, freqs = self._get_postings(term)
+        doc_ids = self.__doc_ids
+        return {doc_ids[j]: freq for j, freq in zip(docs.tolist(), freqs.tolist())}
+
+    def __iter__(self):
+        """
+        The method to iterate over the terms, in the stored order.
+
+        Returns
+        -------
+        iterator
+            The iterator of terms.
+
+        """
+        return iter(self.__terms)
+
+    def __len__(self):
+        """
+        The method to get the number of terms.
+
+        Returns
+        -------
+        int
+            The number of terms.
+
+        """
+        return len(self.__terms)
+
+    def __contains__(self, term):
+        """
+        The method to check whether a term is stored in the index.
+
+        Parameters
+        ----------
+        term : string
+            The term.
+
+        Returns
+        -------
+        boolean
+            True if the term is stored in the index.
+
+        """
+        return term in self.__get_term_ids()
+
+    @property
+    def doc_ids(self):
+        """
+        The method to get the id of each documents, indexed by their document number.
+
+        Returns
+        -------
+        list
+            The list of documents' id.
+
+        """
+        return self.__doc_ids
+
+    @property
+    def sorted_terms(self):
+        """
+        The method to get the vocabulary, sorted case-insensitively as the columns of a tf-idf matrix.
+        The sorted vocabulary is built on first use.
+
+        Returns
+        -------
+        list
+            The sorted terms.
+
+        """
+        if self.__sorted_terms is None:
+            self.__sorted_terms = sorted(self.__terms, key=str.lower)
+        return self.__sorted_terms
+
+    def _get_postings(self, term):
+        """
+        The method to get the posting list of a term as integer arrays, viewed from the stored arrays.
+
+        Parameters
+        ----------
+        term : string
+            The term.
+
+        Returns
+        -------
+        docs : array
+            The document number of each postings.
+        freqs : array
+            The frequency of each postings.
+
+        """
+        i = self.__get_term_ids()[term]
+        start, stop = int(self.__term_offsets[i]), int(self.__term_offsets[i + 1])
+        return self.__posting_docs[start:stop], self.__posting_freqs[start:stop]
+
+    def _join_postings(self, terms):
+        """
+        The method to join the posting lists of terms into whole integer arrays, term after term.
+
+        Parameters
+        ----------
+        terms : list
+            The list of terms.
+
+        Returns
+        -------
+        docs : array
+            The document number of each postings.
+        freqs : array
+            The frequency of each postings.
+        lengths : array
+            The number of postings of each terms.
+
+        """
+        term_ids = self.__get_term_ids()
+        ids = np.array([term_ids[term] for term in terms], dtype=np.int64)
+        starts = self.__term_offsets[ids]
+        lengths = self.__term_offsets[ids + 1] - starts
+
+        # Gather the postings of each terms, from their offset in the stored arrays.
+        positions = np.arange(lengths.sum(), dtype=np.int64) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        return self.__posting_docs[positions], self.__posting_freqs[positions], lengths
+
+    def __get_term_ids(self):
+        """
+        The method to get the number of each terms, built on first use.
+
+        Returns
+        -------
+        dictionary
+            The number of each terms, written as {term1: 0, term2: 1, etc.}.
+
+        """
+        if self.__term_ids is None:
+            self.__term_ids = {term: i for i, term in enumerate(self.__terms)}
+        return self.__term_ids
\ No newline at end of file
@@ -0,0 +1,195 @@
+
+class PreprocessingPipeline:
+    
+    # Extended stop list are taken from Rank NL (https://www.ranks.nl/stopwords).
+    EXTENDED_STOP_LIST = ['a', 'able', 'about', 'above', 'abst', 'accordance', 'according', 'accordingly', 'across', 'act', 'actually', 'added', 'adj', 'affected', 'affecting', 'affects', 'after', 'afterwards', 'again', 'against', 'ah', 'all', 'almost', 'alone', 'along', 'already', 'also', 'although', 'always', 'am', 'among', 'amongst', 'an', 'and', 'announce', 'another', 'any', 'anybody', 'anyhow', 'anymore', 'anyone', 'anything', 'anyway', 'anyways', 'anywhere', 'apparently', 'approximately', 'are', 'aren', 'arent', 'arise', 'around', 'as', 'aside', 'ask', 'asking', 'at', 'auth', 'available', 'away', 'awfully', 'b', 'back', 'be', 'became', 'because', 'become', 'becomes', 'becoming', 'been', 'before', 'beforehand', 'begin', 'beginning', 'beginnings', 'begins', 'behind', 'being', 'believe', 'below', 'beside', 'besides', 'between', 'beyond', 'biol', 'both', 'brief', 'briefly', 'but', 'by', 'c', 'ca', 'came', 'can', 'cannot', "can't", 'cause', 'causes', 'certain', 'certainly', 'co', 'com', 'come', 'comes', 'contain', 'containing', 'contains', 'could', 'couldnt', 'd', 'date', 'did', "didn't", 'different', 'do', 'does', "doesn't", 'doing', 'done', "don't", 'down', 'downwards', 'due', 'during', 'e', 'each', 'ed', 'edu', 'effect', 'eg', 'eight', 'eighty', 'either', 'else', 'elsewhere', 'end', 'ending', 'enough', 'especially', 'et', 'et-al', 'etc', 'even', 'ever', 'every', 'everybody', 'everyone', 'everything', 'everywhere', 'ex', 'except', 'f', 'far', 'few', 'ff', 'fifth', 'first', 'five', 'fix', 'followed', 'following', 'follows', 'for', 'former', 'formerly', 'forth', 'found', 'four', 'from', 'further', 'furthermore', 'g', 'gave', 'get', 'gets', 'getting', 'give', 'given', 'gives', 'giving', 'go', 'goes', 'gone', 'got', 'gotten', 'h', 'had', 'happens', 'hardly', 'has', "hasn't", 'have', "haven't", 'having', 'he', 'hed', 'hence', 'her', 'here', 'hereafter', 'hereby', 'herein', 'heres', 'hereupon', 'hers', 'herself', 'hes', 'hi', 'hid', 'him', 'himself', 'his', 'hither', 'home', 'how', 'howbeit', 'however', 'hundred', 'i', 'id', 'ie', 'if', "i'll", 'im', 'immediate', 'immediately', 'importance', 'important', 'in', 'inc', 'indeed', 'index', 'information', 'instead', 'into', 'invention', 'inward', 'is', "isn't", 'it', 'itd', "it'll", 'its', 'itself', "i've", 'j', 'just', 'k', 'keep\tkeeps', 'kept', 'kg', 'km', 'know', 'known', 'knows', 'l', 'largely', 'last', 'lately', 'later', 'latter', 'latterly', 'least', 'less', 'lest', 'let', 'lets', 'like', 'liked', 'likely', 'line', 'little', "'ll", 'look', 'looking', 'looks', 'ltd', 'm', 'made', 'mainly', 'make', 'makes', 'many', 'may', 'maybe', 'me', 'mean', 'means', 'meantime', 'meanwhile', 'merely', 'mg', 'might', 'million', 'miss', 'ml', 'more', 'moreover', 'most', 'mostly', 'mr', 'mrs', 'much', 'mug', 'must', 'my', 'myself', 'n', 'na', 'name', 'namely', 'nay', 'nd', 'near', 'nearly', 'necessarily', 'necessary', 'need', 'needs', 'neither', 'never', 'nevertheless', 'new', 'next', 'nine', 'ninety', 'no', 'nobody', 'non', 'none', 'nonetheless', 'noone', 'nor', 'normally', 'nos', 'not', 'noted', 'nothing', 'now', 'nowhere', 'o', 'obtain', 'obtained', 'obviously', 'of', 'off', 'often', 'oh', 'ok', 'okay', 'old', 'omitted', 'on', 'once', 'one', 'ones', 'only', 'onto', 'or', 'ord', 'other', 'others', 'otherwise', 'ought', 'our', 'ours', 'ourselves', 'out', 'outside', 'over', 'overall', 'owing', 'own', 'p', 'page', 'pages', 'part', 'particular', 'particularly', 'past', 'per', 'perhaps', 'placed', 'please', 'plus', 'poorly', 'possible', 'possibly', 'potentially', 'pp', 'predominantly', 'present', 'previously', 'primarily', 'probably', 'promptly', 'proud', 'provides', 'put', 'q', 'que', 'quickly', 'quite', 'qv', 'r', 'ran', 'rather', 'rd', 're', 'readily', 'really', 'recent', 'recently', 'ref', 'refs', 'regarding', 'regardless', 'regards', 'related', 'relatively', 'research', 'respectively', 'resulted', 'resulting', 'results', 'right', 'run', 's', 'said', 'same', 'saw', 'say', 'saying', 'says', 'sec', 'section', 'see', 'seeing', 'seem', 'seemed', 'seeming', 'seems', 'seen', 'self', 'selves', 'sent', 'seven', 'several', 'shall', 'she', 'shed', "she'll", 'shes', 'should', "shouldn't", 'show', 'showed', 'shown', 'showns', 'shows', 'significant', 'significantly', 'similar', 'similarly', 'since', 'six', 'slightly', 'so', 'some', 'somebody', 'somehow', 'someone', 'somethan', 'something', 'sometime', 'sometimes', 'somewhat', 'somewhere', 'soon', 'sorry', 'specifically', 'specified', 'specify', 'specifying', 'still', 'stop', 'strongly', 'sub', 'substantially', 'successfully', 'such', 'sufficiently', 'suggest', 'sup', 'sure\tt', 'take', 'taken', 'taking', 'tell', 'tends', 'th', 'than', 'thank', 'thanks', 'thanx', 'that', "that'll", 'thats', "that've", 'the', 'their', 'theirs', 'them', 'themselves', 'then', 'thence', 'there', 'thereafter', 'thereby', 'thered', 'therefore', 'therein', "there'll", 'thereof', 'therere', 'theres', 'thereto', 'thereupon', "there've", 'these', 'they', 'theyd', "they'll", 'theyre', "they've", 'think', 'this', 'those', 'thou', 'though', 'thoughh', 'thousand', 'throug', 'through', 'throughout', 'thru', 'thus', 'til', 'tip', 'to', 'together', 'too', 'took', 'toward', 'towards', 'tried', 'tries', 'truly', 'try', 'trying', 'ts', 'twice', 'two', 'u', 'un', 'under', 'unfortunately', 'unless', 'unlike', 'unlikely', 'until', 'unto', 'up', 'upon', 'ups', 'us', 'use', 'used', 'useful', 'usefully', 'usefulness', 'uses', 'using', 'usually', 'v', 'value', 'various', "'ve", 'very', 'via', 'viz', 'vol', 'vols', 'vs', 'w', 'want', 'wants', 'was', 'wasnt', 'way', 'we', 'wed', 'welcome', "we'll", 'went', 'were', 'werent', "we've", 'what', 'whatever', "what'll", 'whats', 'when', 'whence', 'whenever', 'where', 'whereafter', 'whereas', 'whereby', 'wherein', 'wheres', 'whereupon', 'wherever', 'whether', 'which', 'while', 'whim', 'whither', 'who', 'whod', 'whoever', 'whole', "who'll", 'whom', 'whomever', 'whos', 'whose', 'why', 'widely', 'willing', 'wish', 'with', 'within', 'without', 'wont', 'words', 'world', 'would', 'wouldnt', 'www', 'x', 'y', 'yes', 'yet', 'you', 'youd', "you'll", 'your', 'youre', 'yours', 'yourself', 'yourselves', "you've", 'z', 'zero']
+    
+    def __init__(self, stopwords_removal_option=True, stemming_option=True, case_folding_option=True, normalization_option=True, stem_cache=None):
+        """
+        The constructor for PreprocessingPipeline class.
+        The stop list and the stemmer are built once, and reused for every documents.
+        NLTK is only imported here, since importing it takes longer than starting the application.
+
+        Parameters
+        ----------
+        stopwords_removal_option : boolean
+            The stopwords removal status (if true, stopwords removal step will be done). The default is True.
+        stemming_option : boolean
+            The stemming status (if true, stemming step will be done). The default is True.
+        case_folding_option : boolean
+            The case folding status (if true, case folding step will be done). The default is True.
+        normalization_option : boolean
+            The normalization status (if true, normalization step will be done). The default is True.
+        stem_cache : StemCache, optional
+            The cache of stemmed tokens. The default is None (every token is stemmed).
+
+        Returns
+        -------
+        None.
+
+        """
+        from nltk.tokenize import word_tokenize
+        from nltk.corpus import stopwords
+        from nltk.stem import PorterStemmer
+        
+        self.__option = (stopwords_removal_option, stemming_option, case_folding_option, normalization_option)
+        self.__tokenize = word_tokenize
+        self.__stop_list = frozenset(stopwords.words('english')) | frozenset(self.EXTENDED_STOP_LIST) if stopwords_removal_option else frozenset()
+        self.__stemmer = PorterStemmer() if stemming_option else None
+        self.__stem_cache = stem_cache
+    
+    @property
+    def option(self):
+        """
+        The method to get the preprocessor option.
+        The option is consisting of stop words removal option, stemming option, case folding option and normalization option.
+
+        Returns
+        -------
+        tuple
+            The preprocessor option.
+
+        """
+        return self.__option
+    
+    @property
+    def stem_cache(self):
+        """
+        The method to get the cache of stemmed tokens.
+
+        Returns
+        -------
+        StemCache
+            The cache of stemmed tokens, or None.
+
+        """
+        return self.__stem_cache
+    
+    def _process(self, sequence, timer=None):
+        """
+        The method to get a list of terms in a character sequence.
+        The sequence is tokenized, then all enabled steps (stop words removal, stemming, case folding and normalization)
+        are done in a single pass over each tokens.
+        Language supported is English.
+
+        Parameters
+        ----------
+        sequence : string
+            The character sequence.
+        timer : StageTimer, optional
+            The timer measuring the tokenization, stopwords_removal, stemming and normalization stages. The default is None.
+            If it is given, each enabled steps is done in its own pass over the tokens, so the time spent in each steps can be measured.
+
+        Returns
+        -------
+        result : list
+            The list of terms. If no term is left, the list of tokens is returned instead.
+
+        """
+        if timer is not None:
+            return self.__process_by_step(sequence, timer)
+        
+        token_list = self.__tokenize(sequence)
+        stopwords_removal_option, stemming_option, case_folding_option, normalization_option = self.__option
+        stop_list = self.__stop_list
+        
+        result = []
+        for token in token_list:
+            # Check whether a token is a stop word or not.
+            # If a token is a stop word, the token will be removed.
+            if stopwords_removal_option and token in stop_list:
+                continue
+            
+            if stemming_option:
+                token = self._stem(token)
+            
+            if case_folding_option:
+                token = token.lower()
+            
+            # Keep only alphabetic characters, and remove the token if nothing is left.
+            if normalization_option:
+                token = ''.join(filter(str.isalpha, token))
+                if token == '':
+                    continue
+            result.append(token)
+        return result if result != [] else token_list
+    
+    def __process_by_step(self, sequence, timer):
+        """
+        The method to get a list of terms in a character sequence, doing each enabled steps in its own pass over the tokens.
+        It gives the same terms as method _process, and measures the time spent in each steps.
+
+        Parameters
+        ----------
+        sequence : string
+            The character sequence.
+        timer : StageTimer
+            The timer measuring the tokenization, stopwords_removal, stemming and normalization stages.
+
+        Returns
+        -------
+        result : list
+            The list of terms. If no term is left, the list of tokens is returned instead.
+
+        """
+        stopwords_removal_option, stemming_option, case_folding_option, normalization_option = self.__option
+        
+        with timer._measure('tokenization'):
+            token_list = self.__tokenize(sequence)
+        
+        # Remove the tokens which are stop words.
+        result = token_list
+        if stopwords_removal_option:
+            with timer._measure('stopwords_removal'):
+                stop_list = self.__stop_list
+                result = [token for token in result if token not in stop_list]
+        
+        if stemming_option:
+            with timer._measure('stemming'):
+                stem = self._stem
+                result = [stem(token) for token in result]
+        
+        # Fold the case of each tokens, then keep only alphabetic characters, and remove the token if nothing is left.
+        if case_folding_option or normalization_option:
+            with timer._measure('normalization'):
+                if not normalization_option:
+                    result = [token.lower() for token in result]
+                else:
+                    isalpha = str.isalpha
+                    result = [token.lower() if case_folding_option else token for token in result]
+                    result = [token for token in [''.join(filter(isalpha, token)) for token in result] if token != '']
+        return result if result != [] else token_list
+    
+    def _stem(self, token):
+        """
+        The method to stem a token.
+        Technique used is suffix-stripping technique, with Porter stemming algorithm.
+        The stemmed token is taken from the cache of stemmed tokens if the token has been stemmed before.
+
+        Parameters
+        ----------
+        token : string
+            The token.
+
+        Returns
+        -------
+        string
+            The stemmed token, capitalized/uppered if the token is capitalized/uppered.
+
+        """
+        stem_cache = self.__stem_cache
+        if stem_cache is not None:
+            stemmed = stem_cache._get(token)
+            if stemmed is not None:
+                return stemmed
+        
+        # Return the stemmed token capitalized/uppered if the token is capitalized/uppered.
+        stemmed = self.__stemmer.stem(token)
+        if token.isupper():
+            stemmed = stemmed.upper()
+        elif token[0].isupper():
+            stemmed = stemmed.capitalize()
+        
+        if stem_cache is not None:
+            stem_cache._put(token, stemmed)
+        return stemmed
\ No newline at end of file
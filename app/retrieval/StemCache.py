@@ -0,0 +1,242 @@
+
+import pickle
+from collections import OrderedDict
+
+class StemCache:
+
+    def __init__(self, max_size=100000):
+        """
+        The constructor for StemCache class.
+        The cache maps a token (as it appears in a document) to its stemmed token,
+        and evicts the least recently used token when it is full.
+
+        Parameters
+        ----------
+        max_size : int, optional
+            The maximum number of cached tokens. The default is 100000.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__max_size = max_size
+        self.__entries = OrderedDict()
+        self.__new_entries = {}
+        self.__recording = False
+        self.__hits = 0
+        self.__misses = 0
+
+    def __len__(self):
+        """
+        The method to get the number of cached tokens.
+
+        Returns
+        -------
+        int
+            The number of cached tokens.
+
+        """
+        return len(self.__entries)
+
+    @property
+    def max_size(self):
+        """
+        The method to get the maximum number of cached tokens.
+
+        Returns
+        -------
+        int
+            The maximum number of cached tokens.
+
+        """
+        return self.__max_size
+
+    @property
+    def hits(self):
+        """
+        The method to get the number of lookups answered by the cache.
+
+        Returns
+        -------
+        int
+            The number of hits.
+
+        """
+        return self.__hits
+
+    @property
+    def misses(self):
+        """
+        The method to get the number of lookups not answered by the cache.
+
+        Returns
+        -------
+        int
+            The number of misses.
+
+        """
+        return self.__misses
+
+    def _get(self, token):
+        """
+        The method to get the stemmed token of a token.
+
+        Parameters
+        ----------
+        token : string
+            The token.
+
+        Returns
+        -------
+        string
+            The stemmed token, or None if the token is not cached.
+
+        """
+        stemmed = self.__entries.get(token)
+        if stemmed is None:
+            self.__misses += 1
+        else:
+            self.__hits += 1
+            self.__entries.move_to_end(token)
+        return stemmed
+
+    def _put(self, token, stemmed):
+        """
+        The method to cache the stemmed token of a token.
+
+        Parameters
+        ----------
+        token : string
+            The token.
+        stemmed : string
+            The stemmed token.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__store(token, stemmed)
+
+        # Only a process of the pool keeps its newly cached tokens, until they are sent back to the main cache.
+        if self.__recording:
+            self.__new_entries[token] = stemmed
+
+    def _record(self):
+        """
+        The method to keep the tokens cached from now on, so they can be taken with _drain.
+        It is used by a process of the pool, and resets its counters, so only its own work is sent back.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__recording = True
+        self.__new_entries = {}
+        self.__hits = 0
+        self.__misses = 0
+
+    def _drain(self):
+        """
+        The method to take the tokens cached and the counters since the last call.
+        It is used to send the work of a process of the pool back to the main cache, once the process records its tokens.
+
+        Returns
+        -------
+        tuple
+            The newly cached tokens, the number of hits and the number of misses.
+
+        """
+        drained = (self.__new_entries, self.__hits, self.__misses)
+        self.__new_entries = {}
+        self.__hits = 0
+        self.__misses = 0
+        return drained
+
+    def _merge(self, entries, hits=0, misses=0):
+        """
+        The method to merge cached tokens and counters into the cache.
+
+        Parameters
+        ----------
+        entries : dictionary
+            The cached tokens, written as {token1: stemmed1, token2: stemmed2, etc.}.
+        hits : int, optional
+            The number of hits to add. The default is 0.
+        misses : int, optional
+            The number of misses to add. The default is 0.
+
+        Returns
+        -------
+        None.
+
+        """
+        for token, stemmed in entries.items():
+            self.__store(token, stemmed)
+        self.__hits += hits
+        self.__misses += misses
+
+    def _save(self, path):
+        """
+        The method to save the cached tokens as a pickle file.
+
+        Parameters
+        ----------
+        path : string
+            The file path.
+
+        Returns
+        -------
+        None.
+
+        """
+        data = {}
+        data['max_size'] = self.__max_size
+        data['entries'] = list(self.__entries.items())
+        with open(path, 'wb') as handle:
+            pickle.dump(data, handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _load(path):
+        """
+        The method to load cached tokens saved as a pickle file.
+
+        Parameters
+        ----------
+        path : string
+            The file path.
+
+        Returns
+        -------
+        stem_cache : StemCache
+            The loaded cache.
+
+        """
+        with open(path, 'rb') as handle:
+            data = pickle.load(handle)
+        stem_cache = StemCache(data['max_size'])
+        stem_cache._merge(dict(data['entries']))
+        return stem_cache
+
+    def __store(self, token, stemmed):
+        """
+        The method to store a token as the most recently used, evicting the least recently used token if the cache is full.
+
+        Parameters
+        ----------
+        token : string
+            The token.
+        stemmed : string
+            The stemmed token.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__entries[token] = stemmed
+        self.__entries.move_to_end(token)
+        if len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
\ No newline at end of file
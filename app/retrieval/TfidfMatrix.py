@@ -0,0 +1,145 @@
+
+from scipy.sparse import csr_matrix
+
+import math
+import numpy as np
+
+class TfidfMatrix:
+
+    def __init__(self, inverted_index, doc_ids, matrix=None, terms=None):
+        """
+        The constructor for TfidfMatrix class.
+        The matrix is built straight from the inverted index, one row per document and one column per term.
+
+        Parameters
+        ----------
+        inverted_index : InvertedIndex
+            The inverted index.
+        doc_ids : list
+            The list of documents' id, in the order of the matrix rows.
+        matrix : csr_matrix, optional
+            The tf-idf matrix already built (e.g. loaded from an index file). The default is None.
+        terms : list, optional
+            The terms kept as columns (e.g. after pruning the vocabulary). The default is None (all terms of the inverted index).
+
+        Returns
+        -------
+        None.
+
+        """
+        self.__doc_ids = list(doc_ids)
+        self.__terms = inverted_index.sorted_terms if terms is None else sorted(terms, key=str.lower)
+        self.__rows = {doc_id: i for i, doc_id in enumerate(self.__doc_ids)}
+        self.__matrix = self.__build_matrix(inverted_index) if matrix is None else matrix
+
+    @property
+    def matrix(self):
+        """
+        The method to get the sparse tf-idf matrix.
+
+        Returns
+        -------
+        csr_matrix
+            The tf-idf matrix, written as documents x terms.
+
+        """
+        return self.__matrix
+
+    @property
+    def doc_ids(self):
+        """
+        The method to get the documents' id, in the order of the matrix rows.
+
+        Returns
+        -------
+        list
+            The list of documents' id.
+
+        """
+        return self.__doc_ids
+
+    @property
+    def terms(self):
+        """
+        The method to get the sorted terms, in the order of the matrix columns.
+
+        Returns
+        -------
+        list
+            The list of sorted terms.
+
+        """
+        return self.__terms
+
+    def _get_row(self, doc_id):
+        """
+        The method to get the row number of a document.
+
+        Parameters
+        ----------
+        doc_id : string
+            The document's id.
+
+        Returns
+        -------
+        int
+            The row number of the document.
+
+        """
+        return self.__rows[doc_id]
+
+    def _get_vector(self, doc_id):
+        """
+        The method to get the row of a document as a 1 x terms sparse matrix.
+
+        Parameters
+        ----------
+        doc_id : string
+            The document's id.
+
+        Returns
+        -------
+        csr_matrix
+            The document's row of the tf-idf matrix.
+
+        """
+        row = self.__rows[doc_id]
+        return self.__matrix[row:row + 1]
+
+    def __build_matrix(self, inverted_index):
+        """
+        The method to build the sparse tf-idf matrix.
+        The posting arrays of all terms are joined, so the weights are computed on whole arrays. Only non-zero weights are stored.
+
+        Parameters
+        ----------
+        inverted_index : InvertedIndex
+            The inverted index.
+
+        Returns
+        -------
+        csr_matrix
+            The tf-idf matrix.
+
+        """
+        corpus_size = len(self.__doc_ids)
+
+        # Map the document numbers of the index to the matrix rows, a document without a row being mapped to -1.
+        doc_rows = np.array([self.__rows.get(doc_id, -1) for doc_id in inverted_index.doc_ids], dtype=np.int64)
+
+        docs, freqs, lengths = inverted_index._join_postings(self.__terms)
+
+        # Calculate idf weight for each terms.
+        # A term contained in every document has idf weight 0, so none of its weights are stored.
+        idfs = np.array([math.log10(corpus_size / length) for length in lengths.tolist()], dtype=np.float64)
+
+        # Calculate tf-idf weight for each postings, the tf weight being computed once for each distinct frequencies.
+        unique_freqs, inverse = np.unique(freqs, return_inverse=True)
+        tf_weights = np.array([math.log10(freq + 1) for freq in unique_freqs.tolist()], dtype=np.float64)[inverse]
+        weights = tf_weights * np.repeat(idfs, lengths)
+        rows = doc_rows[docs]
+        cols = np.repeat(np.arange(len(self.__terms), dtype=np.int64), lengths)
+
+        # Keep the postings of the documents which have a row, and of the terms which have idf weight.
+        kept = (rows >= 0) & np.repeat(idfs != 0, lengths)
+        return csr_matrix((weights[kept], (rows[kept], cols[kept])), shape=(corpus_size, len(self.__terms)))
\ No newline at end of file
@@ -0,0 +1,161 @@
+
+class VocabularyPruner:
+
+    def __init__(self, min_df=1, max_df=1.0, max_features=None):
+        """
+        The constructor for VocabularyPruner class.
+        The pruner selects the terms kept as dimensions of the tf-idf matrix, based on their document frequency.
+        The inverted index itself is not pruned, so the selection is made again when the index is updated.
+        A frequency is a number of documents if it is an int, or a proportion of the corpus if it is a float.
+
+        Parameters
+        ----------
+        min_df : int or float, optional
+            The minimum document frequency of a kept term. The default is 1 (all terms).
+        max_df : int or float, optional
+            The maximum document frequency of a kept term. The default is 1.0 (all terms).
+        max_features : int, optional
+            The maximum number of kept terms, the most frequent terms in the corpus being kept. The default is None (no limit).
+
+        Raises
+        ------
+        ValueError
+            If a frequency is negative, or a proportion is greater than 1, or max_features is less than 1.
+
+        Returns
+        -------
+        None.
+
+        """
+        for name, frequency in (('min_df', min_df), ('max_df', max_df)):
+            if isinstance(frequency, bool) or not isinstance(frequency, (int, float)) or frequency < 0 or (isinstance(frequency, float) and frequency > 1):
+                raise ValueError(name + ' must be a number of documents or a proportion between 0 and 1.')
+        if max_features is not None and (isinstance(max_features, bool) or not isinstance(max_features, int) or max_features < 1):
+            raise ValueError('max_features must be a positive number of terms.')
+        self.__min_df = min_df
+        self.__max_df = max_df
+        self.__max_features = max_features
+        self.__summary = None
+
+    @property
+    def option(self):
+        """
+        The method to get the pruning option, to be saved along with an index.
+
+        Returns
+        -------
+        dictionary
+            The minimum and maximum document frequency and the maximum number of terms.
+
+        """
+        return {'min_df': self.__min_df, 'max_df': self.__max_df, 'max_features': self.__max_features}
+
+    @property
+    def summary(self):
+        """
+        The method to get the effect of the last pruning on the tf-idf matrix.
+        The memory of a matrix is estimated as 12 bytes for each non-zero weights (its value and its column) and 4 bytes for each rows.
+
+        Returns
+        -------
+        dictionary
+            The number of documents, the number of terms, of non-zero weights and the memory (in bytes) of the matrix, before and after pruning.
+            None if the vocabulary was not pruned yet.
+
+        """
+        return self.__summary
+
+    def _prune(self, inverted_index, corpus_size):
+        """
+        The method to select the terms kept as dimensions of the tf-idf matrix.
+
+        Parameters
+        ----------
+        inverted_index : InvertedIndex
+            The inverted index.
+        corpus_size : int
+            The number of documents.
+
+        Raises
+        ------
+        ValueError
+            If no term is left.
+
+        Returns
+        -------
+        terms : list
+            The kept terms, in the sorted order of the vocabulary.
+
+        """
+        min_count = self.__min_df if isinstance(self.__min_df, int) else self.__min_df * corpus_size
+        max_count = self.__max_df if isinstance(self.__max_df, int) else self.__max_df * corpus_size
+
+        # Keep the document frequency of each kept terms, and their frequency in the corpus if the number of terms is limited.
+        # A term contained in every document has idf weight 0, so it has no weights in the matrix.
+        terms, frequencies, weights = [], {}, 0
+        for term in inverted_index.sorted_terms:
+            docs, freqs = inverted_index._get_postings(term)
+            df = len(docs)
+            weights += df if df < corpus_size else 0
+            if min_count <= df <= max_count:
+                terms.append(term)
+                frequencies[term] = (df, int(sum(freqs)) if self.__max_features is not None else 0)
+
+        # Keep the terms which are the most frequent in the corpus, ties being broken by the order of the terms.
+        if self.__max_features is not None and len(terms) > self.__max_features:
+            kept = set(sorted(terms, key=lambda term: (-frequencies[term][1], term))[:self.__max_features])
+            terms = [term for term in terms if term in kept]
+        kept_weights = sum(frequencies[term][0] for term in terms if frequencies[term][0] < corpus_size)
+        if terms == []:
+            raise ValueError('No term is left after pruning the vocabulary.')
+
+        self.__summary = {'documents': corpus_size, 'terms': len(inverted_index), 'kept_terms': len(terms),
+                          'weights': weights, 'kept_weights': kept_weights,
+                          'matrix_bytes': 12 * weights + 4 * (corpus_size + 1), 'kept_matrix_bytes': 12 * kept_weights + 4 * (corpus_size + 1)}
+        return terms
+
+    @staticmethod
+    def _parse_frequency(value):
+        """
+        The method to parse a document frequency, written as a number of documents or as a proportion of the corpus.
+
+        Parameters
+        ----------
+        value : string
+            The written frequency.
+
+        Raises
+        ------
+        ValueError
+            If the frequency is not a number.
+
+        Returns
+        -------
+        int or float
+            The number of documents if the frequency is an integer, else the proportion.
+
+        """
+        try:
+            return int(value)
+        except ValueError:
+            return float(value)
+
+    @staticmethod
+    def _from_option(option):
+        """
+        The method to build a pruner from a saved pruning option.
+
+        Parameters
+        ----------
+        option : dictionary
+            The pruning option, or None.
+
+        Returns
+        -------
+        VocabularyPruner
+            The pruner, or None if there is no pruning option.
+
+        """
+        if option is None:
+            return None
+        return VocabularyPruner(option['min_df'], option['max_df'], option['max_features'])
\ No newline at end of file
@@ -0,0 +1,23 @@
+import os
+import sys
+import pytest
+
+# Modules are imported from the app folder, as the application runs from there.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from retrieval.PreprocessingPipeline import PreprocessingPipeline
+
+@pytest.fixture
+def nltk_data():
+    """
+    The fixture to skip a test which indexes documents, if the NLTK data it needs (tokenizer and stop words) is not installed.
+
+    Returns
+    -------
+    None.
+
+    """
+    try:
+        PreprocessingPipeline()._process('Testing the tokenizer.')
+    except LookupError as error:
+        pytest.skip('NLTK data is not installed: ' + str(error).strip().splitlines()[0])
\ No newline at end of file
@@ -0,0 +1,252 @@
+from clustering import Clusterer as clusterer_module
+from clustering.Clusterer import Clusterer
+from clustering.DistanceMatrix import DistanceMatrix
+from retrieval.CorpusStore import CorpusStore
+from retrieval.TfidfMatrix import TfidfMatrix
+
+from scipy.cluster.hierarchy import cophenet, fcluster, linkage
+from scipy.sparse import csr_matrix
+from scipy.spatial.distance import pdist, squareform
+
+import time
+import threading
+import numpy as np
+import pytest
+
+def _topics(n_docs=60, n_topics=4, topic_terms=20, random_state=0):
+    # Each document weights 8 terms of its topic and 2 terms of any topic.
+    random_state = np.random.RandomState(random_state)
+    n_terms = n_topics * topic_terms
+    rows, cols = [], []
+    for i in range(0, n_docs):
+        topic = i % n_topics
+        terms = set(topic * topic_terms + random_state.choice(topic_terms, 8, replace=False)) | set(random_state.choice(n_terms, 2))
+        rows.extend([i] * len(terms))
+        cols.extend(sorted(terms))
+    return csr_matrix((random_state.uniform(0.5, 3, len(rows)), (rows, cols)), shape=(n_docs, n_terms))
+
+def _clusterer(matrix, **option):
+    doc_ids = ['doc_' + str(i) for i in range(0, matrix.shape[0])]
+    terms = ['term' + str(j).zfill(3) for j in range(0, matrix.shape[1])]
+    tfidf_matrix = TfidfMatrix(None, doc_ids, matrix=matrix, terms=terms)
+    corpus = CorpusStore(doc_ids, ['title ' + str(i) for i in range(0, matrix.shape[0])])
+    corpus._build_vectors(tfidf_matrix)
+    return Clusterer(corpus, tfidf_matrix, **option)
+
+@pytest.fixture
+def counted(monkeypatch):
+    # Count the distance matrices and the linkage matrices of each methods, slowing them down so threads overlap.
+    count = {'distance_matrix': 0}
+    lock = threading.Lock()
+    build, linkage = DistanceMatrix._build, clusterer_module.linkage
+
+    def _build(self, matrix):
+        with lock:
+            count['distance_matrix'] += 1
+        time.sleep(0.05)
+        return build(self, matrix)
+
+    def _linkage(distance_matrix, method):
+        with lock:
+            count[method] = count.get(method, 0) + 1
+        time.sleep(0.05)
+        return linkage(distance_matrix, method=method)
+
+    monkeypatch.setattr(DistanceMatrix, '_build', _build)
+    monkeypatch.setattr(clusterer_module, 'linkage', _linkage)
+    return count
+
+def test_linkage_cache(counted):
+    clusterer = _clusterer(_topics())
+    clusterer.cluster('average')
+    first = clusterer.assign_clusters(0.5)
+    clusterer.cluster('complete')
+    clusterer.cluster('average')
+
+    # Switching back to a method reuses its linkage matrix, and the distance matrix is shared by all methods.
+    assert counted == {'distance_matrix': 1, 'average': 1, 'complete': 1}
+    assert clusterer.assign_clusters(0.5) == first
+    assert clusterer._Clusterer__get_linkage('average') is clusterer._Clusterer__get_linkage('average')
+    assert counted['average'] == 1
+
+def test_precompute_while_clustering(counted):
+    clusterer = _clusterer(_topics())
+    thread = clusterer.precompute(['average', 'complete', 'single'])
+
+    # A method requested while it is being precomputed waits for it, instead of computing it again.
+    clusterer.cluster('complete')
+    clusterer.cluster('average')
+    thread.join()
+    clusterer.cluster('single')
+    assert counted == {'distance_matrix': 1, 'average': 1, 'complete': 1, 'single': 1}
+    assert clusterer.timer.stages['linkage']['calls'] == 3
+
+def test_concurrent_requests(counted):
+    clusterer = _clusterer(_topics())
+    threads = [clusterer.precompute(['single', 'average']) for i in range(0, 3)]
+    clusterer.cluster('average')
+    for thread in threads:
+        thread.join()
+    assert counted == {'distance_matrix': 1, 'single': 1, 'average': 1}
+
+@pytest.fixture
+def scalable(monkeypatch):
+    # A small corpus is clustered in scalable mode once the threshold is lowered.
+    monkeypatch.setattr(Clusterer, 'SCALABLE_THRESHOLD', 100)
+    monkeypatch.setattr(Clusterer, 'MICRO_CLUSTERS', 30)
+    monkeypatch.setattr(Clusterer, 'PROJECTION_COMPONENTS', 64)
+    return _topics(300, topic_terms=10)
+
+def _doc_cophenet(clusterer):
+    # Documents of the same micro-cluster are merged at height 0, and others at the height their micro-clusters are merged.
+    leaf_distances = squareform(cophenet(clusterer._Clusterer__linkage))
+    row_leaves = clusterer._Clusterer__row_leaves
+    if row_leaves is None:
+        return squareform(leaf_distances, checks=False)
+    return squareform(leaf_distances[row_leaves[:, np.newaxis], row_leaves[np.newaxis, :]], checks=False)
+
+def test_scalable_threshold(scalable):
+    assert _clusterer(scalable).scalable
+    assert not _clusterer(scalable[:100]).scalable
+    assert not _clusterer(scalable, scalable=False).scalable
+
+@pytest.mark.parametrize('method', ['single', 'complete', 'average'])
+def test_scalable_labels(scalable, method):
+    clusterer = _clusterer(scalable)
+    clusterer.cluster(method)
+    assert len(clusterer._Clusterer__linkage) + 1 <= Clusterer.MICRO_CLUSTERS
+    doc_ids = ['doc_' + str(i) for i in range(0, scalable.shape[0])]
+    titles = ['title ' + str(i) for i in range(0, scalable.shape[0])]
+    for cut_off in [0, 0.3, 0.6, 0.9, 1.1]:
+        # Every document gets exactly one cluster, whose documents are all those of its micro-clusters.
+        clusters = clusterer.assign_clusters(cut_off)
+        assert list(clusters.keys()) == doc_ids
+        row_leaves = clusterer._Clusterer__row_leaves
+        for leaf in set(row_leaves.tolist()):
+            assert len({clusters[doc_ids[row]] for row in np.flatnonzero(row_leaves == leaf)}) == 1
+        cluster_list = clusterer.extract_clusters(False, cut_off)
+        assert sorted(title for cluster in cluster_list.values() for title in cluster) == sorted(titles)
+        assert len(cluster_list) == len(set(clusters.values()))
+
+@pytest.mark.parametrize('method', ['single', 'complete', 'average'])
+def test_scalable_close_to_exact(scalable, method):
+    clusterer = _clusterer(scalable)
+    clusterer.cluster(method)
+    exact = _clusterer(scalable, scalable=False)
+    exact.cluster(method)
+
+    # The hierarchy over micro-clusters fits the distances between documents about as well as the hierarchy over documents.
+    distances = pdist(scalable.toarray(), 'cosine')
+    scalable_cpcc = np.corrcoef(_doc_cophenet(clusterer), distances)[0, 1]
+    exact_cpcc = np.corrcoef(_doc_cophenet(exact), distances)[0, 1]
+    assert scalable_cpcc > 0.85
+    assert scalable_cpcc > exact_cpcc - 0.05
+    assert np.corrcoef(_doc_cophenet(clusterer), _doc_cophenet(exact))[0, 1] > 0.85
+
+def test_scalable_fewer_documents_than_micro_clusters(scalable):
+    clusterer = _clusterer(scalable[:20], scalable=True)
+    clusterer.cluster('average')
+    assert len(clusterer._Clusterer__linkage) + 1 <= 20
+    assert sorted(clusterer.assign_clusters(0.5)) == sorted('doc_' + str(i) for i in range(0, 20))
+def _same_partition(first, second):
+    first, second = np.asarray(first), np.asarray(second)
+    return np.array_equal(first[:, np.newaxis] == first[np.newaxis, :], second[:, np.newaxis] == second[np.newaxis, :])
+
+@pytest.mark.parametrize('method', ['single', 'complete', 'average'])
+def test_assign_clusters(method):
+    matrix = _topics()
+    clusterer = _clusterer(matrix)
+    clusterer.cluster(method)
+    expected_linkage = linkage(pdist(matrix.toarray(), 'cosine'), method=method)
+    for cut_off in [0.1, 0.5, 0.7, 0.9, 0.95, 2]:
+        # Documents are in the same cluster as with fcluster, at or below the cut-off height.
+        labels = list(clusterer.assign_clusters(cut_off).values())
+        assert _same_partition(labels, fcluster(expected_linkage, cut_off, criterion='distance'))
+
+        # Clusters are numbered from 0 in the order of their first document.
+        first_labels = [label for i, label in enumerate(labels) if label not in labels[:i]]
+        assert first_labels == list(range(0, len(set(labels))))
+
+def test_assign_clusters_without_cut():
+    clusterer = _clusterer(_topics())
+    clusterer.cluster('average')
+
+    # A cut-off height of 0 or less gives a single cluster, whereas a cut-off height just above 0 keeps documents apart.
+    for cut_off in [0, -1]:
+        assert set(clusterer.assign_clusters(cut_off).values()) == {0}
+        assert list(clusterer.extract_clusters(False, cut_off).keys()) == ['Cluster 1']
+    assert len(set(clusterer.assign_clusters(1e-9).values())) == 60
+
+def test_current_cut_off():
+    clusterer = _clusterer(_topics())
+    clusterer.cluster('complete')
+    assert clusterer.assign_clusters() == clusterer.assign_clusters(0)
+    clusterer.cut_off = 0.9
+    assert clusterer.assign_clusters() == clusterer.assign_clusters(0.9)
+    assert clusterer.extract_clusters(False) == clusterer.extract_clusters(False, 0.9)
+
+def test_extract_clusters():
+    clusterer = _clusterer(_topics())
+    clusterer.cluster('average')
+    clusters = clusterer.assign_clusters(0.9)
+    cluster_list = clusterer.extract_clusters(False, 0.9)
+
+    # Clusters are named after their number, and list their documents' title in the order of the corpus.
+    assert list(cluster_list.keys()) == ['Cluster ' + str(label + 1) for label in range(0, len(set(clusters.values())))]
+    for doc_id, label in clusters.items():
+        assert 'title ' + doc_id[4:] in cluster_list['Cluster ' + str(label + 1)]
+    for titles in cluster_list.values():
+        assert titles == sorted(titles, key=lambda title: int(title[6:]))
+def _brute_force_names(matrix, terms, labels, n):
+    # Rank the terms of each clusters by the product of their weights over its documents, as before the names were vectorized.
+    # Ties are broken by term order, and a name already given gets the cluster number.
+    dense = matrix.toarray()
+    names, used = [], set()
+    for label in range(0, labels.max() + 1):
+        products = np.prod(dense[labels == label], axis=0)
+        common = sorted((-product, col) for col, product in enumerate(products.tolist()) if product > 0)[:n]
+        name = ' '.join(terms[col] for product, col in common) if len(common) > 0 else 'Cluster ' + str(label + 1)
+        if len(common) > 0 and name in used:
+            name += ' (' + str(label + 1) + ')'
+        names.append(name)
+        used.add(name)
+    return names
+
+@pytest.mark.parametrize('n_clusters', [1, 60, 120, 263])
+def test_name_clusters(n_clusters):
+    matrix = _topics(600, n_topics=20, topic_terms=10)
+
+    # Copy some columns, so their terms tie, and some rows, so their clusters get the same name.
+    matrix = csr_matrix(np.hstack([matrix.toarray(), matrix[:, :12].toarray()]))
+    matrix = csr_matrix(np.vstack([matrix.toarray()[:540], matrix.toarray()[:60]]))
+    terms = ['term' + str(j).zfill(3) for j in range(0, matrix.shape[1])]
+
+    # Clusters are made of documents of the same topic, so they have terms in common.
+    labels = np.empty(600, dtype=np.int64)
+    labels[np.argsort(np.arange(600) % 20, kind='stable')] = np.arange(600) * n_clusters // 600
+    clusterer = _clusterer(matrix)
+    assert clusterer._Clusterer__name_clusters(labels, 5) == _brute_force_names(matrix, terms, labels, 5)
+
+def test_name_clusters_with_ties():
+    # Terms of equal products are ranked in term order, and a cluster without common terms keeps its number.
+    matrix = csr_matrix(np.array([[1, 2, 2, 0, 0.5], [1, 2, 2, 0, 0], [0, 0, 0, 3, 0], [2, 1, 1, 0, 0], [2, 1, 1, 0, 0]]))
+    labels = np.array([0, 0, 1, 2, 2])
+    names = _clusterer(matrix)._Clusterer__name_clusters(labels, 2)
+    assert names == ['term001 term002', 'term003', 'term000 term001']
+    assert names == _brute_force_names(matrix, ['term000', 'term001', 'term002', 'term003', 'term004'], labels, 2)
+    assert _clusterer(matrix)._Clusterer__name_clusters(np.array([0, 0, 0, 1, 1]), 2) == ['Cluster 1', 'term000 term001']
+
+def test_name_clusters_ignores_non_positive_weights():
+    # An explicitly stored zero is not a term of the document.
+    matrix = csr_matrix((np.array([1.0, 0.0, 2.0, 3.0, 0.5]), np.array([0, 1, 0, 1, 2]), np.array([0, 2, 5])), shape=(2, 3))
+    assert matrix.nnz == 5 and matrix.data.min() == 0
+    clusterer = _clusterer(matrix)
+    assert clusterer._Clusterer__name_clusters(np.array([0, 0]), 3) == ['term000']
+    assert clusterer._Clusterer__name_clusters(np.array([0, 1]), 3) == ['term000', 'term001 term000 term002']
+
+def test_name_clusters_unique():
+    # Documents with the same terms in several clusters give clusters of the same name, told apart by their number.
+    matrix = csr_matrix(np.array([[1, 2, 0], [1, 2, 0], [1, 2, 0], [0, 0, 1]]))
+    names = _clusterer(matrix)._Clusterer__name_clusters(np.array([0, 1, 2, 3]), 5)
+    assert names == ['term001 term000', 'term001 term000 (2)', 'term001 term000 (3)', 'term002']
+    assert _clusterer(matrix)._Clusterer__name_clusters(np.array([0, 0, 0, 1]), 1) == ['term001', 'term002']
\ No newline at end of file
@@ -0,0 +1,100 @@
+from retrieval.CorpusReader import CorpusReader
+from pipeline.StageTimer import StageTimer
+
+import os
+import threading
+import pytest
+
+@pytest.fixture
+def folder(tmp_path):
+    for i in range(0, 20):
+        (tmp_path / ('doc' + str(i) + '.txt')).write_bytes(('Line one of ' + str(i) + '.\r\nLine two.\rLine three.\n').encode('utf-8'))
+    (tmp_path / 'notes.md').write_text('Not a text file.')
+    return tmp_path
+
+def _indexed(folder):
+    # An indexed corpus records the hash of each files when they are read.
+    corpus = CorpusReader(str(folder))._list_documents()
+    for document in corpus:
+        CorpusReader._load(document)
+        del document.content
+    return corpus
+
+def test_list_documents(folder):
+    progress = []
+    corpus = CorpusReader(str(folder), workers=2)._list_documents(start=5, progress_callback=lambda done, size: progress.append((done, size)))
+    assert len(corpus) == 20
+    assert corpus.doc_ids == ['doc_' + str(i) for i in range(5, 25)]
+    assert sorted(corpus.titles) == sorted('doc' + str(i) for i in range(0, 20))
+    assert all(document.size == os.path.getsize(document.path) for document in corpus)
+    assert progress[-1] == (20, 20)
+
+def test_stream(folder):
+    corpus = CorpusReader(str(folder))._list_documents()
+    timer = StageTimer()
+    streamed = list(CorpusReader._stream(corpus, workers=4, max_in_flight=3, timer=timer))
+
+    # Documents are read in the order of the corpus, with their line breaks removed.
+    assert [document.doc_id for document in streamed] == corpus.doc_ids
+    for document in streamed:
+        assert document.content == 'Line one of ' + document.title[3:] + '.Line two.Line three.'
+        assert document.content_hash == CorpusReader._hash(document.path)
+    assert 'reading' in timer.stages
+
+@pytest.mark.parametrize('max_in_flight', [1, 3, 50])
+def test_stream_read_ahead(folder, monkeypatch, max_in_flight):
+    corpus = CorpusReader(str(folder))._list_documents()
+    load = CorpusReader._load
+    lock = threading.Lock()
+    loaded = []
+
+    def _load(document):
+        with lock:
+            loaded.append(document.doc_id)
+        return load(document)
+
+    # No more documents than the bound are read ahead of the document being processed.
+    monkeypatch.setattr(CorpusReader, '_load', staticmethod(_load))
+    for processed, document in enumerate(CorpusReader._stream(corpus, workers=4, max_in_flight=max_in_flight), 1):
+        with lock:
+            assert len(loaded) - processed <= max_in_flight
+        del document.content
+    assert sorted(loaded) == sorted(corpus.doc_ids)
+
+def test_diff(folder):
+    corpus = _indexed(folder)
+    paths = {document.title: document.path for document in corpus}
+
+    # Touch a file without changing its content, change a file keeping its size, add one and delete one.
+    os.utime(paths['doc1'], (1000000000, 1000000000))
+    (folder / 'doc2.txt').write_bytes((folder / 'doc2.txt').read_bytes().upper())
+    os.utime(paths['doc2'], (1000000000, 1000000000))
+    (folder / 'new.txt').write_text('A new document.')
+    os.remove(paths['doc3'])
+
+    progress = []
+    added, modified, deleted = CorpusReader(str(folder), workers=2)._diff(corpus, lambda done, size: progress.append((done, size)))
+    assert [document.title for document in added] == ['new']
+    assert added[0].doc_id == 'doc_20'
+    assert [document.title for document in modified] == ['doc2']
+    assert modified[0].doc_id == corpus[corpus.titles.index('doc2')].doc_id
+    assert modified[0].size == os.path.getsize(paths['doc2']) and modified[0].content is None
+    assert [document.title for document in deleted] == ['doc3']
+    assert progress[-1] == (19, 19)
+
+    # A file whose content is unchanged has its new modification time recorded, so it is not hashed again.
+    touched = corpus[corpus.titles.index('doc1')]
+    assert touched.mtime == 1000000000
+
+def test_diff_checksum(folder):
+    corpus = _indexed(folder)
+    path = str(folder / 'doc4.txt')
+    status = os.stat(path)
+
+    # A change keeping the file size and the modification time is only found by hashing every file.
+    (folder / 'doc4.txt').write_bytes((folder / 'doc4.txt').read_bytes().replace(b'one', b'One'))
+    os.utime(path, ns=(status.st_atime_ns, status.st_mtime_ns))
+    assert CorpusReader(str(folder))._diff(corpus) == ([], [], [])
+    added, modified, deleted = CorpusReader(str(folder))._diff(corpus, checksum=True)
+    assert [document.title for document in modified] == ['doc4']
+    assert added == [] and deleted == []
\ No newline at end of file
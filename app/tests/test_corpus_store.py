@@ -0,0 +1,91 @@
+from retrieval.CorpusStore import CorpusStore
+from retrieval.Document import Document
+
+import pickle
+import pytest
+
+FIELD_LIST = ['doc_id', 'title', 'path', 'size', 'mtime', 'content_hash']
+HASH = '0123456789abcdef0123456789abcdef'
+
+def _documents():
+    documents = [Document('doc_0', 'apples', path='/corpus/apples.txt', size=120, mtime=1700000000.25),
+                 Document('doc_1', 'boats/sailing', content='Sailing boats.', path='/corpus/boats/sailing.txt', size=0, mtime=0.0),
+                 Document('doc_2', 'cards')]
+    documents[0].content_hash = HASH
+    return documents
+
+def _fields(document):
+    return [getattr(document, field) for field in FIELD_LIST] + [document.content]
+
+def test_standalone_document():
+    document = _documents()[1]
+    assert _fields(document) == ['doc_1', 'boats/sailing', '/corpus/boats/sailing.txt', 0, 0.0, None, 'Sailing boats.']
+    document._set_status(10, 2.5)
+    document.content_hash = HASH
+    del document.content
+    assert _fields(document) == ['doc_1', 'boats/sailing', '/corpus/boats/sailing.txt', 10, 2.5, HASH, None]
+
+def test_from_documents():
+    documents = _documents()
+    expected = [_fields(document) for document in documents]
+    store = CorpusStore._from_documents(documents)
+    assert len(store) == 3
+    assert [_fields(document) for document in store] == expected
+    assert store.doc_ids == ['doc_0', 'doc_1', 'doc_2']
+    assert store.titles == ['apples', 'boats/sailing', 'cards']
+
+    # The documents given become views of the store.
+    documents[2].content = 'Playing cards.'
+    documents[1]._set_status(42, 3.5)
+    assert store[2].content == 'Playing cards.'
+    assert store[1].size == 42 and store[1].mtime == 3.5
+
+def test_manifest():
+    store = CorpusStore._from_documents(_documents())
+    manifest = store._get_manifest()
+    assert manifest[0] == ['doc_0', 'apples', '/corpus/apples.txt', 120, 1700000000.25, HASH]
+    assert manifest[2] == ['doc_2', 'cards', None, None, None, None]
+
+    # A store built from a manifest has the same fields, except the contents which are not saved.
+    loaded = CorpusStore(*zip(*manifest))
+    assert loaded._get_manifest() == manifest
+    assert [document.content for document in loaded] == [None, None, None]
+
+def test_set():
+    store = CorpusStore(['doc_0'], ['apples'])
+    assert _fields(store[0]) == ['doc_0', 'apples', None, None, None, None, None]
+    for field, value in [('size', 7), ('mtime', 1.5), ('content_hash', HASH), ('content', 'Apples.')]:
+        store._set(0, field, value)
+        assert store._get(0, field) == value
+        store._set(0, field, None)
+        assert store._get(0, field) is None
+    with pytest.raises(KeyError):
+        store._set(0, 'title', 'pears')
+    with pytest.raises(KeyError):
+        store._get(0, 'vector')
+    with pytest.raises(ValueError):
+        store._set(0, 'content_hash', 'abcd')
+
+def test_views_rebind():
+    first = CorpusStore._from_documents(_documents())
+    second = CorpusStore(['doc_3'], ['drums'], ['/corpus/drums.txt'], [5], [1.0], [HASH])
+    views = list(first) + second[:]
+
+    # Documents of several stores are packed into a new store, and their views follow it.
+    merged = CorpusStore._from_documents(views[1:])
+    assert merged.doc_ids == ['doc_1', 'doc_2', 'doc_3']
+    views[3].content = 'Drums.'
+    assert merged[2].content == 'Drums.'
+    assert second[0].content is None
+    assert merged[-1].content_hash == HASH
+    with pytest.raises(IndexError):
+        merged[3]
+
+def test_pickle():
+    store = CorpusStore._from_documents(_documents())
+
+    # A view is pickled on its own, without its store.
+    document = pickle.loads(pickle.dumps(store[1]))
+    assert _fields(document) == _fields(store[1])
+    document.content = 'Rowing boats.'
+    assert store[1].content == 'Sailing boats.'
\ No newline at end of file
@@ -0,0 +1,108 @@
+from clustering.Dendrogram import Dendrogram
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import to_rgba
+from scipy.cluster.hierarchy import linkage, fcluster
+
+import numpy as np
+import pytest
+
+@pytest.fixture
+def points():
+    return np.random.RandomState(0).rand(400, 5)
+
+def _labels(figure, orientation='right'):
+    ax = figure.axes[0]
+    return [label.get_text() for label in (ax.get_yticklabels() if orientation == 'right' else ax.get_xticklabels())]
+
+def _size(label):
+    # A collapsed leaf is labelled with the number of documents under it.
+    return int(label[1:-1]) if label.startswith('(') else 1
+
+def test_cut_without_plotting_again(points):
+    matrix = linkage(points[:40], 'average')
+    dendrogram = Dendrogram()
+    figure = dendrogram._plot_dendrogram(matrix, 0, ['title ' + str(i) for i in range(0, 40)])
+    canvas = FigureCanvasAgg(figure)
+    dendrogram._connect(canvas)
+    canvas.draw()
+    ax = figure.axes[0]
+    collections = list(ax.collections)
+    link_collection = collections[0]
+    cut_line = ax.lines[0]
+    assert not cut_line.get_visible()
+    assert np.all(link_collection.get_colors() == to_rgba(Dendrogram.ABOVE_COLOR))
+
+    # Cutting the dendrogram blits the recolored links and the cut line, without drawing the figure again.
+    draws = []
+    canvas.draw = lambda: draws.append(1)
+    cut_off = matrix[-4, 2]
+    dendrogram._cut(cut_off)
+    assert draws == []
+    assert list(ax.collections) == collections and list(ax.lines) == [cut_line]
+    assert cut_line.get_visible() and list(cut_line.get_xdata()) == [cut_off, cut_off]
+
+    # Links at or below the cut-off height have the color of their cluster (a single document has no link), and the others the color above it.
+    colors = link_collection.get_colors()
+    below = matrix[:, 2] <= cut_off
+    assert np.all(colors[~below] == to_rgba(Dendrogram.ABOVE_COLOR))
+    assert not np.any(np.all(colors[below] == to_rgba(Dendrogram.ABOVE_COLOR), axis=1))
+    n_clusters = np.count_nonzero(np.bincount(fcluster(matrix, cut_off, criterion='distance')) > 1)
+    assert len({tuple(color) for color in colors[below]}) == min(n_clusters, len(Dendrogram.COLOR_LIST))
+
+    # Cutting at 0 hides the cut line and gives every link the color above it.
+    dendrogram._cut(0)
+    assert draws == []
+    assert not cut_line.get_visible()
+    assert np.all(link_collection.get_colors() == to_rgba(Dendrogram.ABOVE_COLOR))
+
+def test_cut_before_drawing(points):
+    # Without a saved background, the figure is drawn again.
+    dendrogram = Dendrogram()
+    figure = dendrogram._plot_dendrogram(linkage(points[:10], 'complete'), 0, [str(i) for i in range(0, 10)], orientation='top')
+    canvas = FigureCanvasAgg(figure)
+    dendrogram._connect(canvas)
+    draws = []
+    canvas.draw = lambda: draws.append(1)
+    dendrogram._cut(0.5)
+    assert draws == [1]
+    assert list(figure.axes[0].lines[0].get_ydata()) == [0.5, 0.5]
+
+@pytest.mark.parametrize('orientation', ['right', 'top'])
+def test_expand(points, orientation):
+    matrix = linkage(points, 'single')
+    dendrogram = Dendrogram()
+    figure = dendrogram._plot_dendrogram(matrix, 0, ['title ' + str(i) for i in range(0, 400)], orientation=orientation)
+    canvas = FigureCanvasAgg(figure)
+    dendrogram._connect(canvas)
+    canvas.draw()
+
+    # At most LEAF_BUDGET leaves are shown, collapsed leaves counting all the documents under them.
+    labels = _labels(figure, orientation)
+    assert len(labels) == Dendrogram.LEAF_BUDGET
+    assert sum(_size(label) for label in labels) == 400
+
+    # Expanding a collapsed leaf shows EXPANSION_SIZE more leaves in its place.
+    i = max(range(0, len(labels)), key=lambda i: _size(labels[i]))
+    assert _size(labels[i]) > Dendrogram.EXPANSION_SIZE
+    position = 5 + 10 * i
+    assert dendrogram._expand(0, position) if orientation == 'right' else dendrogram._expand(position, 0)
+    expanded_labels = _labels(figure, orientation)
+    assert len(expanded_labels) == Dendrogram.LEAF_BUDGET + Dendrogram.EXPANSION_SIZE
+    assert expanded_labels[:i] == labels[:i]
+    assert expanded_labels[i + Dendrogram.EXPANSION_SIZE + 1:] == labels[i + 1:]
+    assert sum(_size(label) for label in expanded_labels[i:i + Dendrogram.EXPANSION_SIZE + 1]) == _size(labels[i])
+    assert len(figure.axes[0].collections[0].get_segments()) == len(expanded_labels) - 1
+
+    # A document's leaf, or a point outside of the leaves, is not expanded.
+    j = next(j for j, label in enumerate(expanded_labels) if not label.startswith('('))
+    for position in [5 + 10 * j, -5, 10 * len(expanded_labels) + 5]:
+        assert not (dendrogram._expand(0, position) if orientation == 'right' else dendrogram._expand(position, 0))
+    assert _labels(figure, orientation) == expanded_labels
+
+def test_small_dendrogram(points):
+    # A dendrogram within the leaf budget shows every document.
+    dendrogram = Dendrogram()
+    figure = dendrogram._plot_dendrogram(linkage(points[:30], 'average'), 0.2, ['title ' + str(i) for i in range(0, 30)], leaf_budget=50)
+    assert sorted(_labels(figure)) == sorted('title ' + str(i) for i in range(0, 30))
+    assert figure.axes[0].lines[0].get_visible()
\ No newline at end of file
@@ -0,0 +1,68 @@
+from clustering.DimensionReducer import DimensionReducer
+from clustering.DistanceMatrix import DistanceMatrix
+
+from scipy.sparse import random as sparse_random, csr_matrix, vstack, issparse
+
+import numpy as np
+import pytest
+
+@pytest.fixture
+def matrix():
+    # 40 documents over 200 terms, of rank 30 since the last 10 documents copy the first ones.
+    matrix = sparse_random(30, 200, density=0.1, format='csr', random_state=0)
+    return vstack([matrix, matrix[:10]]).tocsr()
+
+@pytest.mark.parametrize('method', DimensionReducer.METHOD_LIST)
+@pytest.mark.parametrize('n_components', [1, 5, 20])
+def test_shape(matrix, method, n_components):
+    reduced = DimensionReducer(method, n_components)._reduce(matrix)
+    assert not issparse(reduced)
+    assert reduced.shape == (40, n_components)
+
+    # A corpus is always reduced the same way, and copied documents stay at distance 0.
+    assert np.array_equal(reduced, DimensionReducer(method, n_components)._reduce(matrix))
+    np.testing.assert_allclose(reduced[30:], reduced[:10], atol=1e-12)
+
+@pytest.mark.parametrize('n_components', [30, 35, 39])
+def test_svd_from_rank(matrix, n_components):
+    # With at least as many dimensions as the rank, the distances between documents are kept.
+    reduced = DimensionReducer('svd', n_components)._reduce(matrix)
+    assert reduced.shape == (40, n_components)
+    np.testing.assert_allclose(DistanceMatrix()._build(reduced), DistanceMatrix()._build(matrix), atol=1e-9)
+
+@pytest.mark.parametrize('n_components', [40, 100, 200, 1000])
+def test_svd_capped(matrix, n_components):
+    # A matrix without more documents or terms than the dimensions is kept in its own dimensions.
+    assert DimensionReducer('svd', n_components)._reduce(matrix) is matrix
+    assert DimensionReducer('svd', n_components)._reduce(matrix.T.tocsr()).shape == (200, 40)
+
+@pytest.mark.parametrize('n_components', [200, 1000])
+def test_random_projection_capped(matrix, n_components):
+    # A matrix without more terms than the dimensions is not projected.
+    reduced = DimensionReducer('random_projection', n_components)._reduce(matrix)
+    assert reduced.shape == (40, 200)
+    assert np.array_equal(reduced, matrix.toarray())
+
+def test_random_projection_distances():
+    # Cosine distances are roughly kept by a projection into fewer dimensions, documents being mixtures of a few topics.
+    random_state = np.random.RandomState(1)
+    topics = sparse_random(4, 5000, density=0.05, format='csr', random_state=random_state)
+    matrix = (csr_matrix(random_state.uniform(0, 1, (60, 4)) ** 3) @ topics).tocsr()
+    reduced = DimensionReducer('random_projection', 500)._reduce(matrix)
+    assert reduced.shape == (60, 500)
+    assert np.corrcoef(DistanceMatrix()._build(reduced), DistanceMatrix()._build(matrix))[0, 1] > 0.95
+
+@pytest.mark.parametrize('option', [{'method': 'pca'}, {'n_components': 0}, {'n_components': 2.5}, {'n_components': True}, {'n_components': '10'}])
+def test_invalid_option(option):
+    with pytest.raises(ValueError):
+        DimensionReducer(**option)
+
+@pytest.mark.parametrize('method', DimensionReducer.METHOD_LIST)
+def test_from_option(matrix, method):
+    # The option is saved along with an index, and gives back a reducer which reduces a corpus the same way.
+    reducer = DimensionReducer(method, 12)
+    assert reducer.option == {'method': method, 'n_components': 12}
+    loaded = DimensionReducer._from_option(reducer.option)
+    assert (loaded.method, loaded.n_components) == (method, 12)
+    assert np.array_equal(loaded._reduce(matrix), reducer._reduce(matrix))
+    assert DimensionReducer._from_option(None) is None
\ No newline at end of file
@@ -0,0 +1,54 @@
+from clustering.DistanceMatrix import DistanceMatrix
+from retrieval.CorpusStore import CorpusStore
+from retrieval.InvertedIndex import InvertedIndex
+from retrieval.TfidfMatrix import TfidfMatrix
+
+from scipy.sparse import random as sparse_random
+from scipy.spatial.distance import pdist
+
+import numpy as np
+import pytest
+
+N_DOCS = 30
+ZERO_ROW = 7
+
+@pytest.fixture
+def matrix():
+    # A random sparse corpus, with a document without any weight.
+    matrix = sparse_random(N_DOCS, 200, density=0.05, format='lil', random_state=0)
+    matrix[ZERO_ROW, :] = 0
+    matrix = matrix.tocsr()
+    matrix.eliminate_zeros()
+    return matrix
+
+def _expected(matrix):
+    # A row without any weight is at distance 1 of every other row, where pdist gives nan.
+    expected = pdist(matrix.toarray(), 'cosine')
+    return np.where(np.isnan(expected), 1, expected)
+
+@pytest.mark.parametrize('block_bytes', [1, 8 * N_DOCS * 3, 32 * 1024 * 1024])
+def test_build_matches_pdist(matrix, block_bytes):
+    distance_matrix = DistanceMatrix(block_bytes)._build(matrix)
+    assert distance_matrix.shape == (N_DOCS * (N_DOCS - 1) // 2,)
+    np.testing.assert_allclose(distance_matrix, _expected(matrix), atol=1e-12)
+
+def test_build_dense_matches_sparse(matrix):
+    np.testing.assert_allclose(DistanceMatrix()._build(matrix.toarray()), DistanceMatrix()._build(matrix), atol=1e-12)
+
+def test_build_matches_calc_distance(matrix):
+    doc_ids = ['doc_' + str(i) for i in range(N_DOCS)]
+    corpus = CorpusStore(doc_ids, doc_ids)
+    corpus._build_vectors(TfidfMatrix(InvertedIndex(), doc_ids, matrix, []))
+    distance_matrix = DistanceMatrix(8 * N_DOCS * 2)._build(matrix)
+    k = 0
+    for i in range(N_DOCS):
+        for j in range(i + 1, N_DOCS):
+            if ZERO_ROW in (i, j):
+                assert distance_matrix[k] == 1
+            else:
+                assert distance_matrix[k] == pytest.approx(corpus[i].calc_distance(corpus[j]), abs=1e-12)
+            k += 1
+
+def test_build_small_corpus():
+    assert len(DistanceMatrix()._build(np.ones((1, 3)))) == 0
+    assert DistanceMatrix()._build(np.array([[1.0, 0.0], [0.0, 1.0]]))[0] == pytest.approx(1)
\ No newline at end of file
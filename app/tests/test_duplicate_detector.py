@@ -0,0 +1,96 @@
+from clustering.Clusterer import Clusterer
+from clustering.DuplicateDetector import DuplicateDetector
+from retrieval.CorpusStore import CorpusStore
+from retrieval.InvertedIndex import InvertedIndex
+from retrieval.TfidfMatrix import TfidfMatrix
+
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+import numpy as np
+import pytest
+
+N_DOCS = 60
+N_TERMS = 400
+
+@pytest.fixture
+def matrix():
+    # Random sets of 30 terms, with a near-copy of every fifth set (2 of its terms replaced), and an empty row.
+    random_state = np.random.RandomState(0)
+    sets = [random_state.choice(N_TERMS, 30, replace=False) for i in range(N_DOCS)]
+    for i in range(0, N_DOCS - 1, 5):
+        sets[i + 1] = np.concatenate([sets[i][:28], random_state.choice(N_TERMS, 2, replace=False)])
+    sets[N_DOCS - 1] = np.zeros(0, dtype=np.int64)
+    rows = np.repeat(np.arange(N_DOCS), [len(terms) for terms in sets])
+    matrix = csr_matrix((np.ones(len(rows)), (rows, np.concatenate(sets))), shape=(N_DOCS, N_TERMS))
+    matrix.data[:] = 1
+    return matrix
+
+def _brute_force(matrix, threshold):
+    # Link every pair of rows whose exact Jaccard similarity reaches the threshold.
+    binary = (matrix != 0).astype(np.float64)
+    intersections = (binary @ binary.T).toarray()
+    sizes = np.diff(binary.indptr)
+    similarities = intersections / np.maximum(sizes[:, np.newaxis] + sizes[np.newaxis, :] - intersections, 1)
+    np.fill_diagonal(similarities, 0)
+    return connected_components(csr_matrix(similarities >= threshold), directed=False)[1]
+
+def _same_groups(first, second):
+    return np.array_equal(first[:, np.newaxis] == first[np.newaxis, :], second[:, np.newaxis] == second[np.newaxis, :])
+
+@pytest.mark.parametrize('threshold', [0.8, 0.9, 1.0])
+def test_detect_matches_brute_force(matrix, threshold):
+    detector = DuplicateDetector(threshold)
+    groups = detector._detect(matrix)
+    assert _same_groups(groups, _brute_force(matrix, threshold))
+
+    # Groups are numbered in the order of their first row.
+    assert groups[0] == 0 and np.all(np.diff(np.maximum.accumulate(groups)) <= 1)
+    assert detector.summary == {'documents': N_DOCS, 'groups': len(set(groups.tolist())), 'collapsed': N_DOCS - len(set(groups.tolist()))}
+
+def test_detect_in_small_blocks(matrix, monkeypatch):
+    groups = DuplicateDetector(0.8)._detect(matrix)
+
+    # A block smaller than a row still takes the whole row.
+    for block_bytes in [1, 8 * 128 * 45]:
+        monkeypatch.setattr(DuplicateDetector, 'BLOCK_BYTES', block_bytes)
+        assert np.array_equal(DuplicateDetector(0.8)._detect(matrix), groups)
+
+def _index(term_frequencies):
+    inverted_index = InvertedIndex()
+    for doc_id, terms in term_frequencies.items():
+        inverted_index._add(doc_id, {term: 1 for term in terms})
+    return inverted_index
+
+def test_detect_terms_of_index():
+    # Terms contained in every document have no weights in the tf-idf matrix, but they are in the sets of terms.
+    term_sets = {'doc_0': ['apple', 'banana', 'cherry', 'common', 'shared'],
+                 'doc_1': ['apple', 'common', 'shared'],
+                 'doc_2': ['date', 'elder', 'common', 'shared'],
+                 'doc_3': ['fig', 'grape', 'common', 'shared']}
+    inverted_index = _index(term_sets)
+    doc_ids = list(term_sets)
+    tfidf_matrix = TfidfMatrix(inverted_index, doc_ids)
+    assert list(DuplicateDetector(0.6)._detect(tfidf_matrix.matrix)) == [0, 1, 2, 3]
+    assert list(DuplicateDetector(0.6)._detect_terms(inverted_index, doc_ids)) == [0, 0, 1, 2]
+
+    # Terms pruned from the tf-idf matrix are in the sets of terms as well, and documents follow the order given.
+    pruned_matrix = TfidfMatrix(inverted_index, doc_ids, terms=['apple'])
+    assert list(DuplicateDetector(0.6)._detect(pruned_matrix.matrix)) == [0, 0, 1, 2]
+    assert list(DuplicateDetector(0.6)._detect_terms(inverted_index, ['doc_3', 'doc_1', 'doc_2', 'doc_0'])) == [0, 1, 2, 1]
+
+def test_duplicates_share_a_cluster():
+    term_sets = {'doc_' + str(i): ['term' + str(j) for j in range(6 * i, 6 * i + 8)] for i in range(8)}
+    term_sets['copy'] = term_sets['doc_2'][:7] + ['unique']
+    inverted_index = _index(term_sets)
+    doc_ids = list(term_sets)
+    tfidf_matrix = TfidfMatrix(inverted_index, doc_ids)
+    corpus = CorpusStore(doc_ids, doc_ids)
+    corpus._build_vectors(tfidf_matrix)
+    clusterer = Clusterer(corpus, tfidf_matrix, detector=DuplicateDetector(0.75), inverted_index=inverted_index)
+    clusterer.cluster('average')
+    assert clusterer.detector.summary['collapsed'] == 1
+    for cut_off in [0, 0.5, 0.99]:
+        clusters = clusterer.assign_clusters(cut_off)
+        assert clusters['copy'] == clusters['doc_2']
+        assert len(clusters) == len(doc_ids)
\ No newline at end of file
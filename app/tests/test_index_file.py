@@ -0,0 +1,93 @@
+from clustering.DimensionReducer import DimensionReducer
+from clustering.DuplicateDetector import DuplicateDetector
+from retrieval.CorpusStore import CorpusStore
+from retrieval.IndexFile import IndexFile
+from retrieval.InvertedIndex import InvertedIndex
+from retrieval.TfidfMatrix import TfidfMatrix
+from retrieval.VocabularyPruner import VocabularyPruner
+
+import os
+import pickle
+import numpy as np
+import pytest
+
+TERM_FREQUENCIES = {'doc_0': {'apple': 2, 'Banana': 1, 'cherry': 3},
+                    'doc_1': {'apple': 1, 'date': 4},
+                    'doc_2': {'banana': 2, 'cherry': 1, 'date': 1, 'elder': 5}}
+
+@pytest.fixture
+def index_file():
+    inverted_index = InvertedIndex()
+    for doc_id, term_frequency in TERM_FREQUENCIES.items():
+        inverted_index._add(doc_id, term_frequency)
+    doc_ids = list(TERM_FREQUENCIES)
+    corpus = CorpusStore(doc_ids, ['title ' + doc_id for doc_id in doc_ids], ['/corpus/' + doc_id + '.txt' for doc_id in doc_ids],
+                         [10, 20, 30], [1.0, 2.0, 3.0], ['0' * 32, '1' * 32, 'f' * 32])
+    tfidf_matrix = TfidfMatrix(inverted_index, doc_ids, terms=['apple', 'cherry', 'date', 'elder'])
+    return IndexFile(inverted_index, corpus, '/corpus', [True, False, True, True], tfidf_matrix, VocabularyPruner(1, 0.9, 4),
+                     DimensionReducer('svd', 50), DuplicateDetector(0.8))
+
+def test_save_and_load(index_file, tmp_path):
+    path = str(tmp_path / 'corpus.index')
+    index_file._save(path)
+    loaded = IndexFile._load(path)
+
+    assert {term: loaded.inverted_index[term] for term in loaded.inverted_index} == {term: index_file.inverted_index[term] for term in index_file.inverted_index}
+    assert loaded.inverted_index.sorted_terms == index_file.inverted_index.sorted_terms
+    assert loaded.corpus._get_manifest() == index_file.corpus._get_manifest()
+    assert loaded.folder_path == '/corpus'
+    assert loaded.preprocessor_option == [True, False, True, True]
+    assert loaded.tfidf_matrix.doc_ids == index_file.tfidf_matrix.doc_ids
+    assert loaded.tfidf_matrix.terms == index_file.tfidf_matrix.terms
+    assert (loaded.tfidf_matrix.matrix != index_file.tfidf_matrix.matrix).nnz == 0
+    assert loaded.pruner.option == index_file.pruner.option
+    assert loaded.reducer.option == index_file.reducer.option
+    assert loaded.detector.option == index_file.detector.option
+
+def test_save_over_loaded_index(index_file, tmp_path):
+    path = str(tmp_path / 'corpus.index')
+    index_file._save(path)
+    loaded = IndexFile._load(path)
+    loaded._save(path)
+    reloaded = IndexFile._load(path)
+    assert np.array_equal(reloaded.tfidf_matrix.matrix.toarray(), index_file.tfidf_matrix.matrix.toarray())
+    assert os.listdir(str(tmp_path)) == ['corpus.index']
+
+def test_save_to_empty_path(index_file, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError):
+        index_file._save('')
+    assert os.listdir(str(tmp_path)) == []
+
+def test_save_over_file_in_use(index_file, tmp_path, monkeypatch):
+    path = str(tmp_path / 'corpus.index')
+    index_file._save(path)
+    with open(path, 'rb') as handle:
+        content = handle.read()
+
+    # Windows does not replace a memory-mapped file.
+    def _replace(source, destination):
+        raise PermissionError(13, 'Permission denied')
+
+    monkeypatch.setattr(os, 'replace', _replace)
+    with pytest.raises(PermissionError, match='in use'):
+        index_file._save(path)
+    assert os.listdir(str(tmp_path)) == ['corpus.index']
+    with open(path, 'rb') as handle:
+        assert handle.read() == content
+
+def test_load_pickle_index(tmp_path):
+    path = str(tmp_path / 'corpus.pickle')
+    metadata = {'folder_path': '/corpus', 'corpus': [], 'preprocessor_option': [True, True, True, True]}
+    with open(path, 'wb') as handle:
+        pickle.dump({'index': {'apple': {'doc_0': 2}}, 'metadata': metadata}, handle)
+    loaded = IndexFile._load(path)
+    assert dict(loaded.inverted_index['apple']) == {'doc_0': 2}
+    assert loaded.tfidf_matrix is None
+
+def test_load_other_file(tmp_path):
+    path = str(tmp_path / 'other.index')
+    with open(path, 'wb') as handle:
+        handle.write(b'not an index')
+    with pytest.raises(ValueError):
+        IndexFile._load(path)
\ No newline at end of file
@@ -0,0 +1,52 @@
+from retrieval.Indexer import Indexer
+from retrieval.CorpusReader import CorpusReader
+
+import pytest
+
+WORDS = ['apples', 'pears', 'orchards', 'harbour', 'sailing', 'boats', 'summer', 'cards', 'printed', 'wooden', 'blocks', 'drums', 'rhythm']
+
+@pytest.fixture
+def folder(tmp_path):
+    # Documents of very different sizes, so chunks have to be balanced.
+    for i in range(0, 40):
+        words = [WORDS[(i * 7 + j * j) % len(WORDS)] for j in range(0, 3 + (i % 5) * 20)]
+        (tmp_path / ('doc' + str(i) + '.txt')).write_text(' '.join(words) + '.\r\nThe end of document ' + str(i) + '.')
+    return str(tmp_path)
+
+def _index(indexer):
+    return {term: dict(indexer.inverted_index[term]) for term in indexer.inverted_index}
+
+def test_parallel_equals_serial(folder, nltk_data):
+    serial = Indexer()
+    corpus = CorpusReader(folder)._list_documents()
+    for document in corpus:
+        serial.index(document)
+
+    parallel = Indexer()
+    parallel_corpus = CorpusReader(folder)._list_documents()
+    progress = []
+    parallel.index_parallel(parallel_corpus, processes=2, progress_callback=lambda indexed, size: progress.append((indexed, size)), max_in_flight=8)
+    assert _index(parallel) == _index(serial)
+    assert parallel.inverted_index.sorted_terms == serial.inverted_index.sorted_terms
+
+    # Documents have their content hash recorded and their content deleted, as when indexing serially.
+    assert [document.content_hash for document in parallel_corpus] == [document.content_hash for document in corpus]
+    assert all(document.content is None for document in parallel_corpus)
+
+    # The progress grows up to the corpus size.
+    assert progress[-1] == (len(corpus), len(corpus))
+    assert all(earlier[0] < later[0] for earlier, later in zip(progress, progress[1:]))
+
+@pytest.mark.parametrize('n', [1, 3, 40, 100])
+def test_balance_chunks(folder, n):
+    corpus = CorpusReader(folder)._list_documents()
+    chunk_list = Indexer._Indexer__balance_chunks(list(corpus), n)
+    assert len(chunk_list) == min(n, len(corpus))
+    assert sorted(document.doc_id for chunk in chunk_list for document in chunk) == sorted(corpus.doc_ids)
+
+    # Each document is put into the smallest chunk, so chunks differ by at most the size of the largest document.
+    sizes = [sum(document.size for document in chunk) for chunk in chunk_list]
+    assert max(sizes) - min(sizes) <= max(document.size for document in corpus)
+
+def test_balance_empty_corpus():
+    assert Indexer._Indexer__balance_chunks([], 4) == []
\ No newline at end of file
@@ -0,0 +1,101 @@
+from retrieval.InvertedIndex import InvertedIndex
+from retrieval.MappedInvertedIndex import MappedInvertedIndex
+
+import numpy as np
+import pytest
+
+TERM_FREQUENCIES = {'doc_0': {'apple': 1, 'Banana': 2, 'cherry': 1},
+                    'doc_1': {'apple': 3, 'banana': 1, 'date': 3},
+                    'doc_2': {'apple': 2, 'Banana': 1}}
+
+@pytest.fixture
+def inverted_index():
+    inverted_index = InvertedIndex()
+    for doc_id, term_frequency in TERM_FREQUENCIES.items():
+        inverted_index._add(doc_id, term_frequency)
+    return inverted_index
+
+def _mapping(inverted_index):
+    return {term: inverted_index[term] for term in inverted_index}
+
+def test_mapping(inverted_index):
+    assert _mapping(inverted_index) == {'apple': {'doc_0': 1, 'doc_1': 3, 'doc_2': 2}, 'Banana': {'doc_0': 2, 'doc_2': 1},
+                                        'cherry': {'doc_0': 1}, 'banana': {'doc_1': 1}, 'date': {'doc_1': 3}}
+    assert len(inverted_index) == 5
+    assert 'cherry' in inverted_index and 'elder' not in inverted_index
+    with pytest.raises(KeyError):
+        inverted_index['elder']
+    assert inverted_index.doc_ids == ['doc_0', 'doc_1', 'doc_2']
+
+def test_add_to_indexed_document(inverted_index):
+    # The frequencies of a document indexed again are added to its previous ones.
+    inverted_index._add('doc_2', {'apple': 1, 'elder': 4})
+    assert inverted_index['apple'] == {'doc_0': 1, 'doc_1': 3, 'doc_2': 3}
+    assert inverted_index['elder'] == {'doc_2': 4}
+    assert inverted_index.doc_ids == ['doc_0', 'doc_1', 'doc_2']
+
+def test_add_then_remove(inverted_index):
+    previous = _mapping(inverted_index)
+    sorted_terms = list(inverted_index.sorted_terms)
+    inverted_index._add('doc_3', {'apple': 5, 'elder': 2, 'fig': 1})
+    inverted_index._add('doc_4', {'fig': 2})
+    assert inverted_index.sorted_terms == ['apple', 'Banana', 'banana', 'cherry', 'date', 'elder', 'fig']
+
+    # Terms left without any posting leave the vocabulary, and unknown documents are ignored.
+    inverted_index._remove(['doc_3', 'doc_4', 'doc_9'])
+    assert _mapping(inverted_index) == previous
+    assert len(inverted_index) == len(previous)
+    assert 'elder' not in inverted_index and 'fig' not in inverted_index
+    assert list(inverted_index) == list(previous)
+    assert inverted_index.sorted_terms == sorted_terms
+    with pytest.raises(KeyError):
+        inverted_index._join_postings(['fig'])
+
+    # A removed document keeps its number, and is indexed again under it.
+    inverted_index._add('doc_3', {'elder': 1})
+    assert inverted_index.doc_ids == ['doc_0', 'doc_1', 'doc_2', 'doc_3', 'doc_4']
+    assert inverted_index['elder'] == {'doc_3': 1}
+
+def test_remove_every_posting_of_a_term(inverted_index):
+    inverted_index._remove(['doc_1'])
+    assert _mapping(inverted_index) == {'apple': {'doc_0': 1, 'doc_2': 2}, 'Banana': {'doc_0': 2, 'doc_2': 1}, 'cherry': {'doc_0': 1}}
+    assert inverted_index.sorted_terms == ['apple', 'Banana', 'cherry']
+
+def test_join_postings(inverted_index):
+    terms = inverted_index.sorted_terms
+    assert terms == sorted(inverted_index, key=str.lower)
+    docs, freqs, lengths = inverted_index._join_postings(terms)
+
+    # The postings are joined term after term, in the order of the sorted terms.
+    assert lengths.tolist() == [len(inverted_index[term]) for term in terms]
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    for i, term in enumerate(terms):
+        posting_list = {inverted_index.doc_ids[doc]: freq for doc, freq in zip(docs[offsets[i]:offsets[i + 1]].tolist(), freqs[offsets[i]:offsets[i + 1]].tolist())}
+        assert posting_list == inverted_index[term]
+
+def _mapped(inverted_index):
+    # Store the postings as a loaded index file does, term after term.
+    terms = list(inverted_index)
+    docs, freqs, lengths = inverted_index._join_postings(terms)
+    return MappedInvertedIndex(terms, list(inverted_index.doc_ids), np.concatenate([[0], np.cumsum(lengths)]), np.array(docs), np.array(freqs))
+
+def test_from_mapping(inverted_index):
+    previous = _mapping(inverted_index)
+    for mapping in [previous, _mapped(inverted_index)]:
+        index = InvertedIndex._from_mapping(mapping)
+        assert isinstance(index, InvertedIndex)
+        assert _mapping(index) == previous
+        assert index.sorted_terms == inverted_index.sorted_terms
+
+        # The copy can be updated.
+        index._add('doc_3', {'apple': 1})
+        index._remove(['doc_0'])
+        assert index['apple'] == {'doc_1': 3, 'doc_2': 2, 'doc_3': 1}
+        assert 'cherry' not in index
+
+def test_from_mapped_index_keeps_document_numbers(inverted_index):
+    # A document without postings keeps its number in a loaded index.
+    inverted_index._remove(['doc_1'])
+    index = InvertedIndex._from_mapping(_mapped(inverted_index))
+    assert index.doc_ids == ['doc_0', 'doc_1', 'doc_2']
+    assert index._join_postings(['apple'])[0].tolist() == [0, 2]
\ No newline at end of file
@@ -0,0 +1,64 @@
+from pipeline.Organizer import Organizer
+
+import os
+import shutil
+import pytest
+
+CLUSTER_LIST = {'fruits': ['apples', 'pears'], 'boats': ['sailing']}
+
+@pytest.fixture
+def folder(tmp_path):
+    for title in ['apples', 'pears', 'sailing']:
+        (tmp_path / (title + '.txt')).write_text('Content of ' + title + '.')
+    return str(tmp_path)
+
+def _organized_files(folder):
+    organized_folder = os.path.join(folder, 'organized')
+    return sorted(os.path.relpath(os.path.join(path, name), organized_folder) for path, folders, names in os.walk(organized_folder) for name in names)
+
+@pytest.mark.parametrize('strategy', Organizer.STRATEGY_LIST)
+def test_organize(folder, strategy):
+    organizer = Organizer(folder, strategy)
+    organizer._organize(CLUSTER_LIST)
+    assert _organized_files(folder) == [os.path.join('boats', 'sailing.txt'), os.path.join('fruits', 'apples.txt'), os.path.join('fruits', 'pears.txt')]
+    with open(os.path.join(folder, 'organized', 'fruits', 'pears.txt')) as handle:
+        assert handle.read() == 'Content of pears.'
+    assert organizer.summary['files'] == 3
+    assert os.path.exists(os.path.join(folder, 'apples.txt')) == (strategy != 'move')
+
+def test_dry_run(folder):
+    organizer = Organizer(folder)
+    organizer._organize(CLUSTER_LIST, dry_run=True)
+    assert not os.path.exists(os.path.join(folder, 'organized'))
+    assert len(organizer.manifest) == 3
+    assert organizer.summary['bytes_copied'] == 0
+
+@pytest.mark.parametrize('strategy', ['hardlink', 'symlink'])
+def test_link_falls_back_to_copy(folder, strategy, monkeypatch):
+    # Windows only creates symbolic links with a privilege, and hard links are not supported by every file system.
+    def _link(source, destination):
+        raise OSError(1314, 'A required privilege is not held by the client')
+
+    monkeypatch.setattr(os, 'symlink', _link)
+    monkeypatch.setattr(os, 'link', _link)
+    organizer = Organizer(folder, strategy)
+    organizer._organize(CLUSTER_LIST)
+    assert len(_organized_files(folder)) == 3
+    assert not os.path.islink(os.path.join(folder, 'organized', 'boats', 'sailing.txt'))
+    assert organizer.summary['bytes_copied'] == organizer.summary['bytes']
+
+def test_failure_removes_organized_folder(folder, monkeypatch):
+    def _copyfile(source, destination):
+        raise PermissionError(13, 'Permission denied')
+
+    monkeypatch.setattr(shutil, 'copyfile', _copyfile)
+    with pytest.raises(PermissionError):
+        Organizer(folder, 'copy', workers=1)._organize(CLUSTER_LIST)
+    assert not os.path.exists(os.path.join(folder, 'organized'))
+
+def test_organized_folder_exists(folder):
+    os.mkdir(os.path.join(folder, 'organized'))
+    with pytest.raises(FileExistsError):
+        Organizer(folder)._organize(CLUSTER_LIST)
+    with pytest.raises(FileExistsError):
+        Organizer(folder)._organize(CLUSTER_LIST, dry_run=True)
\ No newline at end of file
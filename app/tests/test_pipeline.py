@@ -0,0 +1,61 @@
+from pipeline.Pipeline import Pipeline
+from retrieval.VocabularyPruner import VocabularyPruner
+
+import os
+import pytest
+
+CONTENTS = {'apples.txt': 'Apples and pears are grown in orchards near the harbour.',
+            'boats.txt': 'Sailing boats race in the harbour every summer.',
+            'cards.txt': 'Playing cards were printed with wooden blocks.'}
+
+@pytest.fixture
+def pipeline(tmp_path, nltk_data):
+    folder = tmp_path / 'corpus'
+    folder.mkdir()
+    for name, content in CONTENTS.items():
+        (folder / name).write_text(content)
+    pipeline = Pipeline(parallel_option=False)
+    pipeline.index(str(folder))
+    return pipeline
+
+def test_organize_before_clustering(pipeline, tmp_path):
+    with pytest.raises(ValueError, match='not clustered'):
+        pipeline.organize(dry_run=True)
+    with pytest.raises(ValueError, match='not clustered'):
+        pipeline.export_clusters(str(tmp_path / 'clusters.json'))
+    assert not os.path.exists(str(tmp_path / 'clusters.json'))
+
+def test_organize_after_clustering(pipeline, tmp_path):
+    pipeline.cluster('average', 0.9)
+    pipeline.export_clusters(str(tmp_path / 'clusters.json'))
+    assert pipeline.organize(dry_run=True).summary['files'] == len(CONTENTS)
+
+    # A new reducer creates a new clusterer, which is not clustered yet.
+    pipeline.reduce(None)
+    with pytest.raises(ValueError, match='not clustered'):
+        pipeline.organize(dry_run=True)
+
+def test_prune_without_term_left(pipeline):
+    tfidf_matrix = pipeline.tfidf_matrix
+    pruner = VocabularyPruner(2)
+    pipeline.prune(pruner)
+    assert pipeline.pruner is pruner
+
+    # Every term is in one document only, so no term is left.
+    with pytest.raises(ValueError):
+        pipeline.prune(VocabularyPruner(3))
+    assert pipeline.pruner is pruner
+    assert pipeline.tfidf_matrix is not tfidf_matrix
+    assert pipeline.tfidf_matrix.terms == ['harbour']
+    assert pipeline.clusterer is not None
+
+def test_options_before_indexing():
+    pipeline = Pipeline()
+    pruner = VocabularyPruner(2)
+    pipeline.prune(pruner)
+    pipeline.reduce(None)
+    pipeline.deduplicate(None)
+    assert pipeline.pruner is pruner
+    assert pipeline.tfidf_matrix is None
+    with pytest.raises(ValueError):
+        pipeline.cluster()
\ No newline at end of file
@@ -0,0 +1,72 @@
+from pipeline.Pipeline import Pipeline
+
+import os
+import pytest
+
+CONTENTS = {'apples.txt': 'Apples and pears are grown in orchards across the valley.',
+            'boats.txt': 'Sailing boats race across the harbour every summer.',
+            'cards.txt': 'Playing cards were printed with wooden blocks.',
+            'drums.txt': 'Drums and cymbals keep the rhythm of the marching band.'}
+
+@pytest.fixture
+def folder(tmp_path):
+    folder = tmp_path / 'corpus'
+    folder.mkdir()
+    for name, content in CONTENTS.items():
+        (folder / name).write_text(content)
+    return folder
+
+def _change(folder):
+    # Modify a document (with another length, so it is detected even within the same modification time), add one and delete one.
+    (folder / 'boats.txt').write_text('Rowing boats and sailing boats moored in the harbour, waiting for the spring tide.')
+    (folder / 'engines.txt').write_text('Steam engines pulled long trains of coal wagons.')
+    os.remove(str(folder / 'cards.txt'))
+
+def _snapshot(pipeline):
+    # Documents are compared by file path, since their id depends on the order they were indexed in.
+    paths = {document.doc_id: document.path for document in pipeline.corpus}
+    index = {term: {paths[doc_id]: freq for doc_id, freq in pipeline.inverted_index[term].items()} for term in pipeline.inverted_index}
+    matrix = pipeline.tfidf_matrix.matrix.tocsr()
+    terms = pipeline.tfidf_matrix.terms
+    rows = {}
+    for row, doc_id in enumerate(pipeline.tfidf_matrix.doc_ids):
+        weights = matrix[row]
+        rows[paths[doc_id]] = {terms[col]: pytest.approx(weight) for col, weight in zip(weights.indices, weights.data)}
+    return sorted(paths.values()), index, rows
+
+def test_update_equals_fresh_index(folder, nltk_data):
+    pipeline = Pipeline(parallel_option=False)
+    pipeline.index(str(folder))
+    _change(folder)
+    added, modified, deleted = pipeline.update()
+    assert [document.title for document in added] == ['engines']
+    assert [document.title for document in modified] == ['boats']
+    assert [document.title for document in deleted] == ['cards']
+
+    fresh = Pipeline(parallel_option=False)
+    fresh.index(str(folder))
+    assert _snapshot(pipeline) == _snapshot(fresh)
+
+def test_update_loaded_index_equals_fresh_index(folder, tmp_path, nltk_data):
+    pipeline = Pipeline(parallel_option=False)
+    pipeline.index(str(folder))
+    pipeline.save(str(tmp_path / 'corpus.index'))
+    _change(folder)
+    loaded = Pipeline(parallel_option=False)
+    loaded.load(str(tmp_path / 'corpus.index'))
+    loaded.update()
+
+    fresh = Pipeline(parallel_option=False)
+    fresh.index(str(folder))
+    assert _snapshot(loaded) == _snapshot(fresh)
+
+def test_update_without_changes(folder, nltk_data):
+    pipeline = Pipeline(parallel_option=False)
+    pipeline.index(str(folder))
+    before = _snapshot(pipeline)
+    assert pipeline.update() == ([], [], [])
+    assert _snapshot(pipeline) == before
+
+def test_update_without_index():
+    with pytest.raises(ValueError):
+        Pipeline().update()
\ No newline at end of file
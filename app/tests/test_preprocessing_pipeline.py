@@ -0,0 +1,29 @@
+from retrieval.PreprocessingPipeline import PreprocessingPipeline
+from retrieval.Indexer import Indexer
+from retrieval.Document import Document
+from pipeline.StageTimer import StageTimer
+
+import itertools
+import pytest
+
+TEXT = 'The Sailing boats were RACING across the harbour in 2020, and U.S. sailors kept winning races!'
+
+@pytest.mark.parametrize('option', list(itertools.product([True, False], repeat=4)))
+def test_single_pass_matches_steps(option, nltk_data):
+    pipeline = PreprocessingPipeline(*option)
+    timer = StageTimer(detailed=True)
+    assert pipeline._process(TEXT) == pipeline._process(TEXT, timer)
+    assert 'tokenization' in timer.stages
+
+def _index(timer):
+    indexer = Indexer(timer=timer)
+    indexer.index(Document('doc_0', 'boats', content=TEXT))
+    return {term: dict(indexer.inverted_index[term]) for term in indexer.inverted_index}
+
+def test_preprocessing_measured_as_one_stage(nltk_data):
+    timer = StageTimer()
+    detailed_timer = StageTimer(detailed=True)
+    assert _index(timer) == _index(detailed_timer)
+    assert 'preprocessing' in timer.stages and 'tokenization' not in timer.stages
+    assert 'preprocessing' not in detailed_timer.stages
+    assert {'tokenization', 'stopwords_removal', 'stemming', 'normalization'} <= set(detailed_timer.stages)
\ No newline at end of file
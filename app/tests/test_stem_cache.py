@@ -0,0 +1,45 @@
+from retrieval.StemCache import StemCache
+
+def test_cache_evicts_least_recently_used():
+    stem_cache = StemCache(2)
+    stem_cache._put('running', 'run')
+    stem_cache._put('jumping', 'jump')
+    assert stem_cache._get('running') == 'run'
+    stem_cache._put('walking', 'walk')
+    assert len(stem_cache) == 2
+    assert stem_cache._get('jumping') is None
+    assert stem_cache._get('walking') == 'walk'
+
+def test_cache_does_not_keep_new_tokens_unless_recording():
+    stem_cache = StemCache(2)
+    for i in range(100):
+        stem_cache._put('token' + str(i), 'stem' + str(i))
+    assert len(stem_cache) == 2
+    assert stem_cache._drain()[0] == {}
+
+def test_recorded_tokens_are_merged_into_main_cache():
+    main_cache = StemCache()
+    main_cache._put('running', 'run')
+
+    # A process of the pool works on a copy of the main cache.
+    worker_cache = StemCache()
+    worker_cache._merge({'running': 'run'})
+    worker_cache._record()
+    assert worker_cache._get('running') == 'run'
+    assert worker_cache._get('jumping') is None
+    worker_cache._put('jumping', 'jump')
+    entries, hits, misses = worker_cache._drain()
+    assert (entries, hits, misses) == ({'jumping': 'jump'}, 1, 1)
+    assert worker_cache._drain()[0] == {}
+
+    main_cache._merge(entries, hits, misses)
+    assert len(main_cache) == 2
+    assert main_cache._get('jumping') == 'jump'
+
+def test_save_and_load(tmp_path):
+    stem_cache = StemCache(10)
+    stem_cache._put('running', 'run')
+    stem_cache._save(str(tmp_path / 'stems.cache'))
+    loaded = StemCache._load(str(tmp_path / 'stems.cache'))
+    assert loaded.max_size == 10
+    assert loaded._get('running') == 'run'
\ No newline at end of file
@@ -0,0 +1,65 @@
+from retrieval.InvertedIndex import InvertedIndex
+from retrieval.TfidfMatrix import TfidfMatrix
+
+import math
+import numpy as np
+import pytest
+
+TERM_FREQUENCIES = {'doc_0': {'apple': 1, 'Banana': 2, 'cherry': 1},
+                    'doc_1': {'apple': 3, 'banana': 1, 'date': 3},
+                    'doc_2': {'apple': 2, 'Banana': 1},
+                    'doc_3': {'apple': 1, 'elder': 7, 'date': 1}}
+
+@pytest.fixture
+def inverted_index():
+    inverted_index = InvertedIndex()
+    for doc_id, term_frequency in TERM_FREQUENCIES.items():
+        inverted_index._add(doc_id, term_frequency)
+    return inverted_index
+
+def _brute_force(inverted_index, doc_ids, terms):
+    # Weight each term of each document by log10(freq + 1) * log10(N / df).
+    weights = np.zeros((len(doc_ids), len(terms)))
+    for j, term in enumerate(terms):
+        posting_list = inverted_index[term]
+        idf = math.log10(len(doc_ids) / len(posting_list))
+        for i, doc_id in enumerate(doc_ids):
+            weights[i, j] = math.log10(posting_list.get(doc_id, 0) + 1) * idf
+    return weights
+
+def test_weights(inverted_index):
+    doc_ids = list(TERM_FREQUENCIES)
+    tfidf_matrix = TfidfMatrix(inverted_index, doc_ids)
+    assert tfidf_matrix.terms == ['apple', 'Banana', 'banana', 'cherry', 'date', 'elder']
+    assert tfidf_matrix.matrix.shape == (4, 6)
+    assert np.allclose(tfidf_matrix.matrix.toarray(), _brute_force(inverted_index, doc_ids, tfidf_matrix.terms))
+
+    # A term contained in every document has idf weight 0, and none of its weights are stored.
+    assert tfidf_matrix.matrix.nnz == np.count_nonzero(_brute_force(inverted_index, doc_ids, tfidf_matrix.terms))
+    assert tfidf_matrix.matrix[:, 0].nnz == 0
+
+def test_rows(inverted_index):
+    doc_ids = ['doc_2', 'doc_0', 'doc_3', 'doc_1']
+    tfidf_matrix = TfidfMatrix(inverted_index, doc_ids)
+    assert np.allclose(tfidf_matrix.matrix.toarray(), _brute_force(inverted_index, doc_ids, tfidf_matrix.terms))
+    assert tfidf_matrix._get_row('doc_3') == 2
+    assert np.allclose(tfidf_matrix._get_vector('doc_3').toarray(), tfidf_matrix.matrix[2].toarray())
+
+def test_pruned_terms(inverted_index):
+    doc_ids = list(TERM_FREQUENCIES)
+    tfidf_matrix = TfidfMatrix(inverted_index, doc_ids, terms=['elder', 'date', 'Banana'])
+    assert tfidf_matrix.terms == ['Banana', 'date', 'elder']
+    assert np.allclose(tfidf_matrix.matrix.toarray(), _brute_force(inverted_index, doc_ids, tfidf_matrix.terms))
+
+def test_document_without_row(inverted_index):
+    # The postings of a document without a row are left out, while still counted in the document frequencies.
+    doc_ids = ['doc_0', 'doc_1', 'doc_2']
+    tfidf_matrix = TfidfMatrix(inverted_index, doc_ids)
+    assert tfidf_matrix.matrix.shape == (3, 6)
+    assert np.allclose(tfidf_matrix.matrix.toarray(), _brute_force(inverted_index, doc_ids, tfidf_matrix.terms))
+    assert tfidf_matrix.matrix[:, 5].nnz == 0
+
+def test_matrix_given(inverted_index):
+    doc_ids = list(TERM_FREQUENCIES)
+    matrix = TfidfMatrix(inverted_index, doc_ids).matrix
+    assert TfidfMatrix(inverted_index, doc_ids, matrix=matrix).matrix is matrix
\ No newline at end of file
@@ -0,0 +1,74 @@
+from retrieval.InvertedIndex import InvertedIndex
+from retrieval.VocabularyPruner import VocabularyPruner
+
+import pytest
+
+# Document frequencies: apple 4, banana 3, cherry 1, date 1, elder 1.
+# Frequencies in the corpus: apple 5, banana 4, cherry 1, date 3, elder 1.
+TERM_FREQUENCIES = {'doc_0': {'apple': 1, 'banana': 2, 'cherry': 1},
+                    'doc_1': {'apple': 1, 'banana': 1, 'date': 3},
+                    'doc_2': {'apple': 2, 'banana': 1},
+                    'doc_3': {'apple': 1, 'elder': 1}}
+
+@pytest.fixture
+def inverted_index():
+    inverted_index = InvertedIndex()
+    for doc_id, term_frequency in TERM_FREQUENCIES.items():
+        inverted_index._add(doc_id, term_frequency)
+    return inverted_index
+
+@pytest.mark.parametrize('option, terms', [
+    ({}, ['apple', 'banana', 'cherry', 'date', 'elder']),
+    # Bounds are inclusive, as a number of documents or a proportion of the corpus.
+    ({'min_df': 3}, ['apple', 'banana']),
+    ({'min_df': 0.75}, ['apple', 'banana']),
+    ({'min_df': 0.5}, ['apple', 'banana']),
+    ({'min_df': 4}, ['apple']),
+    ({'max_df': 3}, ['banana', 'cherry', 'date', 'elder']),
+    ({'max_df': 0.75}, ['banana', 'cherry', 'date', 'elder']),
+    ({'max_df': 1}, ['cherry', 'date', 'elder']),
+    ({'max_df': 0.0}, None),
+    # The most frequent terms in the corpus are kept, ties being broken by the order of the terms.
+    ({'max_features': 2}, ['apple', 'banana']),
+    ({'max_features': 3}, ['apple', 'banana', 'date']),
+    ({'max_features': 4}, ['apple', 'banana', 'cherry', 'date']),
+    ({'max_features': 10}, ['apple', 'banana', 'cherry', 'date', 'elder']),
+    ({'max_df': 3, 'max_features': 2}, ['banana', 'date']),
+    ({'min_df': 2, 'max_df': 3}, ['banana']),
+    # No term is left.
+    ({'min_df': 5}, None),
+    ({'min_df': 3, 'max_df': 2}, None),
+])
+def test_prune(inverted_index, option, terms):
+    pruner = VocabularyPruner(**option)
+    if terms is None:
+        with pytest.raises(ValueError):
+            pruner._prune(inverted_index, len(TERM_FREQUENCIES))
+        assert pruner.summary is None
+    else:
+        assert pruner._prune(inverted_index, len(TERM_FREQUENCIES)) == terms
+
+def test_summary(inverted_index):
+    pruner = VocabularyPruner(max_df=3, max_features=2)
+    pruner._prune(inverted_index, len(TERM_FREQUENCIES))
+
+    # A term contained in every document has no weights in the matrix.
+    assert pruner.summary == {'documents': 4, 'terms': 5, 'kept_terms': 2, 'weights': 6, 'kept_weights': 4,
+                              'matrix_bytes': 12 * 6 + 4 * 5, 'kept_matrix_bytes': 12 * 4 + 4 * 5}
+
+@pytest.mark.parametrize('option', [{'min_df': -1}, {'min_df': 1.5}, {'max_df': -0.5}, {'max_df': 2.0}, {'min_df': True}, {'max_df': '1'},
+                                    {'max_features': 0}, {'max_features': 2.5}, {'max_features': True}])
+def test_invalid_option(option):
+    with pytest.raises(ValueError):
+        VocabularyPruner(**option)
+
+def test_parse_frequency():
+    assert VocabularyPruner._parse_frequency('2') == 2 and isinstance(VocabularyPruner._parse_frequency('2'), int)
+    assert VocabularyPruner._parse_frequency('0.5') == 0.5
+    with pytest.raises(ValueError):
+        VocabularyPruner._parse_frequency('half')
+
+def test_from_option():
+    pruner = VocabularyPruner(2, 0.9, 100)
+    assert VocabularyPruner._from_option(pruner.option).option == {'min_df': 2, 'max_df': 0.9, 'max_features': 100}
+    assert VocabularyPruner._from_option(None) is None
\ No newline at end of file